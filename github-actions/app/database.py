@@ -1,42 +1,217 @@
-from typing import Dict, List
+import asyncio
+import os
+from typing import AsyncIterator, Iterator, List, Optional
 from .models import Task
+from .search import SearchIndex
+from .storage import TaskStorage, create_storage
+from .storage.base import Page, Patch, TaskData
 
-db: Dict[int, Task] = {} #dicionário que servirá como banco de dados provisório
-next_task_id = 1 #variável global para ids de tasks
+#mecanismo de armazenamento em uso; o padrão é o dicionário em memória
+storage: TaskStorage = create_storage(os.environ.get("TASKS_DATABASE_URL"))
+
+#índice de busca do título e da descrição, para mecanismos sem busca própria;
+#montado na primeira busca e mantido pelas escritas feitas por este processo
+search_index = SearchIndex()
+#True se o próprio mecanismo atualiza o índice dentro de cada escrita
+_index_attached = storage.attach_index(search_index)
+
+def set_storage(new_storage: TaskStorage) -> TaskStorage:
+    """Troca o mecanismo de armazenamento e retorna o anterior"""
+    global storage, _index_attached
+    previous, storage = storage, new_storage
+    previous.attach_index(None)
+    search_index.clear(ready=False)
+    _index_attached = new_storage.attach_index(search_index)
+    return previous
+
+# Mecanismos que não mantêm o índice por conta própria: ele é atualizado depois
+# da escrita, e escritas simultâneas da mesma tarefa podem chegar fora de ordem.
+
+def _index_tasks(tasks: List[Task | None]) -> None:
+    """Leva ao índice de busca as tarefas gravadas (None: ID inexistente)"""
+    if _index_attached:
+        return
+    for task in tasks:
+        if task is not None:
+            search_index.add(task)
+
+def _unindex_tasks(task_ids: List[int], deleted: List[bool]) -> None:
+    """Tira do índice de busca as tarefas removidas"""
+    if _index_attached:
+        return
+    for task_id, removed in zip(task_ids, deleted):
+        if removed:
+            search_index.remove(task_id)
+
+def _build_search_index() -> None:
+    search_index.build(storage.iter_batches)
 
 def get_all_tasks_db() -> List[Task]:
     """Retorna todas as tarefas do banco de dados"""
-    return list(db.values())
+    return storage.all()
+
+def list_tasks_db(
+    limit: Optional[int] = None,
+    cursor: Optional[int] = None,
+    completed: Optional[bool] = None,
+    title_prefix: Optional[str] = None,
+) -> Page:
+    """
+    Retorna uma página de tarefas em ordem de id, usando os índices do mecanismo.
+
+    - **limit**: tamanho máximo da página (`None` retorna todas).
+    - **cursor**: id da última tarefa da página anterior.
+    - **completed**: filtra pelo status da tarefa.
+    - **title_prefix**: filtra por prefixo do título (sem diferenciar maiúsculas).
+
+    Retorna a página e o cursor da próxima página (`None` se não houver mais).
+    """
+    return storage.page(limit, cursor, completed, title_prefix)
+
+def iter_task_batches_db(batch_size: int = 500) -> Iterator[List[Task]]:
+    """Percorre todas as tarefas em lotes, sem carregar a tabela inteira"""
+    return storage.iter_batches(batch_size)
 
 def get_task_db(task_id: int) -> Task | None:
     """Busca uma tarefa pelo seu ID"""
-    return db.get(task_id)
+    return storage.get(task_id)
 
-def create_task_db(task_data: Task) -> Task:
+def create_task_db(task_data: TaskData) -> Task:
     """Cria e salva uma tarefa no banco de dados"""
-    global next_task_id
-    task_data.id = next_task_id
-    db[next_task_id] = task_data
-    next_task_id += 1
-    return task_data
+    task = storage.create(task_data)
+    _index_tasks([task])
+    return task
 
-def update_task_db(task_id: int, task_data: Task) -> Task | None:
+def update_task_db(task_id: int, task_data: TaskData) -> Task | None:
     """Atualiza uma tarefa existente"""
-    if task_id in db:
-        db[task_id] = task_data
-        return task_data
-    return None
+    task = storage.update(task_id, task_data)
+    _index_tasks([task])
+    return task
 
 def delete_task_db(task_id: int) -> bool:
     """Remove uma tarefa existente"""
-    if task_id in db:
-        del db[task_id]
-        return True
-    return False
+    deleted = storage.delete(task_id)
+    _unindex_tasks([task_id], [deleted])
+    return deleted
+
+def create_tasks_db(tasks: List[TaskData]) -> List[Task]:
+    """Cria várias tarefas em uma única operação no banco"""
+    created = storage.create_many(tasks)
+    _index_tasks(created)
+    return created
+
+def patch_tasks_db(patches: List[Patch]) -> List[Task | None]:
+    """Altera parcialmente várias tarefas; None indica ID inexistente"""
+    results = storage.patch_many(patches)
+    _index_tasks(results)
+    return results
+
+def delete_tasks_db(task_ids: List[int]) -> List[bool]:
+    """Remove várias tarefas; False indica ID inexistente"""
+    results = storage.delete_many(task_ids)
+    _unindex_tasks(task_ids, results)
+    return results
+
+def search_tasks_db(query: str, limit: int = 20) -> List[Task]:
+    """
+    Tarefas cujo título ou descrição contém todas as palavras da busca (cada
+    uma como início de palavra), da mais relevante para a menos.
+    """
+    if storage.has_search:
+        return storage.search(query, limit)
+    if not search_index.ready:
+        _build_search_index()
+    tasks = (storage.get(task_id) for task_id, _ in search_index.search(query, limit))
+    return [task for task in tasks if task is not None] #ignora removidas no meio da busca
+
+def get_task_version_db(task_id: int) -> str | None:
+    """Versão de uma tarefa, para o ETag; muda a cada alteração dela"""
+    version = storage.version(task_id)
+    return None if version is None else f"{storage.epoch}-{version}"
+
+def get_tasks_version_db() -> str:
+    """Versão da coleção de tarefas, para o ETag; muda a cada escrita"""
+    return f"{storage.epoch}-{storage.change_count()}"
 
 #Será usada para limpar o banco para realizar os testes
 def clear_db():
     """Limpa o banco de dados"""
-    global next_task_id
-    db.clear()
-    next_task_id = 1
\ No newline at end of file
+    storage.clear()
+    search_index.clear()
+
+
+# Versões assíncronas, usadas pelas rotas `async def` da API. Cada mecanismo
+# decide, em `TaskStorage.call`, se a operação roda no event loop ou fora dele.
+
+async def alist_tasks_db(
+    limit: Optional[int] = None,
+    cursor: Optional[int] = None,
+    completed: Optional[bool] = None,
+    title_prefix: Optional[str] = None,
+) -> Page:
+    """Versão assíncrona de `list_tasks_db`"""
+    return await storage.call(storage.page, limit, cursor, completed, title_prefix)
+
+def aiter_task_batches_db(batch_size: int = 500) -> AsyncIterator[List[Task]]:
+    """Versão assíncrona de `iter_task_batches_db`"""
+    return storage.aiter_batches(batch_size)
+
+async def aget_task_db(task_id: int) -> Task | None:
+    """Versão assíncrona de `get_task_db`"""
+    return await storage.call(storage.get, task_id)
+
+async def acreate_task_db(task_data: TaskData) -> Task:
+    """Versão assíncrona de `create_task_db`"""
+    task = await storage.call(storage.create, task_data)
+    _index_tasks([task])
+    return task
+
+async def aupdate_task_db(task_id: int, task_data: TaskData) -> Task | None:
+    """Versão assíncrona de `update_task_db`"""
+    task = await storage.call(storage.update, task_id, task_data)
+    _index_tasks([task])
+    return task
+
+async def adelete_task_db(task_id: int) -> bool:
+    """Versão assíncrona de `delete_task_db`"""
+    deleted = await storage.call(storage.delete, task_id)
+    _unindex_tasks([task_id], [deleted])
+    return deleted
+
+async def acreate_tasks_db(tasks: List[TaskData]) -> List[Task]:
+    """Versão assíncrona de `create_tasks_db`"""
+    created = await storage.call(storage.create_many, tasks)
+    _index_tasks(created)
+    return created
+
+async def apatch_tasks_db(patches: List[Patch]) -> List[Task | None]:
+    """Versão assíncrona de `patch_tasks_db`"""
+    results = await storage.call(storage.patch_many, patches)
+    _index_tasks(results)
+    return results
+
+async def adelete_tasks_db(task_ids: List[int]) -> List[bool]:
+    """Versão assíncrona de `delete_tasks_db`"""
+    results = await storage.call(storage.delete_many, task_ids)
+    _unindex_tasks(task_ids, results)
+    return results
+
+async def asearch_tasks_db(query: str, limit: int = 20) -> List[Task]:
+    """Versão assíncrona de `search_tasks_db`"""
+    if storage.has_search:
+        return await storage.call(storage.search, query, limit)
+    if not search_index.ready:
+        #a montagem lê o armazenamento inteiro: sempre fora do event loop, para
+        #não parar o servidor (mecanismos em memória rodariam `call` nele)
+        await asyncio.to_thread(_build_search_index)
+    tasks = [await storage.call(storage.get, task_id) for task_id, _ in search_index.search(query, limit)]
+    return [task for task in tasks if task is not None]
+
+async def aget_task_version_db(task_id: int) -> str | None:
+    """Versão assíncrona de `get_task_version_db`"""
+    version = await storage.call(storage.version, task_id)
+    return None if version is None else f"{storage.epoch}-{version}"
+
+async def aget_tasks_version_db() -> str:
+    """Versão assíncrona de `get_tasks_version_db`"""
+    return f"{storage.epoch}-{await storage.call(storage.change_count)}"
@@ -1,7 +1,23 @@
-from fastapi import FastAPI, HTTPException, status
-from typing import List
-from .models import Task, TaskCreate
-from .database import create_task_db, get_all_tasks_db, get_task_db, update_task_db, delete_task_db
+from fastapi import Body, FastAPI, Header, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+from typing import Annotated, AsyncIterator, List, Literal, Optional
+from .models import BulkResult, Task, TaskCreate, TaskPatch
+from .database import (
+    acreate_task_db,
+    alist_tasks_db,
+    aiter_task_batches_db,
+    aget_task_db,
+    aupdate_task_db,
+    adelete_task_db,
+    acreate_tasks_db,
+    apatch_tasks_db,
+    adelete_tasks_db,
+    aget_task_version_db,
+    aget_tasks_version_db,
+    asearch_tasks_db,
+)
+
+BULK_MAX_ITEMS = 10_000 #limite de itens por requisição nas rotas em lote
 
 app = FastAPI(
     title="API de gerenciamento de tarefas",
@@ -9,54 +25,180 @@ app = FastAPI(
     version="1.0.0"
 )
 
+def _etag(version: str) -> str:
+    #ETag fraco: a mesma versão pode ser serializada de formas equivalentes
+    return f'W/"{version}"'
+
+def _not_modified(if_none_match: Optional[str], etag: str) -> bool:
+    """Compara o If-None-Match com o ETag atual (comparação fraca, RFC 9110)"""
+    if if_none_match is None:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag.removeprefix("W/") in candidates
+
+def _not_modified_response(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
 @app.post("/tasks/", response_model=Task, status_code=status.HTTP_201_CREATED)
-def create_task(task: TaskCreate):
+async def create_task(task: TaskCreate):
     """
     Cria uma nova tarefa.
     - **title**: Título da tarefa (obrigatório).
     - **description**: Descrição opcional.
     - **completed**: Status da tarefa (padrão: `False`).
     """
-    new_task = Task(id=0, **task.model_dump())
-    return create_task_db(new_task)
+    return await acreate_task_db(task)
 
 @app.get("/tasks/", response_model=List[Task], status_code=status.HTTP_200_OK)
-def read_all_tasks():
+async def read_all_tasks(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[int] = Query(None, ge=0),
+    completed: Optional[bool] = None,
+    title_prefix: Optional[str] = Query(None, min_length=1),
+    if_none_match: Annotated[Optional[str], Header()] = None,
+):
+    """
+    Retorna as tarefas cadastradas, em ordem de ID.
+    - **limit**: tamanho máximo da página (sem limite retorna todas).
+    - **cursor**: valor do header `X-Next-Cursor` da página anterior.
+    - **completed**: filtra pelo status da tarefa.
+    - **title_prefix**: filtra pelo início do título.
+
+    A resposta traz um `ETag`; enviado de volta em `If-None-Match`, ele faz a
+    API responder 304 sem corpo enquanto nenhuma tarefa tiver mudado.
+    """
+    #a versão é lida antes dos dados: se mudar no meio, o ETag só fica mais antigo
+    etag = _etag(await aget_tasks_version_db())
+    if _not_modified(if_none_match, etag):
+        return _not_modified_response(etag)
+    tasks, next_cursor = await alist_tasks_db(limit, cursor, completed, title_prefix)
+    response.headers["ETag"] = etag
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = str(next_cursor)
+    return tasks
+
+# As rotas de busca, exportação e em lote ficam antes de /tasks/{task_id} para
+# que "search", "export" e "bulk" não sejam lidos como ID.
+
+@app.get("/tasks/search", response_model=List[Task], status_code=status.HTTP_200_OK)
+async def search_tasks(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+):
+    """
+    Busca tarefas pelo título e pela descrição.
+    - **q**: palavras buscadas; cada uma casa com palavras que começam com ela,
+      sem diferenciar maiúsculas nem acentos, e todas precisam aparecer.
+    - **limit**: quantidade máxima de resultados.
+
+    Os resultados vêm da mais relevante para a menos: palavras no título pesam
+    mais que na descrição, e palavras raras mais que as comuns.
+    """
+    return await asearch_tasks_db(q, limit)
+
+@app.get("/tasks/export", response_class=StreamingResponse, status_code=status.HTTP_200_OK)
+async def export_tasks(format: Literal["ndjson"] = "ndjson"):
     """
-    Retorna todas as tarefas cadastradas.
+    Exporta todas as tarefas em NDJSON (uma tarefa JSON por linha).
+    A resposta é enviada aos poucos, um lote por vez, então a memória usada não
+    depende da quantidade de tarefas.
     """
-    return get_all_tasks_db()
+    return StreamingResponse(_ndjson_lines(), media_type="application/x-ndjson")
+
+async def _ndjson_lines() -> AsyncIterator[str]:
+    async for batch in aiter_task_batches_db():
+        yield "".join(task.model_dump_json() + "\n" for task in batch)
+
+@app.post("/tasks/bulk", response_model=List[BulkResult], status_code=status.HTTP_201_CREATED)
+async def create_tasks_bulk(
+    tasks: Annotated[List[TaskCreate], Body(min_length=1, max_length=BULK_MAX_ITEMS)],
+):
+    """
+    Cria várias tarefas de uma vez. A lista inteira é validada antes de qualquer
+    gravação e as tarefas são salvas em um único lote.
+    """
+    created = await acreate_tasks_db(tasks)
+    return [BulkResult(id=task.id, status=status.HTTP_201_CREATED, task=task) for task in created]
+
+@app.patch("/tasks/bulk", response_model=List[BulkResult], status_code=status.HTTP_200_OK)
+async def patch_tasks_bulk(
+    patches: Annotated[List[TaskPatch], Body(min_length=1, max_length=BULK_MAX_ITEMS)],
+):
+    """
+    Altera várias tarefas de uma vez; só os campos enviados em cada item mudam.
+    Itens com ID inexistente retornam `status` 404 sem interromper o lote.
+    """
+    results = await apatch_tasks_db([
+        (patch.id, patch.model_dump(exclude_unset=True, exclude={"id"})) for patch in patches
+    ])
+    return [
+        BulkResult(id=patch.id, status=status.HTTP_200_OK, task=task) if task is not None
+        else _bulk_not_found(patch.id)
+        for patch, task in zip(patches, results)
+    ]
+
+@app.delete("/tasks/bulk", response_model=List[BulkResult], status_code=status.HTTP_200_OK)
+async def delete_tasks_bulk(
+    task_ids: Annotated[List[int], Body(min_length=1, max_length=BULK_MAX_ITEMS)],
+):
+    """
+    Deleta várias tarefas pelos seus IDs, informando o resultado de cada uma.
+    """
+    results = await adelete_tasks_db(task_ids)
+    return [
+        BulkResult(id=task_id, status=status.HTTP_204_NO_CONTENT) if deleted
+        else _bulk_not_found(task_id)
+        for task_id, deleted in zip(task_ids, results)
+    ]
+
+def _bulk_not_found(task_id: int) -> BulkResult:
+    return BulkResult(id=task_id, status=status.HTTP_404_NOT_FOUND, detail="Tarefa não encontrada")
 
 @app.get("/tasks/{task_id}", response_model=Task, status_code=status.HTTP_200_OK)
-def read_task(task_id: int):
+async def read_task(
+    task_id: int,
+    response: Response,
+    if_none_match: Annotated[Optional[str], Header()] = None,
+):
     """
     Retorna os dados de uma tarefa específica pelo seu ID.
+    Aceita `If-None-Match` com o `ETag` recebido antes e responde 304 se a
+    tarefa não mudou.
     """
-    db_task = get_task_db(task_id)
-    if db_task is None:
+    version = await aget_task_version_db(task_id)
+    if version is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tarefa não encontrada")
+    etag = _etag(version)
+    if _not_modified(if_none_match, etag):
+        return _not_modified_response(etag)
+    db_task = await aget_task_db(task_id)
+    if db_task is None: #removida depois da leitura da versão
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tarefa não encontrada")
+    response.headers["ETag"] = etag
     return db_task
 
 @app.put("/tasks/{task_id}", response_model=Task, status_code=status.HTTP_200_OK)
-def update_task(task_id: int, task: TaskCreate):
+async def update_task(task_id: int, task: TaskCreate):
     """
     Atualiza os dados de uma tarefa existente.
     """
-    if get_task_db(task_id) is None:
+    updated = await aupdate_task_db(task_id, task)
+    if updated is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tarefa não encontrada")
-    
-    update_task_data = Task(id=task_id, **task.model_dump())
-    return update_task_db(task_id, update_task_data)
+    return updated
 
 @app.delete("/tasks/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_task(task_id: int):
+async def delete_task(task_id: int):
     """
     Deleta uma tarefa pelo seu ID.
     """
-    if not delete_task_db(task_id):
+    if not await adelete_task_db(task_id):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tarefa não encontrada")
     return
 
 @app.get("/", status_code=status.HTTP_200_OK)
-def root():
+async def root():
     return {'status': 'ok'}
\ No newline at end of file
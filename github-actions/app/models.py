@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from typing import Optional
 
 class Task(BaseModel):
@@ -15,13 +15,41 @@ class TaskCreate(BaseModel):
     Modelo para criação de uma nova tarefa (sem o ID, que será gerado automaticamente).
     """
     title: str = Field(..., min_length=3, max_length=50)
-    description: Optional[str] = None
+    description: Optional[str] = Field(None, max_length=300)
     completed: bool = False
 
+class TaskPatch(BaseModel):
+    """
+    Modelo para a atualização parcial de uma tarefa em lote: só os campos enviados são alterados.
+    """
+    id: int
+    title: Optional[str] = Field(None, min_length=3, max_length=50)
+    description: Optional[str] = Field(None, max_length=300)
+    completed: Optional[bool] = None
+
+    @field_validator("title", "completed")
+    @classmethod
+    def not_null(cls, value):
+        if value is None:
+            raise ValueError("o campo não pode ser nulo")
+        return value
+
+class BulkResult(BaseModel):
+    """
+    Resultado de um item de uma operação em lote.
+    """
+    id: int
+    status: int
+    task: Optional[Task] = None
+    detail: Optional[str] = None
+
 """
 Task: Representa uma tarefa com id, title, description e completed. Usamos Field para adicionar validações, 
 como o tamanho mínimo e máximo do título.
 s
 TaskCreate: Um modelo específico para quando o usuário envia dados para criar uma tarefa. Note que ele não 
 tem o campo id, pois ele será gerado pela nossa API.
+
+TaskPatch e BulkResult: usados pelas rotas em lote (/tasks/bulk), que recebem listas e respondem com o
+resultado de cada item na mesma ordem.
 """
\ No newline at end of file
@@ -0,0 +1,252 @@
+import math
+import re
+import threading
+import unicodedata
+from array import array
+from bisect import bisect_left, insort
+from heapq import heappush, heapreplace, nlargest
+from typing import Callable, Dict, Iterable, List, Tuple
+from .models import Task
+from .storage.base import PREFIX_END
+
+TITLE_WEIGHT = 3 #um termo no título vale tanto quanto três na descrição
+PREFIX_FACTOR = 0.5 #termos que só começam com a palavra buscada valem menos
+
+_WORD = re.compile(r"\w+")
+_ID_BITS = 40 #ids até 2**40; o peso fica nos bits de cima da chave
+_ID_MASK = (1 << _ID_BITS) - 1
+
+
+def tokenize(text: str | None) -> List[str]:
+    """
+    Palavras de um texto, normalizadas para a busca: sem diferenciar
+    maiúsculas nem acentos ("Relatório" e "relatorio" são o mesmo termo).
+    """
+    if not text:
+        return []
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    plain = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return _WORD.findall(plain)
+
+
+def _impact_key(weight: int, task_id: int) -> int:
+    #ordem crescente da chave = peso decrescente e, no empate, id crescente
+    return (-weight << _ID_BITS) | task_id
+
+
+class SearchIndex:
+    """
+    Índice invertido do título e da descrição das tarefas.
+
+    Para cada termo guarda as tarefas que o contêm e o peso dele em cada uma
+    (ocorrências no título valem `TITLE_WEIGHT`) de duas formas: um
+    dicionário, para consultar o peso de uma tarefa, e um array em ordem de
+    peso decrescente, para ler primeiro as tarefas mais relevantes. O
+    vocabulário fica em uma lista ordenada, para achar por busca binária os
+    termos que começam com uma palavra. Cada escrita atualiza só os termos da
+    tarefa alterada.
+
+    O índice começa vazio e "não montado": `build` o preenche a partir do
+    armazenamento e, antes disso, `add` e `remove` não fazem nada (a montagem
+    já verá essas escritas). A montagem acontece em um índice novo, sem o
+    lock: as escritas feitas enquanto ela roda só são anotadas e, no fim, são
+    aplicadas ao índice novo antes de ele entrar no lugar do atual, então a
+    versão mais nova de cada tarefa vence e nenhuma escrita espera a montagem.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock() #uma montagem por vez
+        self.ready = False
+        self._pending: List[Tuple[bool, Task | int]] | None = None #escritas durante a montagem
+        self._generation = 0 #muda a cada clear, para descartar montagens antigas
+        self._postings: Dict[str, Dict[int, int]] = {} #termo -> {id: peso}
+        self._ranked: Dict[str, array] = {} #termo -> chaves (peso, id) em ordem de relevância
+        self._terms: List[str] = [] #vocabulário em ordem
+        self._documents: Dict[int, Tuple[str, ...]] = {} #id -> termos da tarefa
+
+    def build(self, batches: Callable[[], Iterable[List[Task]]]) -> None:
+        """
+        Monta o índice com todas as tarefas, lidas em lotes. Quem chama durante
+        outra montagem espera por ela em vez de repeti-la.
+        """
+        with self._build_lock:
+            with self._lock:
+                if self.ready:
+                    return
+                self._pending = []
+                generation = self._generation
+            fresh = SearchIndex()
+            for batch in batches():
+                for task in batch:
+                    fresh._put(task)
+            with self._lock:
+                if generation != self._generation:
+                    return #esvaziado durante a montagem: o que foi lido não vale mais
+                for added, value in self._pending:
+                    if added:
+                        fresh._put(value)
+                    else:
+                        fresh._drop(value)
+                self._pending = None
+                self._postings, self._ranked = fresh._postings, fresh._ranked
+                self._terms, self._documents = fresh._terms, fresh._documents
+                self.ready = True
+
+    def add(self, task: Task) -> None:
+        """Indexa uma tarefa criada ou substitui os termos de uma alterada"""
+        with self._lock:
+            if self.ready:
+                self._put(task)
+            elif self._pending is not None:
+                self._pending.append((True, task))
+
+    def remove(self, task_id: int) -> None:
+        """Tira uma tarefa removida do índice"""
+        with self._lock:
+            if self.ready:
+                self._drop(task_id)
+            elif self._pending is not None:
+                self._pending.append((False, task_id))
+
+    def clear(self, ready: bool = True) -> None:
+        """Esvazia o índice; com `ready=False` ele volta a precisar de `build`"""
+        with self._lock:
+            self._generation += 1
+            self._pending = None
+            self.ready = ready
+            self._postings, self._ranked, self._terms, self._documents = {}, {}, [], {}
+
+    def search(self, query: str, limit: int = 20) -> List[Tuple[int, float]]:
+        """
+        Ids das tarefas que contêm todas as palavras da busca, com a
+        relevância, da mais relevante para a menos.
+
+        Cada palavra casa com os termos que começam com ela. A relevância soma,
+        para cada termo casado, o peso dele na tarefa vezes a raridade do termo
+        (idf); casamentos só por prefixo valem `PREFIX_FACTOR` disso.
+
+        Com uma palavra, as listas dos termos casados são lidas lado a lado,
+        das tarefas de maior peso para as de menor, e a leitura para quando
+        nenhuma tarefa ainda não vista pode superar as `limit` melhores
+        (algoritmo de limiar de Fagin): buscas por palavras comuns leem só o
+        começo das listas. Com várias palavras, os candidatos são a interseção
+        dos conjuntos de tarefas de cada palavra, e só eles são pontuados.
+        """
+        words = set(tokenize(query))
+        if not words:
+            return []
+        with self._lock:
+            total = len(self._documents)
+            groups = [self._match(word, total) for word in words]
+            if not all(groups):
+                return []
+            scorers = [[(self._postings[term], factor) for term, factor in terms] for terms in groups]
+            if len(groups) == 1:
+                best = self._top_ranked(groups[0], scorers, limit)
+            else:
+                best = self._top_candidates(scorers, limit)
+        return [(-negative_id, score) for score, negative_id in sorted(best, reverse=True)]
+
+    def _top_ranked(self, terms, scorers, limit: int) -> List[Tuple[float, int]]:
+        """As `limit` melhores (relevância, -id) lendo as listas em ordem de peso"""
+        lists = [(self._ranked[term], factor) for term, factor in terms]
+        positions = [0] * len(lists)
+        seen = set()
+        best: List[Tuple[float, int]] = [] #heap das melhores até aqui
+        reading = True
+        while reading:
+            reading = False
+            threshold = 0.0 #maior relevância possível de uma tarefa ainda não vista
+            for i, (keys, factor) in enumerate(lists):
+                position = positions[i]
+                if position >= len(keys):
+                    continue
+                reading = True
+                positions[i] = position + 1
+                if position + 1 < len(keys):
+                    threshold -= (keys[position + 1] >> _ID_BITS) * factor
+                task_id = keys[position] & _ID_MASK
+                if task_id in seen:
+                    continue
+                seen.add(task_id)
+                score = self._score(task_id, scorers)
+                if len(best) < limit:
+                    heappush(best, (score, -task_id))
+                elif (score, -task_id) > best[0]:
+                    heapreplace(best, (score, -task_id))
+            if len(best) == limit and best[0][0] >= threshold:
+                break
+        return best
+
+    def _top_candidates(self, scorers, limit: int) -> List[Tuple[float, int]]:
+        """As `limit` melhores (relevância, -id) entre as tarefas com todas as palavras"""
+        candidates = None
+        for terms in sorted(scorers, key=lambda terms: sum(len(postings) for postings, _ in terms)):
+            if len(terms) == 1:
+                ids = terms[0][0].keys()
+            else:
+                ids = set().union(*(postings.keys() for postings, _ in terms))
+            #a interseção percorre o menor dos dois conjuntos
+            candidates = ids if candidates is None else candidates & ids
+            if not candidates:
+                return []
+        if any(len(terms) > 1 for terms in scorers):
+            return nlargest(limit, ((self._score(task_id, scorers), -task_id) for task_id in candidates))
+        #um termo por palavra: todo candidato está em todos os dicionários
+        scores = dict.fromkeys(candidates, 0.0)
+        for (postings, factor), in scorers:
+            for task_id in scores:
+                scores[task_id] += postings[task_id] * factor
+        return nlargest(limit, ((score, -task_id) for task_id, score in scores.items()))
+
+    def _match(self, word: str, total: int) -> List[Tuple[str, float]]:
+        """Termos que começam com `word` e o fator de relevância de cada um"""
+        start = bisect_left(self._terms, word)
+        end = bisect_left(self._terms, word + PREFIX_END, start)
+        matched = []
+        for term in self._terms[start:end]:
+            factor = math.log(1 + total / len(self._postings[term]))
+            matched.append((term, factor if term == word else factor * PREFIX_FACTOR))
+        return matched
+
+    @staticmethod
+    def _score(task_id: int, scorers) -> float:
+        """Relevância de uma tarefa, ou 0 se faltar alguma palavra"""
+        total = 0.0
+        for terms in scorers:
+            score = 0.0
+            for postings, factor in terms:
+                weight = postings.get(task_id)
+                if weight is not None:
+                    score += weight * factor
+            if not score:
+                return 0.0
+            total += score
+        return total
+
+    def _put(self, task: Task) -> None:
+        self._drop(task.id)
+        weights: Dict[str, int] = {}
+        for term in tokenize(task.title):
+            weights[term] = weights.get(term, 0) + TITLE_WEIGHT
+        for term in tokenize(task.description):
+            weights[term] = weights.get(term, 0) + 1
+        for term, weight in weights.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                self._ranked[term] = array("q")
+                insort(self._terms, term)
+            postings[task.id] = weight
+            insort(self._ranked[term], _impact_key(weight, task.id))
+        self._documents[task.id] = tuple(weights)
+
+    def _drop(self, task_id: int) -> None:
+        for term in self._documents.pop(task_id, ()):
+            postings = self._postings[term]
+            ranked = self._ranked[term]
+            del ranked[bisect_left(ranked, _impact_key(postings.pop(task_id), task_id))]
+            if not postings:
+                del self._postings[term], self._ranked[term]
+                del self._terms[bisect_left(self._terms, term)]
@@ -0,0 +1,23 @@
+from .base import TaskStorage
+from .log import LogStorage
+from .memory import MemoryStorage
+from .sqlite import SQLiteStorage
+
+__all__ = ["TaskStorage", "MemoryStorage", "LogStorage", "SQLiteStorage", "create_storage"]
+
+
+def create_storage(url: str | None = None) -> TaskStorage:
+    """
+    Cria o mecanismo de armazenamento a partir de uma URL.
+
+    - `None` ou `memory://`: dicionário em memória (padrão).
+    - `log:///caminho/da/pasta`: memória com log e snapshots em disco.
+    - `sqlite:///caminho/do/arquivo.db`: arquivo SQLite compartilhado.
+    """
+    if not url or url == "memory://":
+        return MemoryStorage()
+    if url.startswith("log:///"):
+        return LogStorage(url[len("log:///"):])
+    if url.startswith("sqlite:///"):
+        return SQLiteStorage(url[len("sqlite:///"):])
+    raise ValueError(f"Mecanismo de armazenamento não suportado: {url}")
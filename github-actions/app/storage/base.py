@@ -0,0 +1,169 @@
+from abc import ABC, abstractmethod
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+from ..models import Task, TaskCreate
+
+TaskData = Task | TaskCreate #qualquer modelo com title, description e completed
+Page = Tuple[List[Task], Optional[int]] #(tarefas da página, cursor da próxima)
+Patch = Tuple[int, Dict[str, Any]] #(id, campos a alterar)
+T = TypeVar("T")
+
+# Maior caractere unicode: limite superior das buscas por prefixo nos índices
+PREFIX_END = "\U0010ffff"
+
+def write_operation(method: Callable[..., T]) -> Callable[..., T]:
+    """
+    Marca um método do mecanismo como escrita. Mecanismos que tratam escritas
+    à parte em `call` (como o LogStorage, que as manda esperar o disco em outra
+    thread) olham a marca, que continua lá se o método for embrulhado com
+    `functools.wraps`.
+    """
+    method.is_write = True
+    return method
+
+class TaskStorage(ABC):
+    """
+    Interface comum dos mecanismos de armazenamento de tarefas.
+
+    As funções de `app.database` delegam para uma instância desta classe, então
+    trocar o mecanismo não muda nada para as rotas da API.
+
+    Cada escrita dá à tarefa uma nova versão e incrementa o contador global de
+    alterações; a API usa os dois para montar ETags sem serializar nada.
+    """
+
+    #identifica a sequência de versões: muda quando elas podem recomeçar, como
+    #ao reiniciar um mecanismo em memória
+    epoch = ""
+
+    #True se o mecanismo implementa `search` por conta própria; senão a busca
+    #usa o índice em memória de `app.search`, mantido por este processo
+    has_search = False
+
+    @abstractmethod
+    def create(self, task_data: TaskData) -> Task:
+        """Salva uma nova tarefa com o próximo ID e a retorna"""
+
+    @abstractmethod
+    def get(self, task_id: int) -> Task | None:
+        """Busca uma tarefa pelo seu ID"""
+
+    @abstractmethod
+    def update(self, task_id: int, task_data: TaskData) -> Task | None:
+        """Substitui uma tarefa existente; retorna None se ela não existir"""
+
+    @abstractmethod
+    def delete(self, task_id: int) -> bool:
+        """Remove uma tarefa; retorna False se ela não existir"""
+
+    @abstractmethod
+    def version(self, task_id: int) -> int | None:
+        """Versão atual de uma tarefa (muda a cada escrita), ou None se não existir"""
+
+    @abstractmethod
+    def change_count(self) -> int:
+        """Contador global que aumenta a cada escrita no mecanismo"""
+
+    @abstractmethod
+    def all(self) -> List[Task]:
+        """Retorna todas as tarefas em ordem de ID"""
+
+    @abstractmethod
+    def page(
+        self,
+        limit: Optional[int] = None,
+        cursor: Optional[int] = None,
+        completed: Optional[bool] = None,
+        title_prefix: Optional[str] = None,
+    ) -> Page:
+        """Retorna uma página de tarefas em ordem de ID e o próximo cursor"""
+
+    def search(self, query: str, limit: int = 20) -> List[Task]:
+        """
+        Tarefas com todas as palavras da busca no título ou na descrição (cada
+        uma como início de palavra), da mais relevante para a menos.
+
+        Só os mecanismos com `has_search` buscam de verdade; nos outros a lista
+        vem vazia e a busca fica a cargo do índice de `app.search`.
+        """
+        return []
+
+    def attach_index(self, index) -> bool:
+        """
+        Pede ao mecanismo que mantenha `index` (um objeto com `add(task)`,
+        `remove(task_id)` e `clear()`, como `app.search.SearchIndex`) dentro de
+        cada escrita, sob o mesmo lock dela, para que o índice veja as escritas
+        de uma tarefa na ordem em que foram aplicadas. `None` desfaz o pedido.
+
+        Retorna False se o mecanismo não faz isso; aí quem chama atualiza o
+        índice depois de cada escrita.
+        """
+        return False
+
+    def iter_batches(self, batch_size: int = 500) -> Iterator[List[Task]]:
+        """
+        Percorre todas as tarefas em lotes, em ordem de ID. Cada lote é uma
+        página buscada pelo cursor, então a memória usada não cresce com a tabela.
+        """
+        cursor = None
+        while True:
+            batch, cursor = self.page(limit=batch_size, cursor=cursor)
+            if batch:
+                yield batch
+            if cursor is None:
+                return
+
+    async def call(self, method: Callable[..., T], *args) -> T:
+        """
+        Executa uma operação do mecanismo a partir de código assíncrono.
+
+        Mecanismos em memória não fazem I/O e rodam direto no event loop; os que
+        bloqueiam (arquivos, sockets) sobrescrevem este método para rodar fora dele.
+        """
+        return method(*args)
+
+    async def aiter_batches(self, batch_size: int = 500) -> AsyncIterator[List[Task]]:
+        """Versão assíncrona de `iter_batches`"""
+        cursor = None
+        while True:
+            batch, cursor = await self.call(self.page, batch_size, cursor)
+            if batch:
+                yield batch
+            if cursor is None:
+                return
+
+    def create_many(self, tasks: List[TaskData]) -> List[Task]:
+        """Salva várias tarefas de uma vez, na ordem recebida"""
+        return [self.create(task) for task in tasks]
+
+    def patch_many(self, patches: List[Patch]) -> List[Task | None]:
+        """
+        Altera apenas os campos informados de várias tarefas. Cada posição do
+        resultado é a tarefa atualizada ou None se o ID não existir.
+        """
+        results = []
+        for task_id, fields in patches:
+            current = self.get(task_id)
+            if current is None:
+                results.append(None)
+                continue
+            results.append(self.update(task_id, current.model_copy(update=fields)))
+        return results
+
+    def delete_many(self, task_ids: List[int]) -> List[bool]:
+        """Remove várias tarefas; cada posição indica se o ID existia"""
+        return [self.delete(task_id) for task_id in task_ids]
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove todas as tarefas e reinicia o contador de IDs"""
+
+    def close(self) -> None:
+        """Libera os recursos do mecanismo (conexões, arquivos)"""
+
+
+def normalize_title(title: str) -> str:
+    """Chave usada nos filtros por título (sem diferenciar maiúsculas)"""
+    folded = title.casefold()
+    # reaproveita a própria string quando ela já está normalizada, para que o
+    # índice não guarde uma segunda cópia de cada título
+    return title if folded == title else folded
@@ -0,0 +1,314 @@
+import asyncio
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterator, List, Tuple, TypeVar
+from .memory import MemoryStorage, TaskRecord
+
+T = TypeVar("T")
+
+SNAPSHOT_FILE = "snapshot.jsonl"
+LOG_PREFIX = "tasks-"
+LOG_SUFFIX = ".log"
+
+_ROTATE = object() #marca, no buffer, o ponto em que o log troca de arquivo
+
+READ_CHUNK_BYTES = 1 << 20 #tamanho aproximado dos blocos lidos na recuperação
+
+
+def _read_chunks(file: BinaryIO) -> Iterator[Tuple[list, int]]:
+    """
+    Lê um arquivo com um valor JSON por linha em blocos, decodificando cada
+    bloco com uma única chamada a `json.loads` (bem mais rápido que uma chamada
+    por linha). Para na primeira linha incompleta ou inválida, que só pode vir
+    de uma gravação interrompida. Gera (valores, bytes válidos do bloco).
+    """
+    while True:
+        lines = file.readlines(READ_CHUNK_BYTES)
+        if not lines:
+            return
+        complete = lines if lines[-1].endswith(b"\n") else lines[:-1]
+        try:
+            yield json.loads(b"[" + b",".join(complete) + b"]"), sum(map(len, complete))
+        except ValueError:
+            values = []
+            for line in complete:
+                try:
+                    values.append(json.loads(line))
+                except ValueError:
+                    break
+            yield values, sum(len(line) for line in complete[:len(values)])
+            return
+        if len(complete) < len(lines):
+            return
+
+
+class LogStorage(MemoryStorage):
+    """
+    Armazenamento em memória com persistência em disco.
+
+    Cada escrita vira uma linha JSON em um log só de acréscimo. Um thread de
+    gravação junta as linhas que chegam enquanto o disco está ocupado e grava
+    todas com um único fsync (group commit); cada escrita só retorna depois
+    que sua linha está no disco.
+
+    A cada `snapshot_every` entradas, o estado é copiado para um snapshot
+    compacto e os logs antigos são apagados. Ao iniciar, o mecanismo carrega o
+    snapshot e reaplica os logs gravados depois dele.
+
+    Arquivos na pasta `directory`:
+    - `snapshot.jsonl`: cabeçalho `{"generation": g, "next_task_id": n}` e uma
+      tarefa `[id, title, description, completed]` por linha.
+    - `tasks-<g>.log`: entradas `["put", id, title, description, completed]`,
+      `["delete", id]` ou `["clear"]`, aplicadas sobre o snapshot de geração g.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        snapshot_every: int = 100_000,
+        sync: bool = True,
+        stripes: int = 16,
+    ):
+        super().__init__(stripes)
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.snapshot_every = snapshot_every
+        self.sync = sync
+
+        self._generation = self._recover()
+        self._file = open(self._log_path(self._generation), "a", encoding="utf-8")
+        self._entries_in_log = 0
+
+        self._cond = threading.Condition()
+        self._buffer: list = []
+        self._enqueued = 0 #tickets entregues
+        self._durable = 0 #tickets já gravados em disco
+        self._error: BaseException | None = None
+        self._closing = False
+        self._snapshot_lock = threading.Lock() #uma compactação por vez
+        self._compacting = False
+        self._compaction: threading.Thread | None = None
+        self._writer = threading.Thread(target=self._write_loop, name="task-log", daemon=True)
+        self._writer.start()
+        self._executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="task-log-commit")
+
+    async def call(self, method: Callable[..., T], *args) -> T:
+        # Leituras continuam no event loop; escritas esperam o fsync em outra
+        # thread, e as que esperam juntas são gravadas no mesmo group commit.
+        if not getattr(method, "is_write", False):
+            return method(*args)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(method, *args))
+
+    def _log_path(self, generation: int) -> Path:
+        return self.directory / f"{LOG_PREFIX}{generation}{LOG_SUFFIX}"
+
+    def _log_generations(self) -> List[int]:
+        generations = []
+        for path in self.directory.glob(f"{LOG_PREFIX}*{LOG_SUFFIX}"):
+            number = path.name[len(LOG_PREFIX):-len(LOG_SUFFIX)]
+            if number.isdigit():
+                generations.append(int(number))
+        return sorted(generations)
+
+    # ---------------- recuperação ----------------
+
+    def _recover(self) -> int:
+        """Carrega snapshot e logs; retorna a geração do log a continuar"""
+        dbs = [shard.db for shard in self._shards]
+        stripes = len(dbs)
+        generation, next_task_id = 0, 1
+
+        snapshot = self.directory / SNAPSHOT_FILE
+        if snapshot.exists():
+            with open(snapshot, "rb") as file:
+                header = json.loads(file.readline())
+                generation, next_task_id = header["generation"], header["next_task_id"]
+                for rows, _ in _read_chunks(file):
+                    for task_id, title, description, completed in rows:
+                        dbs[task_id % stripes][task_id] = TaskRecord(title, description, completed)
+
+        # Durante a carga os registros vão direto para os dicionários; os
+        # índices são montados no final com uma ordenação por faixa.
+        log_generations = [g for g in self._log_generations() if g >= generation]
+        for log_generation in log_generations:
+            path = self._log_path(log_generation)
+            valid_size = 0
+            with open(path, "rb") as file:
+                for entries, size in _read_chunks(file):
+                    valid_size += size
+                    for entry in entries:
+                        op = entry[0]
+                        if op == "put":
+                            task_id = entry[1]
+                            dbs[task_id % stripes][task_id] = TaskRecord(*entry[2:])
+                            next_task_id = max(next_task_id, task_id + 1)
+                        elif op == "delete":
+                            dbs[entry[1] % stripes].pop(entry[1], None)
+                        elif op == "clear":
+                            for db in dbs:
+                                db.clear()
+                            next_task_id = 1
+            if valid_size < path.stat().st_size:
+                # descarta a linha incompleta para que novas entradas não se colem a ela
+                os.truncate(path, valid_size)
+
+        for shard in self._shards:
+            shard.rebuild_indexes()
+        self.next_task_id = next_task_id
+        return log_generations[-1] if log_generations else generation
+
+    # ---------------- gravação (group commit) ----------------
+
+    def _check_writable(self) -> None:
+        # Depois de uma falha do thread de gravação, nenhuma escrita nova chega
+        # à memória: ela sumiria no reinício, embora as leituras a mostrassem.
+        # As que já estavam esperando o disco recebem o mesmo erro em `_commit`.
+        if self._error is not None:
+            raise RuntimeError("Falha ao gravar o log de tarefas") from self._error
+
+    def _journal(self, op: str, task_id: int = 0, record: TaskRecord | None = None) -> int:
+        if op == "put":
+            entry = [op, task_id, record.title, record.description, record.completed]
+        elif op == "delete":
+            entry = [op, task_id]
+        else:
+            entry = [op]
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._cond:
+            self._buffer.append(line)
+            self._enqueued += 1
+            self._cond.notify_all()
+            return self._enqueued
+
+    def _commit(self, ticket: int) -> None:
+        if not ticket:
+            return
+        with self._cond:
+            while self._durable < ticket and self._error is None:
+                self._cond.wait()
+            if self._error is not None:
+                raise RuntimeError("Falha ao gravar o log de tarefas") from self._error
+
+    def _write_loop(self) -> None:
+        while True:
+            with self._cond:
+                while not self._buffer and not self._closing:
+                    self._cond.wait()
+                if not self._buffer:
+                    return
+                batch, self._buffer = self._buffer, []
+                last_ticket = self._enqueued
+            # A gravação acontece fora do lock: enquanto o disco trabalha, novas
+            # escritas se acumulam no buffer e vão juntas na próxima rodada.
+            try:
+                self._write_batch(batch)
+            except BaseException as exc:
+                with self._cond:
+                    self._error = exc
+                    self._cond.notify_all()
+                return
+            # a compactação começa antes de as escritas do lote retornarem, para
+            # que um close logo depois delas espere por ela
+            if self._entries_in_log >= self.snapshot_every:
+                self._start_compaction()
+            with self._cond:
+                self._durable = last_ticket
+                self._cond.notify_all()
+
+    def _write_batch(self, batch: list) -> None:
+        lines = []
+        for item in batch:
+            if item is _ROTATE:
+                self._flush(lines)
+                lines = []
+                self._file.close()
+                self._generation += 1
+                self._file = open(self._log_path(self._generation), "a", encoding="utf-8")
+                self._entries_in_log = 0
+            else:
+                lines.append(item)
+        self._flush(lines)
+
+    def _flush(self, lines: list) -> None:
+        if lines:
+            self._file.write("".join(lines))
+            self._entries_in_log += len(lines)
+        self._file.flush()
+        if self.sync:
+            os.fsync(self._file.fileno())
+
+    # ---------------- snapshot ----------------
+
+    def _start_compaction(self) -> None:
+        # só o thread de gravação chama este método, então não há disputa na flag
+        if self._compacting:
+            return
+        self._compacting = True
+        self._compaction = threading.Thread(target=self.compact, name="task-snapshot", daemon=True)
+        self._compaction.start()
+
+    def _freeze(self) -> Tuple[int, int, List[dict]]:
+        """
+        Copia o estado e marca a troca de log no mesmo instante, com todas as
+        faixas travadas. Os registros são imutáveis, então copiar os dicionários
+        basta; o snapshot é escrito depois, sem segurar os locks.
+        """
+        with self._all_locks():
+            frozen = [dict(shard.db) for shard in self._shards]
+            next_task_id = self.next_task_id
+            with self._cond:
+                self._buffer.append(_ROTATE)
+                self._enqueued += 1
+                ticket = self._enqueued
+                self._cond.notify_all()
+        return ticket, next_task_id, frozen
+
+    def compact(self) -> None:
+        """Grava um snapshot do estado atual e apaga os logs que ele substitui"""
+        with self._snapshot_lock:
+            try:
+                if not self._closing:
+                    self._write_snapshot()
+            finally:
+                self._compacting = False
+
+    def _write_snapshot(self) -> None:
+        ticket, next_task_id, frozen = self._freeze()
+        self._commit(ticket) #espera a troca de arquivo de log
+        with self._cond:
+            generation = self._generation
+        tmp = self.directory / (SNAPSHOT_FILE + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as file:
+            header = {"generation": generation, "next_task_id": next_task_id}
+            file.write(json.dumps(header) + "\n")
+            for db in frozen:
+                file.writelines(
+                    json.dumps(
+                        [task_id, record.title, record.description, record.completed],
+                        ensure_ascii=False,
+                    ) + "\n"
+                    for task_id, record in db.items()
+                )
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp, self.directory / SNAPSHOT_FILE)
+        for old in self._log_generations():
+            if old < generation:
+                self._log_path(old).unlink(missing_ok=True)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        compaction = self._compaction
+        if compaction is not None:
+            compaction.join()
+        # espera uma compactação em andamento e impede que outra comece
+        with self._snapshot_lock, self._cond:
+            self._closing = True
+            self._cond.notify_all()
+        self._writer.join()
+        self._file.close()
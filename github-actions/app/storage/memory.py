@@ -0,0 +1,415 @@
+import os
+import threading
+from bisect import bisect_left, bisect_right, insort
+from contextlib import ExitStack, contextmanager
+from heapq import merge, nsmallest
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Tuple
+from ..models import Task
+from .base import PREFIX_END, Page, Patch, TaskData, TaskStorage, normalize_title, write_operation
+
+
+def _sorted_remove(values: list, value) -> None:
+    """Remove um valor de uma lista ordenada em O(log n) + deslocamento"""
+    i = bisect_left(values, value)
+    if i < len(values) and values[i] == value:
+        del values[i]
+
+
+def _prefix_entries(index: List[Tuple[str, int]], key: str) -> List[Tuple[str, int]]:
+    """
+    Entradas do índice de títulos que começam com `key`, lidas sem lock.
+
+    Uma escrita entre a busca binária e a fatia desloca as posições, então a
+    fatia leva um vizinho de cada lado: se eles não estiverem fora do prefixo
+    (ou o início/fim da lista), a fatia pode ter perdido entradas e a leitura
+    é refeita. A fatia é uma cópia atômica de um trecho contíguo da lista.
+    """
+    low, high = (key,), (key + PREFIX_END,)
+    while True:
+        start = bisect_left(index, low)
+        end = bisect_left(index, high, start)
+        first = max(start - 1, 0)
+        window = index[first:end + 1]
+        complete_left = first == 0 or (window and window[0] < low)
+        complete_right = len(window) < end + 1 - first or (window and window[-1] >= high)
+        if complete_left and complete_right:
+            return [entry for entry in window if low <= entry < high]
+
+
+class TaskRecord:
+    """
+    Representação compacta de uma tarefa dentro do armazenamento em memória.
+
+    Um objeto com `__slots__` ocupa uma fração de um modelo Pydantic; o id não
+    é guardado porque já é a chave do dicionário. Registros nunca são alterados
+    depois de publicados no dicionário, para que leituras sem lock vejam sempre
+    um estado inteiro.
+    """
+
+    __slots__ = ("title", "description", "completed", "version")
+
+    def __init__(self, title: str, description: str | None, completed: bool, version: int = 0):
+        self.title = title
+        self.description = description
+        self.completed = completed
+        self.version = version
+
+    @classmethod
+    def from_data(cls, task_data: TaskData) -> "TaskRecord":
+        return cls(task_data.title, task_data.description, task_data.completed)
+
+    def replace(self, fields: dict) -> "TaskRecord":
+        """Novo registro com os campos informados alterados"""
+        return TaskRecord(
+            fields.get("title", self.title),
+            fields.get("description", self.description),
+            fields.get("completed", self.completed),
+        )
+
+    def to_task(self, task_id: int) -> Task:
+        """Monta o modelo da API; os dados já foram validados na gravação"""
+        return Task.model_construct(
+            id=task_id, title=self.title, description=self.description, completed=self.completed
+        )
+
+
+class _Shard:
+    """
+    Uma faixa do armazenamento: as tarefas cujo id cai nela e seus índices,
+    protegidos por um lock próprio.
+    """
+
+    __slots__ = ("lock", "changes", "db", "ids_index", "completed_index", "title_index")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.changes = 0 #escritas na faixa; também serve de versão dos registros
+        self.db: Dict[int, TaskRecord] = {}
+        self.ids_index: List[int] = [] #ids da faixa, em ordem crescente
+        self.completed_index: Dict[bool, List[int]] = {True: [], False: []}
+        self.title_index: List[Tuple[str, int]] = [] #(título normalizado, id)
+
+    def put(self, task_id: int, task: TaskRecord) -> None:
+        """Grava ou substitui uma tarefa e seus índices (com o lock adquirido)"""
+        self.changes += 1
+        task.version = self.changes #o registro ainda não está visível para leitores
+        current = self.db.get(task_id)
+        if current is None:
+            insort(self.ids_index, task_id)
+        else:
+            _sorted_remove(self.completed_index[current.completed], task_id)
+            _sorted_remove(self.title_index, (normalize_title(current.title), task_id))
+        self.db[task_id] = task
+        insort(self.completed_index[task.completed], task_id)
+        insort(self.title_index, (normalize_title(task.title), task_id))
+
+    def remove(self, task_id: int) -> bool:
+        """Remove uma tarefa e seus índices (com o lock adquirido)"""
+        current = self.db.get(task_id)
+        if current is None:
+            return False
+        self.changes += 1
+        _sorted_remove(self.ids_index, task_id)
+        _sorted_remove(self.completed_index[current.completed], task_id)
+        _sorted_remove(self.title_index, (normalize_title(current.title), task_id))
+        del self.db[task_id]
+        return True
+
+    def clear(self) -> None:
+        self.changes += 1
+        self.db.clear()
+        self.ids_index.clear()
+        self.completed_index[True].clear()
+        self.completed_index[False].clear()
+        self.title_index.clear()
+
+    def rebuild_indexes(self) -> None:
+        """
+        Reconstrói os índices a partir do dicionário com uma ordenação só, em
+        vez de um insort por tarefa. Usado em cargas grandes (recuperação).
+        """
+        self.ids_index = sorted(self.db)
+        self.completed_index = {True: [], False: []}
+        for task_id in self.ids_index:
+            self.completed_index[self.db[task_id].completed].append(task_id)
+        self.title_index = sorted(
+            (normalize_title(record.title), task_id) for task_id, record in self.db.items()
+        )
+
+
+class MemoryStorage(TaskStorage):
+    """
+    Armazenamento em dicionários na memória do processo, seguro entre threads.
+
+    As tarefas são divididas em faixas (`stripes`) pelo id, cada uma com seu
+    próprio lock e seus índices secundários (listas ordenadas), então escritas
+    em faixas diferentes não disputam o mesmo lock. Os IDs vêm de um contador
+    protegido por um lock curto.
+
+    Leituras não usam lock: consultas ao dicionário e fatias/bisect das listas
+    são operações atômicas, e uma tarefa removida entre a leitura do índice e a
+    do dicionário é simplesmente ignorada.
+    """
+
+    def __init__(self, stripes: int = 16):
+        self._shards = [_Shard() for _ in range(stripes)]
+        self._id_lock = threading.Lock()
+        self.next_task_id = 1
+        self.epoch = os.urandom(4).hex() #versões recomeçam a cada instância
+        self._index = None #índice mantido dentro das escritas (attach_index)
+
+    def _shard(self, task_id: int) -> _Shard:
+        return self._shards[task_id % len(self._shards)]
+
+    def _allocate_id(self) -> int:
+        with self._id_lock:
+            task_id = self.next_task_id
+            self.next_task_id += 1
+        return task_id
+
+    @contextmanager
+    def _all_locks(self) -> Iterator[None]:
+        """Adquire o lock de IDs e o de todas as faixas (sempre na mesma ordem)"""
+        with ExitStack() as stack:
+            stack.enter_context(self._id_lock)
+            for shard in self._shards:
+                stack.enter_context(shard.lock)
+            yield
+
+    def attach_index(self, index) -> bool:
+        self._index = index
+        return True
+
+    def _applied(self, op: str, task_id: int = 0, record: TaskRecord | None = None) -> int:
+        """
+        Chamado com o lock da faixa (ou de todas, no "clear") logo depois de
+        aplicar uma escrita: atualiza o índice anexado na mesma ordem em que as
+        escritas de cada tarefa acontecem e as passa para `_journal`.
+        """
+        if self._index is not None:
+            if op == "put":
+                self._index.add(record.to_task(task_id))
+            elif op == "delete":
+                self._index.remove(task_id)
+            else:
+                self._index.clear()
+        return self._journal(op, task_id, record)
+
+    # Ganchos para mecanismos que registram as escritas (ver LogStorage).
+    # `_journal` é chamado com o lock da faixa adquirido, então as entradas de
+    # uma mesma tarefa saem na ordem em que foram aplicadas; ele retorna um
+    # número que `_commit` usa, já fora do lock, para esperar a gravação.
+
+    def _check_writable(self) -> None:
+        """Chamado antes de cada escrita mudar a memória; levanta se ela não puder ser registrada"""
+
+    def _journal(self, op: str, task_id: int = 0, record: TaskRecord | None = None) -> int:
+        return 0
+
+    def _commit(self, ticket: int) -> None:
+        pass
+
+    def _insert(self, task_data: TaskData) -> Tuple[Task, int]:
+        self._check_writable()
+        record = TaskRecord.from_data(task_data)
+        task_id = self._allocate_id()
+        shard = self._shard(task_id)
+        with shard.lock:
+            shard.put(task_id, record)
+            ticket = self._applied("put", task_id, record)
+        return record.to_task(task_id), ticket
+
+    def _remove(self, task_id: int) -> Tuple[bool, int]:
+        self._check_writable()
+        shard = self._shard(task_id)
+        with shard.lock:
+            if not shard.remove(task_id):
+                return False, 0
+            return True, self._applied("delete", task_id)
+
+    @write_operation
+    def create(self, task_data: TaskData) -> Task:
+        task, ticket = self._insert(task_data)
+        self._commit(ticket)
+        return task
+
+    @write_operation
+    def create_many(self, tasks: List[TaskData]) -> List[Task]:
+        created, ticket = [], 0
+        for task_data in tasks:
+            task, ticket = self._insert(task_data)
+            created.append(task)
+        self._commit(ticket) #uma espera só para o lote inteiro
+        return created
+
+    def get(self, task_id: int) -> Task | None:
+        record = self._shard(task_id).db.get(task_id)
+        return None if record is None else record.to_task(task_id)
+
+    @write_operation
+    def update(self, task_id: int, task_data: TaskData) -> Task | None:
+        self._check_writable()
+        record = TaskRecord.from_data(task_data)
+        shard = self._shard(task_id)
+        with shard.lock:
+            if task_id not in shard.db:
+                return None
+            shard.put(task_id, record)
+            ticket = self._applied("put", task_id, record)
+        self._commit(ticket)
+        return record.to_task(task_id)
+
+    @write_operation
+    def patch_many(self, patches: List[Patch]) -> List[Task | None]:
+        # Leitura e escrita de cada tarefa acontecem sob o mesmo lock, então
+        # duas alterações parciais simultâneas não perdem campos uma da outra.
+        self._check_writable()
+        results, ticket = [], 0
+        for task_id, fields in patches:
+            shard = self._shard(task_id)
+            with shard.lock:
+                record = shard.db.get(task_id)
+                if record is not None:
+                    record = record.replace(fields)
+                    shard.put(task_id, record)
+                    ticket = self._applied("put", task_id, record)
+            results.append(None if record is None else record.to_task(task_id))
+        self._commit(ticket)
+        return results
+
+    @write_operation
+    def delete(self, task_id: int) -> bool:
+        deleted, ticket = self._remove(task_id)
+        self._commit(ticket)
+        return deleted
+
+    @write_operation
+    def delete_many(self, task_ids: List[int]) -> List[bool]:
+        results, last_ticket = [], 0
+        for task_id in task_ids:
+            deleted, ticket = self._remove(task_id)
+            results.append(deleted)
+            last_ticket = max(last_ticket, ticket)
+        self._commit(last_ticket)
+        return results
+
+    def version(self, task_id: int) -> int | None:
+        record = self._shard(task_id).db.get(task_id)
+        return None if record is None else record.version
+
+    def change_count(self) -> int:
+        # cada faixa só incrementa o seu contador, então a soma também só cresce
+        return sum(shard.changes for shard in self._shards)
+
+    def _lookup(self, task_ids) -> List[Task]:
+        tasks = []
+        for task_id in task_ids:
+            record = self._shard(task_id).db.get(task_id)
+            if record is not None:
+                tasks.append(record.to_task(task_id))
+        return tasks
+
+    def all(self) -> List[Task]:
+        return self._lookup(merge(*(shard.ids_index[:] for shard in self._shards)))
+
+    def page(
+        self,
+        limit: Optional[int] = None,
+        cursor: Optional[int] = None,
+        completed: Optional[bool] = None,
+        title_prefix: Optional[str] = None,
+    ) -> Page:
+        after = cursor or 0
+        wanted = None if limit is None else limit + 1
+
+        if title_prefix is not None:
+            key = normalize_title(title_prefix)
+            # só uma estimativa: as faixas podem mudar até a leitura da página
+            matches = sum(
+                bisect_left(shard.title_index, (key + PREFIX_END,)) - bisect_left(shard.title_index, (key,))
+                for shard in self._shards
+            )
+            scanned = sum(len(self._id_base(shard, completed)) for shard in self._shards)
+            # Ler as correspondências pelo índice de títulos custa `matches`; ler
+            # os ids em ordem a partir do cursor até encher a página custa, em
+            # média, `wanted * scanned / matches`. Cada página usa o mais barato,
+            # então paginar um prefixo comum não relê todas as correspondências.
+            if wanted is not None and matches * matches > wanted * scanned:
+                page_ids = self._prefix_scan(key, after, completed, wanted)
+            else:
+                page_ids = self._prefix_matches(key, after, completed, wanted)
+        else:
+            # Cada faixa contribui no máximo `wanted` ids a partir do cursor; a
+            # junção ordenada dessas fatias é a página.
+            slices = []
+            for shard in self._shards:
+                base = shard.ids_index if completed is None else shard.completed_index[completed]
+                start = bisect_right(base, after)
+                slices.append(base[start:] if wanted is None else base[start:start + wanted])
+            page_ids = list(islice(merge(*slices), wanted))
+
+        next_cursor = None
+        if limit is not None and len(page_ids) > limit:
+            page_ids = page_ids[:limit]
+            next_cursor = page_ids[-1]
+        tasks = self._lookup(page_ids)
+        if completed is not None:
+            # descarta tarefas cujo status mudou depois da leitura do índice
+            tasks = [task for task in tasks if task.completed == completed]
+        return tasks, next_cursor
+
+    @staticmethod
+    def _id_base(shard: _Shard, completed: Optional[bool]) -> List[int]:
+        return shard.ids_index if completed is None else shard.completed_index[completed]
+
+    def _prefix_matches(self, key, after, completed, wanted) -> List[int]:
+        """Ids com o prefixo, lidos pelo índice de títulos e ordenados por id"""
+        matches = []
+        for shard in self._shards:
+            for _, task_id in _prefix_entries(shard.title_index, key):
+                if task_id <= after:
+                    continue
+                task = shard.db.get(task_id)
+                #o título pode ter mudado depois da leitura do índice
+                if (
+                    task is not None
+                    and (completed is None or task.completed == completed)
+                    and normalize_title(task.title).startswith(key)
+                ):
+                    matches.append(task_id)
+        return sorted(matches) if wanted is None else nsmallest(wanted, matches)
+
+    def _prefix_scan(self, key, after, completed, wanted) -> List[int]:
+        """Ids com o prefixo, lidos em ordem de id a partir do cursor até `wanted`"""
+        def ids_after(shard: _Shard) -> Iterator[int]:
+            # fatias curtas do índice, retomadas pelo último id lido: cada uma é
+            # uma cópia atômica, como nas outras leituras sem lock
+            base = self._id_base(shard, completed)
+            last = after
+            while True:
+                start = bisect_right(base, last)
+                block = base[start:start + wanted]
+                if not block:
+                    return
+                yield from block
+                last = block[-1]
+
+        page_ids = []
+        for task_id in merge(*(ids_after(shard) for shard in self._shards)):
+            task = self._shard(task_id).db.get(task_id)
+            if task is not None and normalize_title(task.title).startswith(key):
+                page_ids.append(task_id)
+                if len(page_ids) == wanted:
+                    break
+        return page_ids
+
+    @write_operation
+    def clear(self) -> None:
+        self._check_writable()
+        with self._all_locks():
+            for shard in self._shards:
+                shard.clear()
+            self.next_task_id = 1
+            ticket = self._applied("clear")
+        self._commit(ticket)
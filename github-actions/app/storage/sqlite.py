@@ -0,0 +1,318 @@
+import asyncio
+import os
+import queue
+import re
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+from typing import Callable, Iterator, List, Optional, TypeVar
+from ..models import Task
+from .base import PREFIX_END, Page, Patch, TaskData, TaskStorage, normalize_title
+
+T = TypeVar("T")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT NOT NULL,
+    title_key TEXT NOT NULL,
+    description TEXT,
+    completed INTEGER NOT NULL DEFAULT 0,
+    version INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS tasks_completed_id ON tasks (completed, id);
+CREATE INDEX IF NOT EXISTS tasks_title_key ON tasks (title_key, id);
+
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value) WITHOUT ROWID;
+INSERT OR IGNORE INTO meta (key, value) VALUES ('changes', 0);
+
+-- Os gatilhos mantêm o contador global e a versão de cada tarefa dentro da
+-- própria transação de escrita, valendo para todos os workers que usam o arquivo.
+CREATE TRIGGER IF NOT EXISTS tasks_version_insert AFTER INSERT ON tasks BEGIN
+    UPDATE meta SET value = value + 1 WHERE key = 'changes';
+    UPDATE tasks SET version = (SELECT value FROM meta WHERE key = 'changes') WHERE id = NEW.id;
+END;
+CREATE TRIGGER IF NOT EXISTS tasks_version_update
+AFTER UPDATE OF title, description, completed ON tasks BEGIN
+    UPDATE meta SET value = value + 1 WHERE key = 'changes';
+    UPDATE tasks SET version = (SELECT value FROM meta WHERE key = 'changes') WHERE id = NEW.id;
+END;
+CREATE TRIGGER IF NOT EXISTS tasks_version_delete AFTER DELETE ON tasks BEGIN
+    UPDATE meta SET value = value + 1 WHERE key = 'changes';
+END;
+"""
+
+# Busca textual (FTS5) sobre o título e a descrição. A tabela usa a própria
+# `tasks` como conteúdo e é mantida por gatilhos na mesma transação de cada
+# escrita, então todos os workers que usam o arquivo veem o mesmo índice. O
+# tokenizador ignora maiúsculas e acentos, como `app.search.tokenize`.
+SEARCH_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+    title, description, content='tasks', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN
+    INSERT INTO tasks_fts (rowid, title, description) VALUES (NEW.id, NEW.title, NEW.description);
+END;
+CREATE TRIGGER IF NOT EXISTS tasks_fts_update AFTER UPDATE OF title, description ON tasks BEGIN
+    INSERT INTO tasks_fts (tasks_fts, rowid, title, description)
+    VALUES ('delete', OLD.id, OLD.title, OLD.description);
+    INSERT INTO tasks_fts (rowid, title, description) VALUES (NEW.id, NEW.title, NEW.description);
+END;
+CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN
+    INSERT INTO tasks_fts (tasks_fts, rowid, title, description)
+    VALUES ('delete', OLD.id, OLD.title, OLD.description);
+END;
+"""
+
+# As consultas são textos constantes com parâmetros: o sqlite3 guarda o
+# statement compilado no cache de cada conexão e só o reexecuta.
+INSERT_SQL = "INSERT INTO tasks (title, title_key, description, completed) VALUES (?, ?, ?, ?)"
+SELECT_SQL = "SELECT id, title, description, completed FROM tasks WHERE id = ?"
+UPDATE_SQL = "UPDATE tasks SET title = ?, title_key = ?, description = ?, completed = ? WHERE id = ?"
+DELETE_SQL = "DELETE FROM tasks WHERE id = ?"
+SELECT_ALL_SQL = "SELECT id, title, description, completed FROM tasks ORDER BY id"
+VERSION_SQL = "SELECT version FROM tasks WHERE id = ?"
+CHANGES_SQL = "SELECT value FROM meta WHERE key = 'changes'"
+# bm25 com o título pesando 3 vezes a descrição (como `app.search.TITLE_WEIGHT`);
+# no empate, o menor id
+SEARCH_SQL = """
+SELECT tasks.id, tasks.title, tasks.description, tasks.completed
+FROM tasks_fts JOIN tasks ON tasks.id = tasks_fts.rowid
+WHERE tasks_fts MATCH ?
+ORDER BY bm25(tasks_fts, 3.0, 1.0), tasks.id
+LIMIT ?
+"""
+
+_WORD = re.compile(r"\w+")
+
+# Campos que uma alteração parcial pode mudar (os nomes entram no SQL)
+PATCH_FIELDS = ("title", "description", "completed")
+
+
+def _task_params(task_data: TaskData) -> tuple:
+    return (
+        task_data.title,
+        normalize_title(task_data.title),
+        task_data.description,
+        task_data.completed,
+    )
+
+
+def _patch_columns(fields: dict) -> dict:
+    """Converte os campos de uma alteração parcial nas colunas da tabela"""
+    columns = {name: fields[name] for name in PATCH_FIELDS if name in fields}
+    if "title" in columns:
+        columns["title_key"] = normalize_title(columns["title"])
+    return columns
+
+
+def _to_task(task_id: int, task_data: TaskData) -> Task:
+    return Task.model_construct(
+        id=task_id,
+        title=task_data.title,
+        description=task_data.description,
+        completed=task_data.completed,
+    )
+
+
+def _match_query(query: str) -> str:
+    """Busca FTS5 em que cada palavra casa com os termos que começam com ela"""
+    #entre aspas, nenhuma palavra é lida como operador (AND, NEAR, ...)
+    return " ".join(f'"{word}"*' for word in _WORD.findall(query))
+
+
+def _row_to_task(row) -> Task:
+    # os dados foram validados na gravação; model_construct só monta o objeto
+    return Task.model_construct(id=row[0], title=row[1], description=row[2], completed=bool(row[3]))
+
+
+class SQLiteStorage(TaskStorage):
+    """
+    Armazenamento em um arquivo SQLite, compartilhável entre workers.
+
+    O banco usa o modo WAL, em que leitores não bloqueiam o escritor, e as
+    conexões ficam em um pool reaproveitado pelas threads do servidor.
+
+    Chamadas assíncronas (`call`) rodam em um executor próprio com uma thread
+    por conexão do pool, então nunca esperam por conexão nem ocupam o
+    threadpool do servidor.
+
+    A busca (`search`) usa o FTS5 do próprio arquivo, então reflete as
+    escritas de todos os workers.
+    """
+
+    def __init__(self, path: str, pool_size: int = 5, timeout: float = 30.0):
+        self.path = path
+        self.timeout = timeout
+        self._pool: queue.LifoQueue = queue.LifoQueue(maxsize=pool_size)
+        for _ in range(pool_size):
+            self._pool.put(self._connect())
+        self._executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="sqlite")
+        with self._connection() as conn:
+            try:
+                #arquivos criados antes da coluna de versão
+                conn.execute("ALTER TABLE tasks ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+            except sqlite3.OperationalError:
+                pass #a tabela ainda não existe ou já tem a coluna
+            conn.executescript(SCHEMA)
+            self.has_search = self._create_search_index(conn)
+            # identifica o arquivo: se ele for recriado, as versões recomeçam
+            conn.execute(
+                "INSERT OR IGNORE INTO meta (key, value) VALUES ('epoch', ?)",
+                (os.urandom(4).hex(),),
+            )
+            conn.commit()
+            self.epoch = conn.execute("SELECT value FROM meta WHERE key = 'epoch'").fetchone()[0]
+
+    @staticmethod
+    def _create_search_index(conn: sqlite3.Connection) -> bool:
+        """Cria a busca textual; retorna False se o SQLite não tiver FTS5"""
+        existed = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'tasks_fts'"
+        ).fetchone() is not None
+        try:
+            conn.executescript(SEARCH_SCHEMA)
+        except sqlite3.OperationalError:
+            return False #sem FTS5 a busca usa o índice em memória
+        if not existed:
+            #arquivos criados antes da busca: indexa as tarefas que já existem
+            conn.execute("INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild')")
+        return True
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.path,
+            timeout=self.timeout,
+            check_same_thread=False, #cada conexão é usada por uma thread por vez
+            cached_statements=128,
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """Empresta uma conexão do pool e a devolve ao final"""
+        conn = self._pool.get(timeout=self.timeout)
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    async def call(self, method: Callable[..., T], *args) -> T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(method, *args))
+
+    def create(self, task_data: TaskData) -> Task:
+        with self._connection() as conn, conn:
+            cur = conn.execute(INSERT_SQL, _task_params(task_data))
+        return _to_task(cur.lastrowid, task_data)
+
+    def get(self, task_id: int) -> Task | None:
+        with self._connection() as conn:
+            row = conn.execute(SELECT_SQL, (task_id,)).fetchone()
+        return None if row is None else _row_to_task(row)
+
+    def update(self, task_id: int, task_data: TaskData) -> Task | None:
+        with self._connection() as conn, conn:
+            cur = conn.execute(UPDATE_SQL, (*_task_params(task_data), task_id))
+        return _to_task(task_id, task_data) if cur.rowcount else None
+
+    def delete(self, task_id: int) -> bool:
+        with self._connection() as conn, conn:
+            cur = conn.execute(DELETE_SQL, (task_id,))
+        return cur.rowcount > 0
+
+    # As operações em lote usam uma única conexão e uma única transação, então
+    # o custo de commit é pago uma vez por lote e não uma vez por tarefa.
+
+    def create_many(self, tasks: List[TaskData]) -> List[Task]:
+        with self._connection() as conn, conn:
+            return [
+                _to_task(conn.execute(INSERT_SQL, _task_params(task_data)).lastrowid, task_data)
+                for task_data in tasks
+            ]
+
+    def patch_many(self, patches: List[Patch]) -> List[Task | None]:
+        results = []
+        with self._connection() as conn, conn:
+            for task_id, fields in patches:
+                columns = _patch_columns(fields)
+                if columns:
+                    assignments = ", ".join(f"{name} = ?" for name in columns)
+                    conn.execute(
+                        f"UPDATE tasks SET {assignments} WHERE id = ?",
+                        (*columns.values(), task_id),
+                    )
+                row = conn.execute(SELECT_SQL, (task_id,)).fetchone()
+                results.append(None if row is None else _row_to_task(row))
+        return results
+
+    def delete_many(self, task_ids: List[int]) -> List[bool]:
+        with self._connection() as conn, conn:
+            return [conn.execute(DELETE_SQL, (task_id,)).rowcount > 0 for task_id in task_ids]
+
+    def version(self, task_id: int) -> int | None:
+        with self._connection() as conn:
+            row = conn.execute(VERSION_SQL, (task_id,)).fetchone()
+        return None if row is None else row[0]
+
+    def change_count(self) -> int:
+        with self._connection() as conn:
+            return conn.execute(CHANGES_SQL).fetchone()[0]
+
+    def all(self) -> List[Task]:
+        with self._connection() as conn:
+            rows = conn.execute(SELECT_ALL_SQL).fetchall()
+        return [_row_to_task(row) for row in rows]
+
+    def search(self, query: str, limit: int = 20) -> List[Task]:
+        match = _match_query(query)
+        if not match:
+            return []
+        with self._connection() as conn:
+            rows = conn.execute(SEARCH_SQL, (match, limit)).fetchall()
+        return [_row_to_task(row) for row in rows]
+
+    def page(
+        self,
+        limit: Optional[int] = None,
+        cursor: Optional[int] = None,
+        completed: Optional[bool] = None,
+        title_prefix: Optional[str] = None,
+    ) -> Page:
+        sql = "SELECT id, title, description, completed FROM tasks WHERE id > ?"
+        params: list = [cursor or 0]
+        if completed is not None:
+            sql += " AND completed = ?"
+            params.append(completed)
+        if title_prefix is not None:
+            key = normalize_title(title_prefix)
+            sql += " AND title_key >= ? AND title_key < ?"
+            params += [key, key + PREFIX_END]
+        sql += " ORDER BY id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit + 1)
+
+        with self._connection() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        tasks = [_row_to_task(row) for row in rows]
+
+        next_cursor = None
+        if limit is not None and len(tasks) > limit:
+            tasks = tasks[:limit]
+            next_cursor = tasks[-1].id
+        return tasks, next_cursor
+
+    def clear(self) -> None:
+        with self._connection() as conn, conn:
+            conn.execute("DELETE FROM tasks")
+            conn.execute("DELETE FROM sqlite_sequence WHERE name = 'tasks'")
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        while not self._pool.empty():
+            self._pool.get_nowait().close()
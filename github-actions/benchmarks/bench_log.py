@@ -0,0 +1,56 @@
+"""
+Mede o `LogStorage`: vazão de escrita com group commit e tempo de recuperação.
+
+Execução (na pasta github-actions):
+`uv run python -m benchmarks.bench_log [tarefas] [threads]`
+"""
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from app.models import TaskCreate
+from app.storage import LogStorage
+
+
+def write_throughput(directory: str, n: int, threads: int) -> float:
+    """Escritas por segundo com `threads` clientes, cada escrita esperando o fsync"""
+    engine = LogStorage(directory, snapshot_every=10 * n)
+    task = TaskCreate(title="Tarefa de benchmark")
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(lambda _: engine.create(task), range(n)))
+    elapsed = time.perf_counter() - start
+    engine.close()
+    return n / elapsed
+
+
+def recovery_time(directory: str, n: int) -> tuple:
+    """Segundos para reabrir `n` tarefas do snapshot e do log"""
+    engine = LogStorage(directory, snapshot_every=10 * n)
+    engine.create_many([TaskCreate(title=f"Tarefa {i}", description="x" * 20) for i in range(n)])
+    engine.compact()
+    engine.create_many([TaskCreate(title=f"Depois {i}") for i in range(n // 10)])
+    engine.close()
+
+    start = time.perf_counter()
+    engine = LogStorage(directory)
+    elapsed = time.perf_counter() - start
+    count = len(engine.all())
+    engine.close()
+    return elapsed, count
+
+
+def main(n: int = 1_000_000, threads: int = 32) -> None:
+    writes = min(n, 20_000)
+    with tempfile.TemporaryDirectory() as directory:
+        single = write_throughput(directory + "/single", writes, 1)
+        grouped = write_throughput(directory + "/grouped", writes, threads)
+        elapsed, count = recovery_time(directory + "/recovery", n)
+    print(f"escritas com fsync, 1 thread:        {single:10.0f} /s")
+    print(f"escritas com fsync, {threads} threads:      {grouped:10.0f} /s (group commit)")
+    print(f"recuperação de {count} tarefas: {elapsed:.2f} s")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    main(*args)
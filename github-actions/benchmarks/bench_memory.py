@@ -0,0 +1,67 @@
+"""
+Compara a memória ocupada por tarefa em cada forma de armazenamento.
+
+- antes: dicionário de modelos Pydantic `Task` (como o banco guardava antes).
+- registros: dicionário de `TaskRecord`, a representação compacta sozinha.
+- depois: `MemoryStorage`, com registros compactos e índices secundários.
+
+Execução (na pasta github-actions):
+`uv run python -m benchmarks.bench_memory [quantidade]`
+"""
+import gc
+import sys
+import tracemalloc
+from app.models import Task, TaskCreate
+from app.storage import MemoryStorage
+from app.storage.memory import TaskRecord
+
+
+def measure(build) -> int:
+    """Bytes alocados (e mantidos) pela estrutura montada por `build`"""
+    gc.collect()
+    tracemalloc.start()
+    structure = build()
+    gc.collect()
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del structure
+    return allocated
+
+
+def sample(n: int) -> list:
+    # Textos variados como em uso real (strings iguais seriam compartilhadas)
+    return [
+        TaskCreate(title=f"Tarefa número {i}", description=f"Descrição da tarefa {i}", completed=i % 2 == 0)
+        for i in range(n)
+    ]
+
+
+def pydantic_dict(tasks: list) -> dict:
+    return {i: Task(id=i, **task.model_dump()) for i, task in enumerate(tasks, start=1)}
+
+
+def record_dict(tasks: list) -> dict:
+    return {i: TaskRecord.from_data(task) for i, task in enumerate(tasks, start=1)}
+
+
+def memory_storage(tasks: list) -> MemoryStorage:
+    storage = MemoryStorage()
+    storage.create_many(tasks)
+    return storage
+
+
+def main(n: int = 100_000) -> None:
+    tasks = sample(n)
+    # as strings de entrada já existem nos dois casos; medimos só a estrutura
+    before = measure(lambda: pydantic_dict(tasks))
+    records = measure(lambda: record_dict(tasks))
+    after = measure(lambda: memory_storage(tasks))
+    print(f"{n} tarefas")
+    print(f"antes     (dict de Task):             {before / n:8.1f} bytes/tarefa")
+    print(f"registros (dict de TaskRecord):       {records / n:8.1f} bytes/tarefa")
+    print(f"depois    (MemoryStorage + índices):  {after / n:8.1f} bytes/tarefa")
+    print(f"redução: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,87 @@
+"""
+Mede a busca de tarefas: índice invertido contra a varredura de todas as
+tarefas (o que o cliente fazia depois de `GET /tasks/`).
+
+Execução (na pasta github-actions):
+`uv run python -m benchmarks.bench_search [tarefas]`
+"""
+import random
+import sys
+import time
+from app import database
+from app.models import TaskCreate
+from app.search import tokenize
+from app.storage import MemoryStorage
+
+WORDS = (
+    "revisar relatório mensal enviar proposta cliente corrigir erro login atualizar "
+    "documentação reunião equipe planejar sprint testar integração pagamento deploy "
+    "servidor banco dados migrar backup configurar alerta monitorar desempenho api "
+    "contrato fornecedor orçamento marketing campanha pesquisa usuário entrevista"
+).split()
+SYLLABLES = "ba ca da fe go la ma ne pi ro sa te vi zu lo mi".split()
+QUERIES = ["relatorio", "deploy servidor", "integ", "cliente proposta", "backup banco", "campanha market"]
+
+
+def scan(tasks, query):
+    """Varredura: todas as palavras da busca como início de alguma palavra da tarefa"""
+    words = tokenize(query)
+    found = []
+    for task in tasks:
+        terms = tokenize(task.title) + tokenize(task.description)
+        if all(any(term.startswith(word) for term in terms) for word in words):
+            found.append(task)
+    return found
+
+
+def vocabulary(size: int = 5000) -> tuple:
+    """Palavras comuns e nomes inventados, com frequência de Zipf (a k-ésima aparece ~1/k vezes)"""
+    words = list(WORDS)
+    while len(words) < size:
+        words.append("".join(random.choices(SYLLABLES, k=random.randint(2, 4))))
+    weights = [1 / rank for rank in range(1, len(words) + 1)]
+    return words, weights
+
+
+def main(n: int = 100_000) -> None:
+    random.seed(0)
+    words, weights = vocabulary()
+    engine = MemoryStorage()
+    engine.create_many([
+        TaskCreate(
+            title=" ".join(random.choices(words, weights, k=3)).capitalize(),
+            description=" ".join(random.choices(words, weights, k=12)),
+        )
+        for _ in range(n)
+    ])
+    database.set_storage(engine)
+
+    start = time.perf_counter()
+    database.search_index.build(engine.iter_batches)
+    print(f"montagem do índice com {n} tarefas: {time.perf_counter() - start:.2f} s")
+
+    tasks = engine.all()
+    for query in QUERIES:
+        start = time.perf_counter()
+        scanned = scan(tasks, query)
+        scan_time = time.perf_counter() - start
+        rounds = 20
+        start = time.perf_counter()
+        for _ in range(rounds):
+            results = database.search_tasks_db(query)
+        index_time = (time.perf_counter() - start) / rounds
+        print(
+            f"{query!r:22} {len(scanned):6} resultados  varredura {scan_time * 1e3:8.1f} ms"
+            f"  índice (top {len(results)}) {index_time * 1e3:7.2f} ms"
+        )
+
+    writes = 1000
+    start = time.perf_counter()
+    for i in range(1, writes + 1):
+        database.update_task_db(i, TaskCreate(title="Tarefa alterada", description="nova descrição"))
+    print(f"escrita com atualização do índice: {(time.perf_counter() - start) / writes * 1e3:.3f} ms por tarefa")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    main(*args)
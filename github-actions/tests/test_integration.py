@@ -1,3 +1,4 @@
+import json
 import pytest
 from app.models import Task, TaskCreate
 from app.database import clear_db
@@ -107,4 +108,124 @@ def test_read_all_tasks_empty():
     """GET /tasks/ deve retornar lista vazia se não houver nada."""
     r = client.get("/tasks/")
     assert r.status_code == 200
-    assert r.json() == []
\ No newline at end of file
+    assert r.json() == []
+
+def test_read_all_tasks_paginated():
+    """GET /tasks/?limit= deve paginar e informar o próximo cursor no header."""
+    for i in range(3):
+        client.post("/tasks/", json={"title": f"Task {i}"})
+    r = client.get("/tasks/", params={"limit": 2})
+    assert r.status_code == 200
+    assert [t["title"] for t in r.json()] == ["Task 0", "Task 1"]
+    cursor = r.headers["X-Next-Cursor"]
+    r = client.get("/tasks/", params={"limit": 2, "cursor": cursor})
+    assert [t["title"] for t in r.json()] == ["Task 2"]
+    assert "X-Next-Cursor" not in r.headers
+
+def test_read_all_tasks_filtered():
+    """GET /tasks/ deve aceitar filtros por status e prefixo do título."""
+    client.post("/tasks/", json={"title": "Estudar FastAPI", "completed": True})
+    client.post("/tasks/", json={"title": "Estudar pytest"})
+    client.post("/tasks/", json={"title": "Correr"})
+    r = client.get("/tasks/", params={"completed": "false", "title_prefix": "estudar"})
+    assert [t["title"] for t in r.json()] == ["Estudar pytest"]
+
+def test_read_all_tasks_invalid_limit():
+    """limit fora do intervalo permitido deve retornar 422."""
+    assert client.get("/tasks/", params={"limit": 0}).status_code == 422
+
+def test_bulk_create_tasks_api():
+    """POST /tasks/bulk deve criar todas as tarefas e retornar o resultado de cada uma."""
+    payload = [{"title": f"Lote {i}"} for i in range(3)]
+    r = client.post("/tasks/bulk", json=payload)
+    assert r.status_code == 201
+    data = r.json()
+    assert [item["status"] for item in data] == [201, 201, 201]
+    assert [item["task"]["title"] for item in data] == ["Lote 0", "Lote 1", "Lote 2"]
+    assert len(client.get("/tasks/").json()) == 3
+
+def test_bulk_create_tasks_invalid_item_rejects_batch():
+    """Um item inválido deve barrar o lote inteiro com 422, sem gravar nada."""
+    r = client.post("/tasks/bulk", json=[{"title": "Válida"}, {"title": "ab"}])
+    assert r.status_code == 422
+    assert client.get("/tasks/").json() == []
+
+def test_bulk_create_tasks_empty_list():
+    """Um lote vazio deve retornar 422."""
+    assert client.post("/tasks/bulk", json=[]).status_code == 422
+
+def test_bulk_patch_tasks_api(sample_task_in_db: Task):
+    """PATCH /tasks/bulk altera só os campos enviados e reporta IDs inexistentes."""
+    payload = [{"id": sample_task_in_db.id, "completed": True}, {"id": 999, "title": "Nada"}]
+    r = client.patch("/tasks/bulk", json=payload)
+    assert r.status_code == 200
+    updated, missing = r.json()
+    assert updated["status"] == 200
+    assert updated["task"]["completed"] is True
+    assert updated["task"]["title"] == sample_task_in_db.title
+    assert updated["task"]["description"] == sample_task_in_db.description
+    assert missing == {"id": 999, "status": 404, "task": None, "detail": "Tarefa não encontrada"}
+
+def test_bulk_patch_rejects_null_title(sample_task_in_db: Task):
+    """title nulo em uma alteração parcial deve retornar 422."""
+    r = client.patch("/tasks/bulk", json=[{"id": sample_task_in_db.id, "title": None}])
+    assert r.status_code == 422
+
+def test_bulk_delete_tasks_api(sample_task_in_db: Task):
+    """DELETE /tasks/bulk remove os IDs existentes e reporta os inexistentes."""
+    r = client.request("DELETE", "/tasks/bulk", json=[sample_task_in_db.id, 999])
+    assert r.status_code == 200
+    assert [item["status"] for item in r.json()] == [204, 404]
+    assert client.get(f"/tasks/{sample_task_in_db.id}").status_code == 404
+
+def test_read_all_tasks_etag(sample_task_in_db: Task):
+    """GET /tasks/ responde 304 ao ETag atual e muda o ETag após uma escrita."""
+    r = client.get("/tasks/")
+    etag = r.headers["etag"]
+    assert etag.startswith('W/"')
+    r = client.get("/tasks/", headers={"If-None-Match": etag})
+    assert r.status_code == 304
+    assert r.content == b""
+    assert r.headers["etag"] == etag
+    assert client.get("/tasks/", headers={"If-None-Match": f'"outro", {etag}'}).status_code == 304
+    client.post("/tasks/", json={"title": "Nova tarefa"})
+    r = client.get("/tasks/", headers={"If-None-Match": etag})
+    assert r.status_code == 200
+    assert len(r.json()) == 2
+    assert r.headers["etag"] != etag
+
+def test_read_task_etag(sample_task_in_db: Task):
+    """GET /tasks/{id} responde 304 até a tarefa ser alterada."""
+    url = f"/tasks/{sample_task_in_db.id}"
+    etag = client.get(url).headers["etag"]
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+    assert client.get(url, headers={"If-None-Match": "*"}).status_code == 304
+    client.post("/tasks/", json={"title": "Outra tarefa"}) #não altera esta tarefa
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+    client.put(url, json={"title": "Título alterado"})
+    r = client.get(url, headers={"If-None-Match": etag})
+    assert r.status_code == 200
+    assert r.json()["title"] == "Título alterado"
+    assert r.headers["etag"] != etag
+    assert client.get("/tasks/999", headers={"If-None-Match": "*"}).status_code == 404
+
+def test_export_tasks_ndjson():
+    """GET /tasks/export deve retornar uma tarefa JSON por linha, em ordem de ID."""
+    client.post("/tasks/bulk", json=[{"title": f"Exportar {i}"} for i in range(1203)])
+    r = client.get("/tasks/export", params={"format": "ndjson"})
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    lines = r.text.splitlines()
+    assert len(lines) == 1203
+    assert json.loads(lines[0]) == {"id": 1, "title": "Exportar 0", "description": None, "completed": False}
+    assert json.loads(lines[-1])["id"] == 1203
+
+def test_export_tasks_empty():
+    """Exportar sem tarefas deve retornar um corpo vazio."""
+    r = client.get("/tasks/export")
+    assert r.status_code == 200
+    assert r.text == ""
+
+def test_export_tasks_unknown_format():
+    """Formatos não suportados devem retornar 422."""
+    assert client.get("/tasks/export", params={"format": "csv"}).status_code == 422
@@ -0,0 +1,118 @@
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from app.models import Task
+from app.storage import LogStorage
+from app.storage.log import SNAPSHOT_FILE
+
+@pytest.fixture
+def log_dir(tmp_path):
+    return str(tmp_path / "tasks")
+
+def reopen(engine: LogStorage, **kwargs) -> LogStorage:
+    """Fecha o mecanismo e abre outro na mesma pasta, como em um reinício."""
+    engine.close()
+    return LogStorage(str(engine.directory), **kwargs)
+
+def test_data_survives_restart(log_dir):
+    engine = LogStorage(log_dir)
+    a = engine.create(Task(id=0, title="Sobrevive"))
+    b = engine.create(Task(id=0, title="Removida"))
+    engine.update(a.id, Task(id=a.id, title="Sobrevive", completed=True))
+    engine.patch_many([(a.id, {"description": "alterada"})])
+    engine.delete(b.id)
+
+    engine = reopen(engine)
+    assert [(t.id, t.title, t.description, t.completed) for t in engine.all()] == [
+        (a.id, "Sobrevive", "alterada", True)
+    ]
+    page, _ = engine.page(completed=True, title_prefix="sobre")
+    assert [t.id for t in page] == [a.id]
+    assert engine.create(Task(id=0, title="Nova")).id == 3
+    engine.close()
+
+def test_clear_survives_restart(log_dir):
+    engine = LogStorage(log_dir)
+    engine.create(Task(id=0, title="Antes"))
+    engine.clear()
+    engine.create(Task(id=0, title="Depois"))
+    engine = reopen(engine)
+    assert [(t.id, t.title) for t in engine.all()] == [(1, "Depois")]
+    engine.close()
+
+def test_compaction_writes_snapshot_and_drops_old_logs(log_dir):
+    engine = LogStorage(log_dir)
+    for i in range(10):
+        engine.create(Task(id=0, title=f"Tarefa {i}"))
+    engine.delete(5)
+    engine.compact()
+    engine.create(Task(id=0, title="Depois do snapshot"))
+    engine.delete(1)
+
+    logs = sorted(p.name for p in engine.directory.glob("tasks-*.log"))
+    assert logs == ["tasks-1.log"]
+    assert (engine.directory / SNAPSHOT_FILE).exists()
+
+    engine = reopen(engine)
+    assert [t.id for t in engine.all()] == [2, 3, 4, 6, 7, 8, 9, 10, 11]
+    assert engine.get(11).title == "Depois do snapshot"
+    assert engine.create(Task(id=0, title="Seguinte")).id == 12
+    engine.close()
+
+def test_automatic_compaction(log_dir):
+    engine = LogStorage(log_dir, snapshot_every=50)
+    engine.create_many([Task(id=0, title=f"Tarefa {i}") for i in range(120)])
+    engine = reopen(engine)
+    assert len(engine.all()) == 120
+    assert (engine.directory / SNAPSHOT_FILE).exists()
+    engine.close()
+
+def test_recovery_ignores_torn_last_line(log_dir):
+    engine = LogStorage(log_dir)
+    engine.create(Task(id=0, title="Completa"))
+    engine.close()
+    log_file = next(engine.directory.glob("tasks-*.log"))
+    with open(log_file, "a", encoding="utf-8") as file:
+        file.write('["put", 2, "Incomp')  #gravação interrompida no meio
+
+    engine = LogStorage(log_dir)
+    assert [t.title for t in engine.all()] == ["Completa"]
+    engine.create(Task(id=0, title="Depois"))
+    engine = reopen(engine)
+    assert [t.title for t in engine.all()] == ["Completa", "Depois"]
+    engine.close()
+
+def test_group_commit_from_many_threads(log_dir):
+    """Escritas simultâneas são todas gravadas, e cada uma só retorna depois disso."""
+    engine = LogStorage(log_dir)
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        created = list(pool.map(lambda i: engine.create(Task(id=0, title=f"Tarefa {i}")), range(400)))
+    assert len({t.id for t in created}) == 400
+    engine = reopen(engine)
+    assert len(engine.all()) == 400
+    engine.close()
+
+def test_write_error_is_raised(log_dir):
+    engine = LogStorage(log_dir)
+    engine._file.close()  #simula um disco que deixou de aceitar gravações
+    with pytest.raises(RuntimeError):
+        engine.create(Task(id=0, title="Falha"))
+
+def test_writes_are_refused_after_write_error(log_dir):
+    """Depois da falha, novas escritas não chegam à memória, que continua igual ao disco."""
+    engine = LogStorage(log_dir)
+    kept = engine.create(Task(id=0, title="Gravada"))
+    engine._file.close()
+    with pytest.raises(RuntimeError):
+        engine.create(Task(id=0, title="Falha"))
+    before = [(t.id, t.title, t.completed) for t in engine.all()]
+    with pytest.raises(RuntimeError):
+        engine.create(Task(id=0, title="Recusada"))
+    with pytest.raises(RuntimeError):
+        engine.update(kept.id, Task(id=kept.id, title="Recusada", completed=True))
+    with pytest.raises(RuntimeError):
+        engine.patch_many([(kept.id, {"completed": True})])
+    with pytest.raises(RuntimeError):
+        engine.delete(kept.id)
+    with pytest.raises(RuntimeError):
+        engine.clear()
+    assert [(t.id, t.title, t.completed) for t in engine.all()] == before
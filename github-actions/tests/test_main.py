@@ -145,6 +145,15 @@ def test_create_task_api_invalid_payload():
     response = client.post("/tasks/", json=payload)
     assert response.status_code == 422 # Unprocessable Entity
 
+def test_description_too_long_is_rejected():
+    """Descrições com mais de 300 caracteres devem dar 422 em todas as rotas de escrita."""
+    long_description = "x" * 301
+    assert client.post("/tasks/", json={"title": "Titulo", "description": long_description}).status_code == 422
+    assert client.put("/tasks/1", json={"title": "Titulo", "description": long_description}).status_code == 422
+    assert client.post("/tasks/bulk", json=[{"title": "Titulo", "description": long_description}]).status_code == 422
+    assert client.patch("/tasks/bulk", json=[{"id": 1, "description": long_description}]).status_code == 422
+    assert client.get("/tasks/").json() == []  # nada foi gravado
+
 def test_get_all_tasks_db_empty():
     """Deve retornar lista vazia se não houver tarefas."""
     assert get_all_tasks_db() == []
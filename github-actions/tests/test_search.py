@@ -0,0 +1,196 @@
+import asyncio
+import sqlite3
+import threading
+import pytest
+from app import database
+from app.database import (
+    asearch_tasks_db,
+    clear_db,
+    create_task_db,
+    create_tasks_db,
+    delete_task_db,
+    delete_tasks_db,
+    patch_tasks_db,
+    search_tasks_db,
+    update_task_db,
+)
+from app.main import app
+from app.models import Task, TaskCreate
+from app.search import SearchIndex, tokenize
+from app.storage import MemoryStorage, SQLiteStorage
+from fastapi.testclient import TestClient
+
+client = TestClient(app)
+
+@pytest.fixture(autouse=True)
+def db_cleanup():
+    """
+    Fixture para limpar o banco de dados (e o índice de busca) antes e depois de cada teste.
+    """
+    clear_db()
+    yield
+    clear_db()
+
+def titles(tasks):
+    return [task.title for task in tasks]
+
+def test_tokenize_ignores_case_and_accents():
+    assert tokenize("Relatório FINAL, versão 2") == ["relatorio", "final", "versao", "2"]
+    assert tokenize(None) == []
+
+def test_index_ranks_title_above_description():
+    index = SearchIndex()
+    index.build(lambda: [[
+        Task(id=1, title="Revisar código", description="relatório anexo"),
+        Task(id=2, title="Relatório mensal", description=None),
+    ]])
+    assert [task_id for task_id, _ in index.search("relatorio")] == [2, 1]
+
+def test_index_prefers_exact_over_prefix_match():
+    index = SearchIndex()
+    index.build(lambda: [[Task(id=1, title="Testes da API"), Task(id=2, title="Teste manual")]])
+    assert [task_id for task_id, _ in index.search("teste")] == [2, 1]
+
+def test_index_ignores_writes_before_build():
+    index = SearchIndex()
+    index.add(Task(id=1, title="Antes"))
+    assert index.search("antes") == []
+    index.build(lambda: [[Task(id=1, title="Antes")]])
+    assert index.search("antes") == [(1, pytest.approx(3 * 0.6931, rel=1e-3))]
+
+def test_index_build_does_not_block_writes():
+    index = SearchIndex()
+
+    def batches():
+        yield [Task(id=1, title="Primeira"), Task(id=2, title="Segunda")]
+        #escritas no meio da montagem não esperam por ela e não se perdem
+        index.add(Task(id=2, title="Segunda revisada"))
+        index.remove(1)
+        index.add(Task(id=3, title="Terceira"))
+        yield [Task(id=3, title="Terceira")]
+    index.build(batches)
+    assert index.ready
+    assert index.search("primeira") == []
+    assert [task_id for task_id, _ in index.search("revisada")] == [2]
+    assert [task_id for task_id, _ in index.search("terceira")] == [3]
+
+def test_index_cleared_during_build_discards_it():
+    index = SearchIndex()
+
+    def batches():
+        yield [Task(id=1, title="Antiga")]
+        index.clear(ready=False)
+    index.build(batches)
+    assert not index.ready
+    assert index.search("antiga") == []
+
+def test_async_search_builds_index_off_the_event_loop():
+    engine = MemoryStorage()
+    engine.create(TaskCreate(title="Tarefa antiga"))
+    threads = []
+    iter_batches = engine.iter_batches
+
+    def recording_batches(*args):
+        threads.append(threading.current_thread())
+        return iter_batches(*args)
+    engine.iter_batches = recording_batches
+    previous = database.set_storage(engine)
+    try:
+        assert titles(asyncio.run(asearch_tasks_db("antiga"))) == ["Tarefa antiga"]
+        assert threads and threads[0] is not threading.current_thread()
+    finally:
+        database.set_storage(previous)
+
+def test_engines_without_native_search_return_nothing():
+    engine = MemoryStorage()
+    engine.create(TaskCreate(title="Tarefa"))
+    assert not engine.has_search
+    assert engine.search("tarefa") == []
+
+def test_sqlite_search_is_shared_between_workers(tmp_path):
+    path = str(tmp_path / "tasks.db")
+    worker_a, worker_b = SQLiteStorage(path, pool_size=1), SQLiteStorage(path, pool_size=1)
+    try:
+        assert worker_a.has_search
+        created = worker_a.create_many([
+            TaskCreate(title="Relatório mensal"),
+            TaskCreate(title="Revisar código", description="relatório anexo"),
+        ])
+        assert titles(worker_b.search("RELATORIO")) == ["Relatório mensal", "Revisar código"]
+        worker_a.update(created[0].id, TaskCreate(title="Planilha"))
+        assert titles(worker_b.search("relat")) == ["Revisar código"]
+        worker_a.delete(created[1].id)
+        assert worker_b.search("relatorio") == []
+        assert worker_b.search('"NEAR AND') == [] #palavras, não sintaxe do FTS5
+        assert worker_b.search("!!!") == []
+    finally:
+        worker_a.close()
+        worker_b.close()
+
+def test_sqlite_search_indexes_file_created_before_it(tmp_path):
+    path = str(tmp_path / "old.db")
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE tasks (id INTEGER PRIMARY KEY AUTOINCREMENT, title TEXT NOT NULL,"
+        " title_key TEXT NOT NULL, description TEXT, completed INTEGER NOT NULL DEFAULT 0)"
+    )
+    conn.execute("INSERT INTO tasks (title, title_key) VALUES ('Tarefa antiga', 'tarefa antiga')")
+    conn.commit()
+    conn.close()
+    engine = SQLiteStorage(path, pool_size=1)
+    try:
+        assert titles(engine.search("antiga")) == ["Tarefa antiga"]
+    finally:
+        engine.close()
+
+def test_search_prefix_and_all_words():
+    create_tasks_db([
+        TaskCreate(title="Comprar pão", description="Na padaria da esquina"),
+        TaskCreate(title="Comprar leite"),
+        TaskCreate(title="Pagar conta de luz"),
+    ])
+    assert titles(search_tasks_db("compr")) == ["Comprar pão", "Comprar leite"]
+    assert titles(search_tasks_db("comprar padaria")) == ["Comprar pão"]
+    assert titles(search_tasks_db("COMPRAR PAO")) == ["Comprar pão"]
+    assert search_tasks_db("comprar luz") == []
+    assert search_tasks_db("!!!") == []
+
+def test_search_follows_updates_and_deletes():
+    first = create_task_db(TaskCreate(title="Estudar Python"))
+    second = create_task_db(TaskCreate(title="Estudar SQL"))
+    update_task_db(first.id, TaskCreate(title="Ler documentação"))
+    assert titles(search_tasks_db("estudar")) == ["Estudar SQL"]
+    assert titles(search_tasks_db("documentacao")) == ["Ler documentação"]
+    patch_tasks_db([(second.id, {"description": "consultas com índices"})])
+    assert titles(search_tasks_db("indices")) == ["Estudar SQL"]
+    delete_task_db(second.id)
+    assert search_tasks_db("estudar") == []
+    delete_tasks_db([first.id, 999])
+    assert search_tasks_db("ler") == []
+
+def test_search_builds_index_from_existing_storage():
+    engine = MemoryStorage()
+    engine.create_many([TaskCreate(title=f"Tarefa {i}") for i in range(1200)])
+    previous = database.set_storage(engine)
+    try:
+        assert not database.search_index.ready
+        assert titles(search_tasks_db("tarefa 1199")) == ["Tarefa 1199"]
+        create_task_db(TaskCreate(title="Tarefa nova"))
+        assert titles(search_tasks_db("nova")) == ["Tarefa nova"]
+    finally:
+        database.set_storage(previous)
+
+def test_search_api():
+    client.post("/tasks/", json={"title": "Deploy da API", "description": "Subir a versão 2"})
+    client.post("/tasks/", json={"title": "Escrever testes", "description": "Cobrir a API"})
+    client.post("/tasks/", json={"title": "Reunião"})
+    response = client.get("/tasks/search", params={"q": "api"})
+    assert response.status_code == 200
+    assert [task["title"] for task in response.json()] == ["Deploy da API", "Escrever testes"]
+    response = client.get("/tasks/search", params={"q": "api", "limit": 1})
+    assert len(response.json()) == 1
+
+def test_search_api_validates_query():
+    assert client.get("/tasks/search").status_code == 422
+    assert client.get("/tasks/search", params={"q": ""}).status_code == 422
+    assert client.get("/tasks/search", params={"q": "x", "limit": 0}).status_code == 422
@@ -0,0 +1,366 @@
+import asyncio
+import sys
+import threading
+import httpx
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from fastapi.testclient import TestClient
+from app import database
+from app.main import app
+from app.models import Task, TaskCreate
+from app.storage import LogStorage, MemoryStorage, SQLiteStorage, create_storage
+
+client = TestClient(app)
+
+@pytest.fixture(params=["memory", "log", "sqlite"])
+def storage(request, tmp_path):
+    """
+    Fixture que entrega cada mecanismo de armazenamento, para que todos os
+    testes deste arquivo rodem contra todos eles.
+    """
+    if request.param == "memory":
+        engine = MemoryStorage()
+    elif request.param == "log":
+        engine = LogStorage(str(tmp_path / "log"))
+    else:
+        engine = SQLiteStorage(str(tmp_path / "tasks.db"), pool_size=4)
+    yield engine
+    engine.close()
+
+@pytest.fixture
+def api_storage(storage):
+    """Fixture que liga a API ao mecanismo em teste durante o teste."""
+    previous = database.set_storage(storage)
+    yield storage
+    database.set_storage(previous)
+
+def test_create_and_get(storage):
+    t = storage.create(Task(id=0, title="Primeira", description="desc"))
+    assert t.id == 1
+    found = storage.get(t.id)
+    assert found.title == "Primeira"
+    assert found.description == "desc"
+    assert found.completed is False
+
+def test_create_accepts_task_create(storage):
+    """Os mecanismos aceitam o modelo de entrada direto, sem montar um Task antes."""
+    t = storage.create(TaskCreate(title="Direta", completed=True))
+    assert isinstance(t, Task)
+    assert (t.id, t.title, t.completed) == (1, "Direta", True)
+    updated = storage.update(t.id, TaskCreate(title="Alterada"))
+    assert (updated.id, updated.title, updated.completed) == (1, "Alterada", False)
+
+def test_returned_tasks_are_detached(storage):
+    """Alterar o objeto retornado não pode mudar o que está armazenado."""
+    t = storage.create(Task(id=0, title="Original"))
+    t.title = "Modificada fora"
+    assert storage.get(t.id).title == "Original"
+
+def test_get_not_found(storage):
+    assert storage.get(999) is None
+
+def test_update(storage):
+    t = storage.create(Task(id=0, title="Antiga"))
+    assert storage.update(t.id, Task(id=t.id, title="Nova", completed=True)) is not None
+    found = storage.get(t.id)
+    assert found.title == "Nova"
+    assert found.completed is True
+    assert storage.update(999, Task(id=999, title="Nada")) is None
+
+def test_delete(storage):
+    t = storage.create(Task(id=0, title="Temp"))
+    assert storage.delete(t.id) is True
+    assert storage.delete(t.id) is False
+    assert storage.get(t.id) is None
+
+def test_ids_are_not_reused_after_delete(storage):
+    storage.create(Task(id=0, title="Title1"))
+    t2 = storage.create(Task(id=0, title="Title2"))
+    storage.delete(t2.id)
+    assert storage.create(Task(id=0, title="Title3")).id == 3
+
+def test_all_and_clear(storage):
+    for i in range(3):
+        storage.create(Task(id=0, title=f"Title{i}"))
+    assert [t.title for t in storage.all()] == ["Title0", "Title1", "Title2"]
+    storage.clear()
+    assert storage.all() == []
+    assert storage.create(Task(id=0, title="Novo")).id == 1
+
+def test_page_filters(storage):
+    storage.create(Task(id=0, title="Comprar pão"))
+    storage.create(Task(id=0, title="comprar leite", completed=True))
+    storage.create(Task(id=0, title="Lavar carro", completed=True))
+    storage.create(Task(id=0, title="Compor música"))
+    page, cursor = storage.page(limit=1, title_prefix="comp")
+    assert [t.id for t in page] == [1]
+    assert cursor == 1
+    page, cursor = storage.page(limit=5, cursor=cursor, title_prefix="comp")
+    assert [t.id for t in page] == [2, 4]
+    assert cursor is None
+    page, _ = storage.page(completed=True)
+    assert [t.id for t in page] == [2, 3]
+    page, _ = storage.page(title_prefix="COMPRAR", completed=False)
+    assert [t.id for t in page] == [1]
+
+def test_page_through_common_and_rare_prefixes(storage):
+    """Paginar um prefixo comum ou raro devolve as mesmas tarefas que o filtro completo."""
+    storage.create_many([
+        Task(id=0, title="Raro" if i % 50 == 0 else "Comum", completed=i % 3 == 0)
+        for i in range(1, 301)
+    ])
+    for prefix, completed in [("comum", None), ("comum", True), ("raro", None), ("raro", False)]:
+        expected, _ = storage.page(title_prefix=prefix, completed=completed)
+        seen, cursor = [], None
+        while True:
+            page, cursor = storage.page(limit=7, cursor=cursor, completed=completed, title_prefix=prefix)
+            seen += page
+            if cursor is None:
+                break
+        assert [t.id for t in seen] == [t.id for t in expected]
+
+def test_memory_prefix_page_rechecks_titles_after_concurrent_insert():
+    """Uma inserção entre a busca binária e a fatia do índice de títulos não traz tarefas sem o prefixo."""
+    engine = MemoryStorage(stripes=1)
+    for title in ["bbb", "ccc one", "ccc two", "ddd"]:
+        engine.create(Task(id=0, title=title))
+    shard = engine._shards[0]
+
+    class InsertBeforeSlice(list):
+        def __getitem__(self, item):
+            if isinstance(item, slice) and not inserted:
+                inserted.append(True)
+                self.insert(0, ("aaa", 99)) #outra thread grava no meio da leitura
+            return super().__getitem__(item)
+    inserted = []
+    shard.title_index = InsertBeforeSlice(shard.title_index)
+    page, _ = engine.page(title_prefix="ccc")
+    assert inserted and [t.title for t in page] == ["ccc one", "ccc two"]
+
+def test_create_many(storage):
+    created = storage.create_many([Task(id=0, title=f"Lote{i}") for i in range(3)])
+    assert [t.id for t in created] == [1, 2, 3]
+    assert [t.title for t in storage.all()] == ["Lote0", "Lote1", "Lote2"]
+
+def test_patch_many(storage):
+    t = storage.create(Task(id=0, title="Original", description="desc"))
+    updated, missing = storage.patch_many([(t.id, {"title": "Alterada"}), (999, {"completed": True})])
+    assert missing is None
+    assert updated.title == "Alterada"
+    assert updated.description == "desc"
+    assert storage.get(t.id).title == "Alterada"
+    page, _ = storage.page(title_prefix="alter")
+    assert [task.id for task in page] == [t.id]
+    assert storage.patch_many([(t.id, {})])[0].title == "Alterada"
+
+def test_delete_many(storage):
+    t = storage.create(Task(id=0, title="Temp"))
+    assert storage.delete_many([t.id, 999, t.id]) == [True, False, False]
+    assert storage.all() == []
+
+def test_versions_change_on_write(storage):
+    t = storage.create(Task(id=0, title="Versionada"))
+    other = storage.create(Task(id=0, title="Outra"))
+    version, changes = storage.version(t.id), storage.change_count()
+    assert storage.version(t.id) == version #leitura não muda a versão
+    storage.update(t.id, Task(id=t.id, title="Alterada"))
+    assert storage.version(t.id) != version
+    assert storage.change_count() > changes
+    version_other, changes = storage.version(other.id), storage.change_count()
+    storage.patch_many([(t.id, {"completed": True})])
+    assert storage.version(other.id) == version_other
+    assert storage.change_count() > changes
+    changes = storage.change_count()
+    storage.delete(t.id)
+    assert storage.version(t.id) is None
+    assert storage.change_count() > changes
+    assert storage.version(999) is None
+
+def test_iter_batches(storage):
+    storage.create_many([Task(id=0, title=f"Task{i}") for i in range(7)])
+    storage.delete(3)
+    batches = list(storage.iter_batches(batch_size=3))
+    assert [[t.id for t in batch] for batch in batches] == [[1, 2, 4], [5, 6, 7]]
+    assert list(storage.iter_batches()) == [storage.all()]
+
+def test_concurrent_creates_get_unique_ids(storage):
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        created = list(pool.map(lambda i: storage.create(Task(id=0, title=f"Task{i}")), range(100)))
+    assert sorted(t.id for t in created) == list(range(1, 101))
+    assert len(storage.all()) == 100
+
+@pytest.fixture
+def fast_thread_switching():
+    """Fixture que força trocas de thread frequentes para expor condições de corrida."""
+    previous = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(previous)
+
+@pytest.mark.parametrize("engine_name", ["memory", "log"])
+def test_search_index_follows_concurrent_writes(fast_thread_switching, tmp_path, engine_name):
+    """
+    Várias threads alteram e removem as mesmas tarefas; no final o índice de
+    busca deve refletir exatamente o que ficou no armazenamento.
+    """
+    engine = MemoryStorage() if engine_name == "memory" else LogStorage(str(tmp_path / "log"), sync=False)
+    previous = database.set_storage(engine)
+    try:
+        ids = [task.id for task in database.create_tasks_db([TaskCreate(title="Inicial") for _ in range(6)])]
+        database.search_tasks_db("inicial") #monta o índice
+        words = ["alfa", "beta", "gama", "delta"]
+
+        def writer(n):
+            for i in range(200):
+                task_id = ids[(n + i) % len(ids)]
+                if i == 150 + n:
+                    database.delete_task_db(task_id)
+                else:
+                    database.update_task_db(task_id, TaskCreate(title=f"Tarefa {words[(n * i) % len(words)]}"))
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(writer, range(8)))
+        for word in words + ["tarefa"]:
+            expected = {task.id for task in engine.all() if word in task.title.lower()}
+            assert {task.id for task in database.search_tasks_db(word, limit=100)} == expected
+    finally:
+        database.set_storage(previous)
+        engine.close()
+
+def test_memory_storage_stress(fast_thread_switching):
+    """
+    Várias threads criam, alteram, removem e leem tarefas ao mesmo tempo; no
+    final o dicionário e todos os índices devem refletir exatamente o esperado.
+    """
+    engine = MemoryStorage(stripes=4)
+    threads, per_thread = 8, 150
+
+    def worker(n: int) -> dict:
+        expected = {}
+        for j in range(per_thread):
+            t = engine.create(Task(id=0, title=f"Worker{n} task{j}"))
+            expected[t.id] = (t.title, False)
+            if j % 3 == 1:
+                engine.update(t.id, Task(id=t.id, title=f"Feita{n} task{j}", completed=True))
+                expected[t.id] = (f"Feita{n} task{j}", True)
+            elif j % 3 == 2:
+                engine.patch_many([(t.id, {"completed": True})])
+                expected[t.id] = (t.title, True)
+            if j % 5 == 0:
+                assert engine.delete(t.id) is True
+                del expected[t.id]
+            engine.page(limit=20, completed=True)
+            engine.page(limit=20, title_prefix="feita")
+        return expected
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        results = list(pool.map(worker, range(threads)))
+
+    expected = {task_id: state for result in results for task_id, state in result.items()}
+    assert {t.id: (t.title, t.completed) for t in engine.all()} == expected
+    assert [t.id for t in engine.all()] == sorted(expected)
+    done, _ = engine.page(completed=True)
+    assert [t.id for t in done] == sorted(i for i, (_, c) in expected.items() if c)
+    pending, _ = engine.page(completed=False)
+    assert [t.id for t in pending] == sorted(i for i, (_, c) in expected.items() if not c)
+    renamed, _ = engine.page(title_prefix="feita")
+    assert [t.id for t in renamed] == sorted(i for i, (title, _) in expected.items() if title.startswith("Feita"))
+    assert engine.create(Task(id=0, title="Última")).id == threads * per_thread + 1
+
+def test_memory_storage_concurrent_patches_keep_all_fields(fast_thread_switching):
+    """Alterações parciais simultâneas na mesma tarefa não podem perder campos."""
+    engine = MemoryStorage()
+    t = engine.create(Task(id=0, title="Disputada"))
+
+    def patch(field: str):
+        for _ in range(200):
+            value = True if field == "completed" else "Disputada nova"
+            engine.patch_many([(t.id, {field: value})])
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        list(pool.map(patch, ["completed", "description"]))
+    final = engine.get(t.id)
+    assert final.completed is True
+    assert final.description == "Disputada nova"
+
+def test_api_uses_configured_storage(api_storage):
+    r = client.post("/tasks/", json={"title": "Via API"})
+    assert r.status_code == 201
+    assert api_storage.get(r.json()["id"]).title == "Via API"
+    assert client.get("/tasks/").json()[0]["title"] == "Via API"
+
+def test_async_call_and_batches(storage):
+    async def scenario():
+        created = await storage.call(storage.create, Task(id=0, title="Assíncrona"))
+        found = await storage.call(storage.get, created.id)
+        batches = [batch async for batch in storage.aiter_batches(batch_size=1)]
+        return found, batches
+
+    found, batches = asyncio.run(scenario())
+    assert found.title == "Assíncrona"
+    assert [[t.title for t in batch] for batch in batches] == [["Assíncrona"]]
+
+def test_async_call_thread_placement(tmp_path):
+    """Memória roda no event loop; SQLite roda no executor próprio, fora dele."""
+    memory = MemoryStorage()
+    sqlite = SQLiteStorage(str(tmp_path / "async.db"), pool_size=2)
+    main_thread = threading.get_ident()
+    assert asyncio.run(memory.call(threading.get_ident)) == main_thread
+    assert asyncio.run(sqlite.call(threading.get_ident)) != main_thread
+    sqlite.close()
+
+def test_api_handles_many_concurrent_requests(api_storage):
+    """Centenas de requisições simultâneas em um único event loop, sem threadpool."""
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+            responses = await asyncio.gather(*(
+                ac.post("/tasks/", json={"title": f"Concorrente {i}"}) for i in range(300)
+            ))
+            listing = await ac.get("/tasks/")
+        return responses, listing
+
+    responses, listing = asyncio.run(scenario())
+    assert all(r.status_code == 201 for r in responses)
+    assert sorted(r.json()["id"] for r in responses) == list(range(1, 301))
+    assert len(listing.json()) == 300
+
+def test_sqlite_shared_between_instances(tmp_path):
+    """Duas instâncias (como dois workers) no mesmo arquivo veem os mesmos dados."""
+    path = str(tmp_path / "shared.db")
+    first = SQLiteStorage(path, pool_size=1)
+    second = SQLiteStorage(path, pool_size=1)
+    t = first.create(Task(id=0, title="Compartilhada"))
+    assert second.get(t.id).title == "Compartilhada"
+    first.close()
+    second.close()
+
+def test_sqlite_uses_wal(tmp_path):
+    engine = SQLiteStorage(str(tmp_path / "wal.db"), pool_size=1)
+    with engine._connection() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    engine.close()
+
+def test_create_storage_from_url(tmp_path):
+    assert isinstance(create_storage(None), MemoryStorage)
+    assert isinstance(create_storage("memory://"), MemoryStorage)
+    engine = create_storage(f"sqlite:///{tmp_path / 'url.db'}")
+    assert isinstance(engine, SQLiteStorage)
+    engine.close()
+    engine = create_storage(f"log:///{tmp_path / 'url-log'}")
+    assert isinstance(engine, LogStorage)
+    engine.close()
+    with pytest.raises(ValueError):
+        create_storage("postgres://localhost/tasks")
+
+def test_search_api_indexes_existing_tasks(api_storage):
+    """A busca monta o índice com as tarefas já gravadas e acompanha as escritas da API."""
+    api_storage.create_many([TaskCreate(title=f"Tarefa {i}", description="lote antigo") for i in range(5)])
+    response = client.get("/tasks/search", params={"q": "antigo"})
+    assert [task["title"] for task in response.json()] == [f"Tarefa {i}" for i in range(5)]
+    created = client.post("/tasks/", json={"title": "Tarefa recente"}).json()
+    client.delete("/tasks/1")
+    response = client.get("/tasks/search", params={"q": "tarefa recente"})
+    assert [task["id"] for task in response.json()] == [created["id"]]
+    response = client.get("/tasks/search", params={"q": "antigo"})
+    assert len(response.json()) == 4
@@ -1,9 +1,11 @@
+import asyncio
 import pytest
-from fastapi import HTTPException
+from fastapi import HTTPException, Response
 from app.models import Task
 from app.database import (
     create_task_db,
     get_all_tasks_db,
+    list_tasks_db,
     get_task_db,
     update_task_db,
     delete_task_db,
@@ -63,34 +65,81 @@ def test_clear_db_resets():
     t = create_task_db(Task(id=0, title="Novo"))
     assert t.id == 1
 
+def test_list_tasks_db_paginates_with_cursor():
+    """Páginas devem seguir a ordem de id e encadear pelo cursor."""
+    for i in range(5):
+        create_task_db(Task(id=0, title=f"Title{i}"))
+    page, cursor = list_tasks_db(limit=2)
+    assert [t.id for t in page] == [1, 2]
+    assert cursor == 2
+    page, cursor = list_tasks_db(limit=2, cursor=cursor)
+    assert [t.id for t in page] == [3, 4]
+    page, cursor = list_tasks_db(limit=2, cursor=cursor)
+    assert [t.id for t in page] == [5]
+    assert cursor is None
+
+def test_list_tasks_db_filters_completed():
+    """O filtro completed deve usar o índice de status atualizado."""
+    create_task_db(Task(id=0, title="Aberta"))
+    done = create_task_db(Task(id=0, title="Feita", completed=True))
+    other = create_task_db(Task(id=0, title="Outra"))
+    update_task_db(other.id, Task(id=other.id, title="Outra", completed=True))
+    page, _ = list_tasks_db(completed=True)
+    assert [t.id for t in page] == [done.id, other.id]
+    page, _ = list_tasks_db(completed=False)
+    assert [t.title for t in page] == ["Aberta"]
+
+def test_list_tasks_db_filters_title_prefix():
+    """O filtro por prefixo ignora maiúsculas e respeita cursor e status."""
+    create_task_db(Task(id=0, title="Comprar pão"))
+    create_task_db(Task(id=0, title="Lavar carro"))
+    create_task_db(Task(id=0, title="comprar leite", completed=True))
+    create_task_db(Task(id=0, title="Compor música"))
+    page, _ = list_tasks_db(title_prefix="COMPRAR")
+    assert [t.id for t in page] == [1, 3]
+    page, cursor = list_tasks_db(limit=1, title_prefix="comp")
+    assert [t.id for t in page] == [1]
+    page, _ = list_tasks_db(limit=1, cursor=cursor, title_prefix="comp")
+    assert [t.id for t in page] == [3]
+    page, _ = list_tasks_db(title_prefix="comp", completed=False)
+    assert [t.id for t in page] == [1, 4]
+
+def test_list_tasks_db_skips_deleted():
+    """Tarefas removidas devem sair de todos os índices."""
+    t = create_task_db(Task(id=0, title="Temp"))
+    delete_task_db(t.id)
+    assert list_tasks_db() == ([], None)
+    assert list_tasks_db(completed=False) == ([], None)
+    assert list_tasks_db(title_prefix="te") == ([], None)
+
 def test_create_task_calls_create_task_db(mocker):
-    """Verifica se create_task chama create_task_db corretamente."""
+    """Verifica se create_task chama acreate_task_db corretamente."""
     fake_task = {"id": 1, "title": "Teste", "description": "Mocked"}
-    mock_create = mocker.patch("app.main.create_task_db", return_value=fake_task)
+    mock_create = mocker.patch("app.main.acreate_task_db", return_value=fake_task)
 
     payload = main.TaskCreate(title="Teste", description="Mocked")
-    result = main.create_task(payload)
+    result = asyncio.run(main.create_task(payload))
 
     mock_create.assert_called_once()
     assert result == fake_task
 
 
 def test_read_task_not_found_raises(mocker):
-    """Se get_task_db retornar None, deve levantar 404."""
-    mocker.patch("app.main.get_task_db", return_value=None)
+    """Se aget_task_db retornar None, deve levantar 404."""
+    mocker.patch("app.main.aget_task_version_db", return_value="v-1")
+    mocker.patch("app.main.aget_task_db", return_value=None)
 
     with pytest.raises(HTTPException) as exc:
-        main.read_task(999)
+        asyncio.run(main.read_task(999, Response()))
     assert exc.value.status_code == 404
 
 
 def test_update_task_calls_update_task_db(mocker):
-    """Verifica se update_task chama update_task_db corretamente."""
-    mocker.patch("app.main.get_task_db", return_value={"id": 1})
-    mock_update = mocker.patch("app.main.update_task_db", return_value={"id": 1, "title": "Novo"})
+    """Verifica se update_task chama aupdate_task_db corretamente."""
+    mock_update = mocker.patch("app.main.aupdate_task_db", return_value={"id": 1, "title": "Novo"})
 
     payload = main.TaskCreate(title="Novo")
-    result = main.update_task(1, payload)
+    result = asyncio.run(main.update_task(1, payload))
 
     mock_update.assert_called_once()
     assert result["title"] == "Novo"
@@ -98,24 +147,24 @@ def test_update_task_calls_update_task_db(mocker):
 
 def test_update_task_not_found_raises(mocker):
     """update_task deve levantar 404 se ID não existir."""
-    mocker.patch("app.main.get_task_db", return_value=None)
+    mocker.patch("app.main.aupdate_task_db", return_value=None)
     payload = main.TaskCreate(title="Title")
 
     with pytest.raises(HTTPException) as exc:
-        main.update_task(123, payload)
+        asyncio.run(main.update_task(123, payload))
     assert exc.value.status_code == 404
 
 
 def test_delete_task_calls_delete_task_db(mocker):
-    """delete_task deve chamar delete_task_db e não levantar erro se True."""
-    mocker.patch("app.main.delete_task_db", return_value=True)
-    assert main.delete_task(1) is None
+    """delete_task deve chamar adelete_task_db e não levantar erro se True."""
+    mocker.patch("app.main.adelete_task_db", return_value=True)
+    assert asyncio.run(main.delete_task(1)) is None
 
 
 def test_delete_task_not_found_raises(mocker):
-    """delete_task deve levantar 404 se delete_task_db retornar False."""
-    mocker.patch("app.main.delete_task_db", return_value=False)
+    """delete_task deve levantar 404 se adelete_task_db retornar False."""
+    mocker.patch("app.main.adelete_task_db", return_value=False)
 
     with pytest.raises(HTTPException) as exc:
-        main.delete_task(999)
+        asyncio.run(main.delete_task(999))
     assert exc.value.status_code == 404
\ No newline at end of file
@@ -1,9 +1,72 @@
 import httpx
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Decodificação da resposta de um usuário, só com os campos retornados:
+# - msgspec (opcional): decodifica direto em um registro tipado com esses
+#   campos e pula o resto do documento sem criar objetos Python para ele;
+# - orjson (opcional) ou json padrão: decodificam o documento inteiro e os
+#   campos são copiados dele.
+try:
+    import msgspec
+
+    class _UserPayload(msgspec.Struct):
+        login: str | None = None
+        name: str | None = None
+        public_repos: int | None = None
+        followers: int | None = None
+        following: int | None = None
+        html_url: str | None = None
+
+    _user_decoder = msgspec.json.Decoder(_UserPayload)
+
+    def _parse_user(content: bytes) -> dict:
+        try:
+            payload = _user_decoder.decode(content)
+        except msgspec.MsgspecError as exc:
+            raise ValueError(str(exc)) from exc
+        return {
+            "login": payload.login,
+            "name": payload.name,
+            "public_repos": payload.public_repos,
+            "followers": payload.followers,
+            "following": payload.following,
+            "url": payload.html_url,
+        }
+
+except ImportError:
+    try:
+        from orjson import loads as _json_loads
+    except ImportError:
+        from json import loads as _json_loads
+
+    def _parse_user(content: bytes) -> dict:
+        data = _json_loads(content)
+        return {
+            "login": data.get("login"),
+            "name": data.get("name"),
+            "public_repos": data.get("public_repos"),
+            "followers": data.get("followers"),
+            "following": data.get("following"),
+            "url": data.get("html_url"),
+        }
+ 
+# Última resposta de cada usuário com seus validadores (ETag/Last-Modified),
+# usada para perguntar à API se o usuário mudou desde a consulta anterior
+_validated_users: OrderedDict = OrderedDict()
+_validated_users_lock = threading.Lock()  # get/move_to_end e popitem de threads diferentes
+VALIDATED_USERS_MAX = 1024
  
  
 def get_github_user(username: str) -> dict:
     """
     Consulta a API pública do GitHub e retorna informações de um usuário.
+
+    Repetições da consulta enviam `If-None-Match`/`If-Modified-Since`; se o
+    usuário não mudou, a API responde 304 sem corpo e os dados guardados são
+    retornados (respostas 304 não contam no limite de requisições do GitHub).
  
     Args:
         username (str): Nome de usuário no GitHub.
@@ -12,26 +75,97 @@ def get_github_user(username: str) -> dict:
         dict: Dicionário com os dados principais do usuário.
     """
     url = f"https://api.github.com/users/{username}"
-    response = httpx.get(url, timeout=10)
+    key = username.lower()
+    with _validated_users_lock:
+        cached = _validated_users.get(key)
+    headers = {}
+    if cached is not None:
+        headers = {
+            header: cached[1][name]
+            for name, header in (("etag", "If-None-Match"), ("last-modified", "If-Modified-Since"))
+            if name in cached[1]
+        }
+    response = httpx.get(url, timeout=10, headers=headers)
+
+    if response.status_code == 304 and cached is not None:
+        with _validated_users_lock:
+            if key in _validated_users:  # pode ter saído do cache durante a requisição
+                _validated_users.move_to_end(key)
+        return dict(cached[0])
  
     # Levanta exceção se a resposta for inválida
     response.raise_for_status()
  
-    data = response.json()
-    return {
-        "login": data.get("login"),
-        "name": data.get("name"),
-        "public_repos": data.get("public_repos"),
-        "followers": data.get("followers"),
-        "following": data.get("following"),
-        "url": data.get("html_url"),
-    }
+    user = _parse_user(response.content)
+    validators = {name: response.headers[name] for name in ("etag", "last-modified") if name in response.headers}
+    if validators:
+        with _validated_users_lock:
+            _validated_users[key] = (dict(user), validators)
+            _validated_users.move_to_end(key)
+            while len(_validated_users) > VALIDATED_USERS_MAX:
+                _validated_users.popitem(last=False)
+    return user
 
-def get_ip():
-    """Retorna o IP público usando a API ipify"""
-    url = "https://api.ipify.org?format=json"
+# Serviços de eco de IP consultados em paralelo (todos respondem {"ip": "..."})
+IP_PROVIDERS = (
+    "https://api.ipify.org?format=json",
+    "https://ipinfo.io/json",
+    "https://ifconfig.co/json",
+)
+IP_REFRESH_INTERVAL = 300  # segundos até o IP guardado ser atualizado em segundo plano
+IP_RETRY_INTERVAL = 30  # segundos até nova tentativa quando a atualização falha
+_ip_state = {"ip": None, "refresh_at": 0.0, "refreshing": False}
+_ip_lock = threading.Lock()
+
+
+def _ask_ip(url: str) -> str:
     resp = httpx.get(url, timeout=5)
+    resp.raise_for_status()
     return resp.json()["ip"]
+
+
+def _lookup_ip() -> str:
+    """Consulta todos os serviços ao mesmo tempo e guarda a primeira resposta."""
+    pool = ThreadPoolExecutor(max_workers=len(IP_PROVIDERS))
+    futures = [pool.submit(_ask_ip, url) for url in IP_PROVIDERS]
+    pool.shutdown(wait=False)  # os mais lentos terminam sozinhos
+    for future in as_completed(futures):
+        if future.exception() is None:
+            _ip_state["ip"] = future.result()
+            _ip_state["refresh_at"] = time.monotonic() + IP_REFRESH_INTERVAL
+            return _ip_state["ip"]
+    raise futures[0].exception()
+
+
+def _refresh_ip() -> None:
+    try:
+        _lookup_ip()
+    except Exception:
+        # mantém o IP antigo e tenta de novo depois de IP_RETRY_INTERVAL
+        _ip_state["refresh_at"] = time.monotonic() + IP_RETRY_INTERVAL
+    finally:
+        _ip_state["refreshing"] = False
+
+
+def get_ip():
+    """
+    Retorna o IP público.
+
+    A primeira chamada consulta vários serviços em paralelo e fica com a
+    primeira resposta; as seguintes retornam o IP guardado na hora, e a cada
+    IP_REFRESH_INTERVAL segundos ele é atualizado em uma thread de fundo. Se a
+    atualização falhar, o IP antigo continua valendo até a próxima tentativa.
+
+    É a mesma política de `PublicIPCache` (testes unitarios 2/ipcache.py),
+    em versão enxuta para este script, que não depende daquela pasta.
+    """
+    with _ip_lock:
+        if _ip_state["ip"] is None:
+            return _lookup_ip()
+        if time.monotonic() >= _ip_state["refresh_at"] and not _ip_state["refreshing"]:
+            _ip_state["refreshing"] = True
+            threading.Thread(target=_refresh_ip, daemon=True).start()
+        return _ip_state["ip"]
  
 if __name__ == "__main__":
     # Exemplo de uso: consultar o próprio usuário do GitHub
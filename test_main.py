@@ -0,0 +1,117 @@
+import threading
+import time
+import httpx
+import pytest
+import main
+
+
+@pytest.fixture(autouse=True)
+def reset_caches():
+    """Os caches de main.py valem entre chamadas: cada teste começa sem nada guardado."""
+    main._validated_users.clear()
+    main._ip_state.update(ip=None, refresh_at=0.0, refreshing=False)
+    yield
+    main._validated_users.clear()
+    main._ip_state.update(ip=None, refresh_at=0.0, refreshing=False)
+
+
+def user_response(status_code=200, headers=None, **fields):
+    request = httpx.Request("GET", "https://api.github.com/users/octocat")
+    if status_code == 304:
+        return httpx.Response(304, headers=headers, request=request)
+    return httpx.Response(status_code, json={"login": "octocat", **fields}, headers=headers, request=request)
+
+
+def test_get_github_user_revalidates_with_etag(monkeypatch):
+    sent_headers = []
+    replies = iter([
+        user_response(headers={"ETag": '"v1"'}, name="The Octocat", html_url="https://github.com/octocat"),
+        user_response(304),
+    ])
+
+    def mock_get(url, **kwargs):
+        sent_headers.append(kwargs.get("headers"))
+        return next(replies)
+    monkeypatch.setattr(httpx, "get", mock_get)
+
+    first = main.get_github_user("octocat")
+    second = main.get_github_user("OctoCat")
+    assert first == second == {
+        "login": "octocat", "name": "The Octocat", "public_repos": None,
+        "followers": None, "following": None, "url": "https://github.com/octocat",
+    }
+    assert sent_headers == [{}, {"If-None-Match": '"v1"'}]
+    second["name"] = "alterado"
+    assert main._validated_users["octocat"][0]["name"] == "The Octocat"  # o cache não é alterado por quem chamou
+
+
+def test_get_github_user_without_validators_is_not_cached(monkeypatch):
+    monkeypatch.setattr(httpx, "get", lambda url, **kw: user_response(name="Sem ETag"))
+    assert main.get_github_user("octocat")["name"] == "Sem ETag"
+    assert len(main._validated_users) == 0
+
+
+def test_get_github_user_evicts_least_recently_used(monkeypatch):
+    monkeypatch.setattr(main, "VALIDATED_USERS_MAX", 2)
+    monkeypatch.setattr(httpx, "get", lambda url, **kw: user_response(headers={"ETag": '"v"'}))
+    for username in ["a", "b", "c"]:
+        main.get_github_user(username)
+    assert list(main._validated_users) == ["b", "c"]
+
+
+def serve_ip(monkeypatch, reply):
+    """Todos os serviços de IP respondem com `reply()`; retorna as URLs chamadas."""
+    calls = []
+
+    def mock_get(url, **kwargs):
+        calls.append(url)
+        ip = reply()
+        if isinstance(ip, Exception):
+            raise ip
+        return httpx.Response(200, json={"ip": ip}, request=httpx.Request("GET", url))
+    monkeypatch.setattr(httpx, "get", mock_get)
+    return calls
+
+
+def wait_for(condition):
+    deadline = time.monotonic() + 5
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert condition()
+
+
+def test_get_ip_uses_cached_ip_between_refreshes(monkeypatch):
+    calls = serve_ip(monkeypatch, lambda: "1.2.3.4")
+    assert main.get_ip() == "1.2.3.4"
+    wait_for(lambda: len(calls) == len(main.IP_PROVIDERS))  # os serviços que perderam terminam
+    for _ in range(100):
+        assert main.get_ip() == "1.2.3.4"
+    assert len(calls) == len(main.IP_PROVIDERS)  # nenhuma consulta nova
+
+
+def test_get_ip_refreshes_in_background(monkeypatch):
+    serve_ip(monkeypatch, lambda: "1.2.3.4")
+    main.get_ip()
+
+    release = threading.Event()
+
+    def slow():
+        release.wait(5)
+        return "4.3.2.1"
+    serve_ip(monkeypatch, slow)
+    main._ip_state["refresh_at"] = 0.0  # o intervalo de atualização passou
+    assert main.get_ip() == "1.2.3.4"  # responde na hora com o IP antigo
+    assert main._ip_state["refreshing"]
+    release.set()
+    wait_for(lambda: main.get_ip() == "4.3.2.1")
+
+
+def test_get_ip_keeps_old_ip_when_refresh_fails(monkeypatch):
+    serve_ip(monkeypatch, lambda: "1.2.3.4")
+    main.get_ip()
+    serve_ip(monkeypatch, lambda: httpx.ConnectError("fora do ar"))
+    main._ip_state["refresh_at"] = 0.0
+    assert main.get_ip() == "1.2.3.4"
+    wait_for(lambda: not main._ip_state["refreshing"])
+    assert main.get_ip() == "1.2.3.4"
+    assert main._ip_state["refresh_at"] > time.monotonic()  # nova tentativa só depois de IP_RETRY_INTERVAL
@@ -0,0 +1,120 @@
+"""
+Mede os clientes do GitHub contra um servidor HTTP/1.1 local que imita a API
+de usuários.
+
+- sem pool: uma chamada a `httpx.get` por consulta (uma conexão nova por vez).
+- com pool: o `httpx.Client` do `GitHubClient`, com conexões keep-alive.
+- em lote: `AsyncGitHubClient.get_users` com servidor de latência simulada,
+  variando o limite de concorrência.
+
+Execução (na pasta "testes unitarios 2"):
+`uv run python bench_client.py [consultas]`
+"""
+import asyncio
+import json
+import multiprocessing
+import sys
+import time
+import httpx
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator
+from system import AsyncGitHubClient, GitHubClient
+
+SIMULATED_LATENCY = 0.1 #segundos de "ida e volta" no servidor lento
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    disable_nagle_algorithm = True #cabeçalho e corpo saem sem esperar ACK
+    protocol_version = "HTTP/1.1" #permite keep-alive
+
+    delay = 0.0
+
+    def do_GET(self):
+        time.sleep(self.delay)
+        body = json.dumps({"login": self.path.rsplit("/", 1)[-1], "public_repos": 8}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def per_request_connection(base_url: str, n: int) -> float:
+    """Milissegundos por consulta abrindo uma conexão a cada chamada"""
+    start = time.perf_counter()
+    for i in range(n):
+        httpx.get(f"{base_url}/user{i}", timeout=10).json()
+    return (time.perf_counter() - start) * 1000 / n
+
+
+def pooled_client(base_url: str, n: int) -> float:
+    """Milissegundos por consulta com o cliente do `GitHubClient`"""
+    with GitHubClient() as client:
+        client.BASE_URL = base_url
+        start = time.perf_counter()
+        for i in range(n):
+            client.get_user(f"user{i}")
+        return (time.perf_counter() - start) * 1000 / n
+
+
+def batch_throughput(base_url: str, n: int, concurrency: int) -> float:
+    """Consultas por segundo com `get_users` e o limite de concorrência dado"""
+    async def run() -> float:
+        async with AsyncGitHubClient(concurrency=concurrency) as client:
+            client.BASE_URL = base_url
+            start = time.perf_counter()
+            await client.get_users(f"user{i}" for i in range(n))
+            return n / (time.perf_counter() - start)
+    return asyncio.run(run())
+
+
+class StubServer(ThreadingHTTPServer):
+    request_queue_size = 128 #o padrão (5) recusa conexões abertas em rajada
+
+
+def serve(delay: float, ports: multiprocessing.Queue) -> None:
+    handler = type("Handler", (StubHandler,), {"delay": delay})
+    server = StubServer(("127.0.0.1", 0), handler)
+    ports.put(server.server_address[1])
+    server.serve_forever()
+
+
+@contextmanager
+def stub_server(delay: float = 0.0) -> Iterator[str]:
+    """
+    Sobe o servidor em outro processo, para que as threads dele não disputem
+    o GIL com o cliente medido; gera a URL base de usuários.
+    """
+    ports: multiprocessing.Queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=serve, args=(delay, ports), daemon=True)
+    process.start()
+    try:
+        yield f"http://127.0.0.1:{ports.get(timeout=10)}/users"
+    finally:
+        process.terminate()
+        process.join()
+
+
+def main(n: int = 2000) -> None:
+    with stub_server() as base_url:
+        before = per_request_connection(base_url, n)
+        after = pooled_client(base_url, n)
+    print(f"{n} consultas ao servidor local")
+    print(f"sem pool (httpx.get):       {before:6.3f} ms/consulta")
+    print(f"com pool (GitHubClient):    {after:6.3f} ms/consulta")
+    print(f"redução: {before / after:.1f}x (sem TLS; contra o GitHub a diferença é maior)")
+
+    batch = min(n, 500)
+    print(f"\n{batch} consultas em lote, latência simulada de {SIMULATED_LATENCY * 1000:.0f} ms")
+    with stub_server(SIMULATED_LATENCY) as base_url:
+        for concurrency in (1, 5, 10, 20):
+            rate = batch_throughput(base_url, batch, concurrency)
+            print(f"get_users, concorrência {concurrency:3d}: {rate:8.0f} consultas/s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
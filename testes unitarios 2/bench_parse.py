@@ -0,0 +1,121 @@
+"""
+Compara a decodificação da resposta de usuário antes e depois do users.parse_user.
+
+- antes: `json.loads` do documento inteiro e um dicionário com seis campos.
+- depois: `parse_user`, com o decodificador instalado (msgspec, orjson ou
+  json), gerando um `GitHubUser`.
+
+Mede o tempo por resposta, o pico de memória alocada durante a decodificação
+e a memória mantida por usuário guardado.
+
+Execução (na pasta "testes unitarios 2"):
+`uv run python bench_parse.py [repetições]`
+"""
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from users import JSON_BACKEND, parse_user
+
+#Resposta real de GET /users/octocat (autenticada), com todos os campos
+PAYLOAD = json.dumps({
+    "login": "octocat",
+    "id": 583231,
+    "node_id": "MDQ6VXNlcjU4MzIzMQ==",
+    "avatar_url": "https://avatars.githubusercontent.com/u/583231?v=4",
+    "gravatar_id": "",
+    "url": "https://api.github.com/users/octocat",
+    "html_url": "https://github.com/octocat",
+    "followers_url": "https://api.github.com/users/octocat/followers",
+    "following_url": "https://api.github.com/users/octocat/following{/other_user}",
+    "gists_url": "https://api.github.com/users/octocat/gists{/gist_id}",
+    "starred_url": "https://api.github.com/users/octocat/starred{/owner}{/repo}",
+    "subscriptions_url": "https://api.github.com/users/octocat/subscriptions",
+    "organizations_url": "https://api.github.com/users/octocat/orgs",
+    "repos_url": "https://api.github.com/users/octocat/repos",
+    "events_url": "https://api.github.com/users/octocat/events{/privacy}",
+    "received_events_url": "https://api.github.com/users/octocat/received_events",
+    "type": "User",
+    "user_view_type": "public",
+    "site_admin": False,
+    "name": "The Octocat",
+    "company": "@github",
+    "blog": "https://github.blog",
+    "location": "San Francisco",
+    "email": None,
+    "hireable": None,
+    "bio": None,
+    "twitter_username": None,
+    "public_repos": 8,
+    "public_gists": 8,
+    "followers": 16821,
+    "following": 9,
+    "created_at": "2011-01-25T18:44:36Z",
+    "updated_at": "2025-01-22T12:19:05Z",
+    "private_gists": 0,
+    "total_private_repos": 0,
+    "owned_private_repos": 0,
+    "disk_usage": 3516,
+    "collaborators": 0,
+    "two_factor_authentication": True,
+    "plan": {"name": "free", "space": 976562499, "collaborators": 0, "private_repos": 10000},
+}, indent=2).encode()
+
+
+def parse_dict(content: bytes) -> dict:
+    """O caminho antigo: documento inteiro decodificado, seis campos copiados"""
+    data = json.loads(content)
+    return {
+        "login": data.get("login"),
+        "name": data.get("name"),
+        "public_repos": data.get("public_repos", 0),
+        "followers": data.get("followers", 0),
+        "following": data.get("following", 0),
+        "url": data.get("html_url"),
+    }
+
+
+def time_per_parse(parse, n: int) -> float:
+    """Microssegundos por resposta"""
+    payloads = [PAYLOAD.replace(b"octocat", f"user{i:07d}".encode()) for i in range(1000)]
+    start = time.perf_counter()
+    for i in range(n):
+        parse(payloads[i % 1000])
+    return (time.perf_counter() - start) * 1e6 / n
+
+
+def peak_allocation(parse) -> int:
+    """Pico de bytes alocados para decodificar uma resposta"""
+    gc.collect()
+    tracemalloc.start()
+    parse(PAYLOAD)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def retained_per_user(parse, n: int = 10_000) -> float:
+    """Bytes mantidos por usuário guardado (o que fica em um cache)"""
+    payloads = [PAYLOAD.replace(b"octocat", f"user{i:07d}".encode()) for i in range(n)]
+    gc.collect()
+    tracemalloc.start()
+    users = [parse(payload) for payload in payloads]
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del users
+    return allocated / n
+
+
+def main(n: int = 50_000) -> None:
+    print(f"resposta de {len(PAYLOAD)} bytes; decodificador: {JSON_BACKEND}")
+    for label, parse in (("antes (json + dict)", parse_dict), ("depois (parse_user)", parse_user)):
+        print(
+            f"{label:22s} {time_per_parse(parse, n):6.2f} µs/resposta"
+            f"  pico {peak_allocation(parse):6d} B"
+            f"  mantido {retained_per_user(parse):6.0f} B/usuário"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
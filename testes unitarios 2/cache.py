@@ -0,0 +1,184 @@
+import shelve
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+from users import GitHubUser
+
+#Entrada do cache: (instante de expiração, usuário, validadores HTTP);
+#usuário None marca usuário inexistente
+Entry = Tuple[float, Optional[GitHubUser], Optional[dict]]
+
+MISS = object() #retorno de `UserCache.get` quando não há entrada válida
+
+
+def normalize_username(username: str) -> str:
+    """Logins do GitHub não diferenciam maiúsculas: 'OctoCat' e 'octocat' são o mesmo."""
+    return username.strip().lower()
+
+
+class CacheBackend(ABC):
+    """Armazenamento persistente opcional por trás do `UserCache`."""
+
+    @abstractmethod
+    def load(self, key: str) -> Optional[Entry]:
+        """Retorna a entrada guardada para a chave, ou None."""
+
+    @abstractmethod
+    def store(self, key: str, entry: Entry) -> None:
+        """Grava (ou substitui) a entrada da chave."""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove a entrada da chave, se existir."""
+
+    def close(self) -> None:
+        """Libera os recursos do armazenamento."""
+
+
+class ShelveCacheBackend(CacheBackend):
+    """Guarda as entradas em um arquivo `shelve`, para o cache sobreviver a reinícios."""
+
+    def __init__(self, path: str):
+        self._shelf = shelve.open(path)
+        self._lock = threading.Lock() #o shelve não é seguro entre threads
+
+    def load(self, key: str) -> Optional[Entry]:
+        with self._lock:
+            return self._shelf.get(key)
+
+    def store(self, key: str, entry: Entry) -> None:
+        with self._lock:
+            self._shelf[key] = entry
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._shelf.pop(key, None)
+
+    def close(self) -> None:
+        with self._lock:
+            self._shelf.close()
+
+
+class UserCache:
+    """
+    Cache de usuários do GitHub com validade (TTL) e limite de tamanho (LRU).
+
+    As chaves são os usernames normalizados. Usuários encontrados valem por
+    `ttl` segundos e usuários inexistentes (404) por `negative_ttl`; ao passar
+    de `max_size` entradas, a usada há mais tempo é descartada. Com um
+    `backend`, as entradas também são gravadas nele e lidas de volta quando
+    faltam na memória (por exemplo, depois de reiniciar o processo).
+
+    Entradas com validadores HTTP (`ETag`/`Last-Modified`) não são apagadas
+    ao vencer: continuam disponíveis em `stale` para uma requisição
+    condicional, até serem descartadas pelo limite de tamanho.
+
+    Os usuários são registros `GitHubUser` imutáveis, guardados e devolvidos
+    sem cópia.
+
+    Os tempos usam o relógio de parede (`time.time`), que continua valendo
+    entre processos diferentes.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        ttl: float = 300.0,
+        negative_ttl: float = 60.0,
+        backend: Optional[CacheBackend] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.backend = backend
+        self._clock = clock
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, username: str):
+        """
+        Retorna o usuário guardado, None para usuário inexistente ou `MISS`
+        se não houver entrada válida.
+        """
+        with self._lock:
+            entry = self._find(normalize_username(username))
+            if entry is None or entry[0] <= self._clock():
+                self.misses += 1
+                return MISS
+            self.hits += 1
+        return entry[1]
+
+    def stale(self, username: str) -> Optional[Tuple[GitHubUser, dict]]:
+        """
+        Usuário guardado e seus validadores, mesmo que a entrada já tenha
+        vencido; None se não houver entrada com validadores.
+        """
+        with self._lock:
+            entry = self._find(normalize_username(username))
+        if entry is None or entry[1] is None or not entry[2]:
+            return None
+        return entry[1], dict(entry[2])
+
+    def set(self, username: str, user: GitHubUser, validators: Optional[dict] = None) -> None:
+        """Guarda um usuário encontrado e, se houver, os validadores da resposta."""
+        entry = (self._clock() + self.ttl, user, validators or None)
+        self._put(normalize_username(username), entry)
+
+    def set_missing(self, username: str) -> None:
+        """Guarda que o usuário não existe (resposta 404)."""
+        self._put(normalize_username(username), (self._clock() + self.negative_ttl, None, None))
+
+    def _find(self, key: str) -> Optional[Entry]:
+        """
+        Procura a entrada na memória e depois no backend (com o lock adquirido).
+        Entradas vencidas sem validadores são apagadas.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        elif self.backend is not None:
+            entry = self.backend.load(key)
+            if entry is not None:
+                self._remember(key, entry)
+        if entry is None:
+            return None
+        if entry[0] <= self._clock() and not entry[2]:
+            self._entries.pop(key, None)
+            if self.backend is not None:
+                self.backend.delete(key)
+            return None
+        return entry
+
+    def _put(self, key: str, entry: Entry) -> None:
+        with self._lock:
+            self._remember(key, entry)
+            if self.backend is not None:
+                self.backend.store(key, entry)
+
+    def _remember(self, key: str, entry: Entry) -> None:
+        """Guarda na memória e descarta as entradas mais antigas (com o lock adquirido)"""
+        if self.max_size <= 0:
+            return
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Esvazia a memória e zera os contadores (o backend não é alterado)."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> dict:
+        """Contadores para monitoramento."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
@@ -0,0 +1,126 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Iterable, Optional
+import httpx
+from resilience import CircuitBreaker, RetryPolicy
+from singleflight import SingleFlight
+
+#Serviços de eco de IP que respondem {"ip": "..."}; o primeiro é o preferido
+IP_PROVIDERS = (
+    "https://api.ipify.org?format=json",
+    "https://ipinfo.io/json",
+    "https://ifconfig.co/json",
+)
+
+
+class PublicIPCache:
+    """
+    IP público guardado em memória e atualizado em segundo plano.
+
+    A primeira chamada de `get` consulta todos os `providers` ao mesmo tempo e
+    fica com a primeira resposta válida, de modo que um serviço lento ou fora
+    do ar não atrasa a consulta. Depois disso `get` retorna o último IP
+    conhecido na hora, sem acesso à rede; passados `refresh_interval`
+    segundos, a chamada seguinte dispara uma nova consulta em uma thread de
+    fundo e continua retornando o valor antigo até ela terminar. Se a
+    atualização falhar, o valor antigo continua valendo e uma nova tentativa
+    só é feita depois de `retry_interval` segundos.
+
+    Cada serviço tem o seu `CircuitBreaker`; as novas tentativas seguem a
+    `retry` compartilhada.
+    """
+
+    def __init__(
+        self,
+        providers: Iterable[str] = IP_PROVIDERS,
+        refresh_interval: float = 300.0,
+        retry_interval: float = 30.0,
+        timeout: float = 5.0,
+        retry: Optional[RetryPolicy] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.providers = tuple(providers)
+        self.refresh_interval = refresh_interval
+        self.retry_interval = retry_interval
+        self.timeout = timeout
+        self.retry = RetryPolicy() if retry is None else retry
+        self.breakers = {url: CircuitBreaker() for url in self.providers}
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+        self._state = ("", 0.0) #(ip, instante da próxima atualização), trocado de uma vez
+        self._refreshing = False
+
+    def get(self, timeout: Optional[float] = None) -> str:
+        """Retorna o IP público; só espera a rede se ainda não houver um IP conhecido."""
+        ip, next_refresh = self._state
+        if not ip:
+            #chamadas simultâneas sem IP conhecido compartilham a mesma consulta
+            return self._flight.do("ip", lambda: self.refresh(timeout))
+        if self._clock() >= next_refresh:
+            self._refresh_in_background()
+        return ip
+
+    def refresh(self, timeout: Optional[float] = None) -> str:
+        """Consulta os serviços agora e guarda o IP obtido."""
+        ip = self._lookup(self.timeout if timeout is None else timeout)
+        if ip:
+            self._state = (ip, self._clock() + self.refresh_interval)
+        return ip
+
+    def clear(self) -> None:
+        """Esquece o IP guardado e fecha os circuit breakers."""
+        self._state = ("", 0.0)
+        for breaker in self.breakers.values():
+            breaker.reset()
+
+    def _refresh_in_background(self) -> None:
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._background_refresh, name="public-ip-refresh", daemon=True).start()
+
+    def _background_refresh(self) -> None:
+        try:
+            try:
+                ip = self._flight.do("ip", self.refresh)
+            except Exception:
+                ip = ""
+            if not ip:
+                #erro ou nenhum serviço com IP: mantém o antigo e adia a próxima tentativa
+                old_ip, _ = self._state
+                if old_ip:
+                    self._state = (old_ip, self._clock() + self.retry_interval)
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def _lookup(self, timeout: float) -> str:
+        """
+        Pergunta a todos os serviços em paralelo e retorna o primeiro IP. Se
+        nenhum responder com um IP, retorna a resposta vazia de algum deles
+        ou, se todos falharem, levanta o erro do serviço preferido.
+        """
+        pool = ThreadPoolExecutor(max_workers=len(self.providers), thread_name_prefix="public-ip")
+        futures = [pool.submit(self._ask, url, timeout) for url in self.providers]
+        pool.shutdown(wait=False) #os mais lentos terminam sozinhos, sem segurar a resposta
+        answered = False
+        for future in as_completed(futures):
+            if future.exception() is None:
+                ip = future.result()
+                if ip:
+                    return ip
+                answered = True
+        if answered:
+            return ""
+        raise futures[0].exception()
+
+    def _ask(self, url: str, timeout: float) -> str:
+        try:
+            resp = self.retry.call(lambda: httpx.get(url, timeout=timeout), self.breakers[url])
+            resp.raise_for_status()
+        except httpx.TimeoutException:
+            raise TimeoutError("Timeout ao consultar IP público.")
+        return resp.json().get("ip", "")
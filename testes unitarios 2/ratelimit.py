@@ -0,0 +1,160 @@
+import asyncio
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Mapping, Optional
+
+
+def _header_int(headers: Mapping, name: str) -> Optional[int]:
+    value = headers.get(name)
+    try:
+        return None if value is None else int(value)
+    except ValueError:
+        return None
+
+
+def _retry_after(value: Optional[str], now: float) -> Optional[float]:
+    """Converte `Retry-After` (segundos ou data HTTP) em instante absoluto."""
+    if value is None:
+        return None
+    try:
+        return now + max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimiter:
+    """
+    Escalonador de requisições que respeita o limite da API do GitHub.
+
+    Funciona como um balde de fichas: cada requisição consome uma ficha e o
+    balde é reabastecido quando a janela do GitHub termina. O saldo vem dos
+    cabeçalhos `X-RateLimit-Limit`, `X-RateLimit-Remaining` e
+    `X-RateLimit-Reset` de cada resposta, descontando as requisições que
+    ainda estão em andamento; `Retry-After` suspende todas as requisições até
+    o instante indicado.
+
+    Enquanto há saldo, as requisições saem sem espera nenhuma; sem saldo, elas
+    ficam na fila (`acquire` bloqueia) até a janela reiniciar, em vez de gastar
+    respostas 403. Antes da primeira resposta com os cabeçalhos (ou com um
+    servidor que não os envia), o saldo é desconhecido e nada é segurado.
+
+    Os instantes usam o relógio de parede (`time.time`), o mesmo do cabeçalho
+    `X-RateLimit-Reset`.
+    """
+
+    def __init__(
+        self,
+        limit: Optional[int] = None,
+        window: float = 3600.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.limit = limit #None: desconhecido até a primeira resposta
+        self.window = window #duração presumida da janela se faltar X-RateLimit-Reset
+        self._clock = clock
+        self._cond = threading.Condition()
+        self.remaining: Optional[int] = limit
+        self.reset_at: Optional[float] = None
+        self.retry_at = 0.0
+        self.in_flight = 0
+        self._server_reset = 0 #último X-RateLimit-Reset recebido
+
+    def try_acquire(self) -> float:
+        """
+        Reserva uma ficha sem bloquear. Retorna 0.0 se conseguiu, ou quantos
+        segundos esperar antes de tentar de novo.
+        """
+        with self._cond:
+            now = self._clock()
+            if now < self.retry_at:
+                return self.retry_at - now
+            if self.reset_at is not None and now >= self.reset_at:
+                self.remaining, self.reset_at = self.limit, None
+            if self.remaining is None or self.remaining > 0:
+                if self.remaining is not None:
+                    self.remaining -= 1
+                    if self.reset_at is None:
+                        self.reset_at = now + self.window
+                self.in_flight += 1
+                return 0.0
+            return self.reset_at - now
+
+    def acquire(self, timeout: Optional[float] = None) -> None:
+        """Espera uma ficha; levanta TimeoutError se `timeout` segundos passarem antes."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self.try_acquire()
+            if wait <= 0:
+                return
+            if deadline is not None:
+                left = deadline - time.monotonic()
+                if left <= 0:
+                    raise TimeoutError("Limite de requisições do GitHub esgotado.")
+                wait = min(wait, left)
+            with self._cond:
+                #acordado antes do prazo se uma resposta trouxer saldo novo
+                self._cond.wait(wait)
+
+    async def aacquire(self) -> None:
+        """Versão assíncrona de `acquire`, sem bloquear o event loop."""
+        while True:
+            wait = self.try_acquire()
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+    def release(self) -> None:
+        """Devolve a ficha de uma requisição que não recebeu resposta."""
+        with self._cond:
+            self.in_flight = max(0, self.in_flight - 1)
+
+    def update(self, response) -> bool:
+        """
+        Atualiza o saldo com os cabeçalhos da resposta de uma requisição
+        reservada. Retorna True se a resposta foi recusada pelo limite
+        (403/429), caso em que a requisição deve ser refeita.
+        """
+        headers = response.headers
+        with self._cond:
+            self.in_flight = max(0, self.in_flight - 1)
+            now = self._clock()
+            limit = _header_int(headers, "x-ratelimit-limit")
+            remaining = _header_int(headers, "x-ratelimit-remaining")
+            reset = _header_int(headers, "x-ratelimit-reset")
+            if limit is not None:
+                self.limit = limit
+            if remaining is not None:
+                available = max(0, remaining - self.in_flight)
+                if reset is not None and reset > self._server_reset:
+                    #nova janela: o servidor é a referência
+                    self._server_reset = reset
+                    self.remaining, self.reset_at = available, float(reset)
+                elif self.remaining is None:
+                    self.remaining = available
+                    self.reset_at = self.reset_at or now + self.window
+                else:
+                    #respostas antigas podem chegar depois: o saldo nunca volta a subir
+                    self.remaining = min(self.remaining, available)
+            retry_at = _retry_after(headers.get("retry-after"), now)
+            limited = response.status_code in (403, 429) and (retry_at is not None or remaining == 0)
+            if limited and retry_at is None:
+                retry_at = self.reset_at
+            if retry_at is not None:
+                self.retry_at = max(self.retry_at, retry_at)
+            self._cond.notify_all()
+        return limited
+
+    def budget(self) -> dict:
+        """Saldo atual, para monitoramento."""
+        with self._cond:
+            return {
+                "limit": self.limit,
+                "remaining": self.remaining,
+                "reset_at": self.reset_at,
+                "retry_at": self.retry_at,
+                "in_flight": self.in_flight,
+            }
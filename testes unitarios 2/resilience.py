@@ -0,0 +1,205 @@
+import asyncio
+import itertools
+import random
+import threading
+import time
+from collections import deque
+from typing import Awaitable, Callable, Iterator, Optional, Tuple
+import httpx
+
+
+class CircuitOpenError(TimeoutError):
+    """
+    Exceção para chamadas recusadas pelo circuit breaker.
+
+    É um `TimeoutError` para que quem já trata a indisponibilidade do serviço
+    (por exemplo, `GitHubClient.user_exists`) trate também a recusa imediata.
+    """
+
+
+class CircuitBreaker:
+    """
+    Disjuntor que para de chamar um serviço que está falhando.
+
+    Fechado, ele deixa as chamadas passarem e anota o resultado das últimas
+    `window`; quando pelo menos `min_calls` foram anotadas e a proporção de
+    falhas chega a `failure_rate`, ele abre. Aberto, recusa tudo na hora com
+    `CircuitOpenError`. Depois de `reset_timeout` segundos fica meio-aberto e
+    deixa passar uma única chamada de teste: se ela der certo o disjuntor
+    fecha, se falhar ele abre de novo.
+
+    Só o resultado da chamada de teste muda o estado fora do fechado: `allow`
+    entrega a ela um token, que volta em `record_success`/`record_failure`.
+    Resultados sem o token certo (chamadas lentas que começaram antes de o
+    disjuntor abrir) são ignorados enquanto ele está aberto ou meio-aberto.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(
+        self,
+        failure_rate: float = 0.5,
+        min_calls: int = 10,
+        window: int = 20,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._outcomes: deque = deque(maxlen=window) #True para sucesso
+        self.state = self.CLOSED
+        self._opened_at = 0.0
+        self._probe_started: Optional[float] = None
+        self._probe: Optional[int] = None #token da chamada de teste em andamento
+        self._tokens = itertools.count(1)
+
+    def allow(self) -> Optional[int]:
+        """
+        Autoriza uma chamada ou levanta `CircuitOpenError`. Retorna o token da
+        chamada de teste quando meio-aberto, e None nos outros casos.
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+            now = self._clock()
+            if self.state == self.OPEN and now - self._opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+            if self.state == self.HALF_OPEN:
+                #uma chamada de teste por vez; uma que sumiu sem resultado expira
+                if self._probe_started is None or now - self._probe_started >= self.reset_timeout:
+                    self._probe_started = now
+                    self._probe = next(self._tokens)
+                    return self._probe
+            raise CircuitOpenError("Serviço indisponível: chamadas suspensas pelo circuit breaker.")
+
+    def record_success(self, token: Optional[int] = None) -> None:
+        with self._lock:
+            if self.state != self.CLOSED:
+                if token is None or token != self._probe:
+                    return
+                self._close()
+            self._outcomes.append(True)
+
+    def record_failure(self, token: Optional[int] = None) -> None:
+        with self._lock:
+            if self.state != self.CLOSED:
+                if token is not None and token == self._probe:
+                    self._open()
+                return
+            self._outcomes.append(False)
+            failures = self._outcomes.count(False)
+            if len(self._outcomes) >= self.min_calls and failures >= self.failure_rate * len(self._outcomes):
+                self._open()
+
+    def reset(self) -> None:
+        """Volta ao estado fechado, sem histórico."""
+        with self._lock:
+            self._close()
+
+    def _open(self) -> None:
+        self.state = self.OPEN
+        self._opened_at = self._clock()
+        self._probe_started = None
+        self._probe = None
+
+    def _close(self) -> None:
+        self.state = self.CLOSED
+        self._outcomes.clear()
+        self._probe_started = None
+        self._probe = None
+
+
+class RetryPolicy:
+    """
+    Política de novas tentativas com espera exponencial e jitter.
+
+    Falhas de transporte (timeout, conexão recusada...) e respostas com status
+    em `retry_statuses` são tentadas de novo até `attempts` tentativas no
+    total. A espera antes da tentativa n é sorteada entre 0 e
+    `min(max_delay, base_delay * 2**n)` ("full jitter"), para que clientes
+    que falharam juntos não voltem todos ao mesmo tempo.
+    """
+
+    def __init__(
+        self,
+        attempts: int = 3,
+        base_delay: float = 0.1,
+        max_delay: float = 2.0,
+        retry_statuses: Tuple[int, ...] = (502, 503, 504),
+        sleep: Callable[[float], None] = time.sleep,
+        jitter: Callable[[], float] = random.random,
+    ):
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_statuses = retry_statuses
+        self._sleep = sleep
+        self._jitter = jitter
+
+    def delays(self) -> Iterator[float]:
+        """Esperas antes de cada nova tentativa."""
+        for attempt in range(self.attempts - 1):
+            yield self._jitter() * min(self.max_delay, self.base_delay * 2 ** attempt)
+
+    def call(self, send: Callable[[], httpx.Response], breaker: Optional[CircuitBreaker] = None) -> httpx.Response:
+        """
+        Executa `send` com novas tentativas. Retorna a última resposta (mesmo
+        com status de erro) ou levanta o último erro de transporte.
+        """
+        delays = self.delays()
+        while True:
+            token = None if breaker is None else breaker.allow()
+            try:
+                response = send()
+            except httpx.TransportError:
+                delay = self._failed(breaker, token, delays)
+                if delay is None:
+                    raise
+            else:
+                if response.status_code not in self.retry_statuses:
+                    if breaker is not None:
+                        breaker.record_success(token)
+                    return response
+                delay = self._failed(breaker, token, delays)
+                if delay is None:
+                    return response
+            self._sleep(delay)
+
+    async def acall(
+        self,
+        send: Callable[[], Awaitable[httpx.Response]],
+        breaker: Optional[CircuitBreaker] = None,
+    ) -> httpx.Response:
+        """Versão assíncrona de `call`; as esperas não bloqueiam o event loop."""
+        delays = self.delays()
+        while True:
+            token = None if breaker is None else breaker.allow()
+            try:
+                response = await send()
+            except httpx.TransportError:
+                delay = self._failed(breaker, token, delays)
+                if delay is None:
+                    raise
+            else:
+                if response.status_code not in self.retry_statuses:
+                    if breaker is not None:
+                        breaker.record_success(token)
+                    return response
+                delay = self._failed(breaker, token, delays)
+                if delay is None:
+                    return response
+            await asyncio.sleep(delay)
+
+    @staticmethod
+    def _failed(
+        breaker: Optional[CircuitBreaker],
+        token: Optional[int],
+        delays: Iterator[float],
+    ) -> Optional[float]:
+        """Anota a falha e retorna a próxima espera (None: tentativas esgotadas)."""
+        if breaker is not None:
+            breaker.record_failure(token)
+        return next(delays, None)
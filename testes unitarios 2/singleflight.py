@@ -0,0 +1,86 @@
+import asyncio
+import threading
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """
+    Junta chamadas simultâneas com a mesma chave em uma só execução.
+
+    A primeira thread a chamar `do` com uma chave executa a função; as que
+    chegam enquanto ela roda esperam e recebem o mesmo resultado (ou a mesma
+    exceção). Depois que a execução termina, a chave fica livre de novo.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def in_flight(self) -> int:
+        """Quantidade de chaves com execução em andamento."""
+        with self._lock:
+            return len(self._calls)
+
+
+class AsyncSingleFlight:
+    """
+    Versão para asyncio do `SingleFlight`: tarefas com a mesma chave compartilham um await.
+
+    A função roda em uma task própria, que todos os chamadores (inclusive o
+    primeiro) esperam através de `asyncio.shield`: cancelar um deles não
+    cancela a execução nem os demais, e ela termina mesmo se todos desistirem.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        task = self._calls.get(key)
+        if task is None:
+            task = self._calls[key] = asyncio.ensure_future(fn())
+            task.add_done_callback(lambda done: self._release(key, done))
+        return await asyncio.shield(task)
+
+    def _release(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            task.exception() #evita o aviso de exceção não lida quando ninguém esperava
+
+    def in_flight(self) -> int:
+        """Quantidade de chaves com execução em andamento."""
+        return len(self._calls)
@@ -1,5 +1,16 @@
+import asyncio
+import importlib.util
 import httpx
-from typing import Optional
+from typing import Iterable, List, Optional, Tuple
+from cache import MISS, UserCache, normalize_username
+from ipcache import PublicIPCache
+from ratelimit import RateLimiter
+from resilience import CircuitBreaker, RetryPolicy
+from singleflight import AsyncSingleFlight, SingleFlight
+from users import GitHubUser, parse_user
+
+#HTTP/2 só é usado se o pacote opcional `h2` estiver instalado (httpx[http2])
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
 
 
 class GitHubUserNotFound(Exception):
@@ -10,37 +21,182 @@ class InvalidUsername(Exception):
     """Exceção para nome de usuário inválido."""
 
 
+def _user_url(base_url: str, username: str) -> str:
+    if not username or not username.strip():
+        raise InvalidUsername("O username não pode ser vazio.")
+    return f"{base_url}/{username}"
+
+
+def _parse_user(response, username: str) -> GitHubUser:
+    """Converte a resposta da API no registro do usuário (cliente síncrono ou assíncrono)."""
+    if response.status_code == 404:
+        raise GitHubUserNotFound(f"Usuário '{username}' não encontrado.")
+    response.raise_for_status()
+    #decodifica direto dos bytes, só os campos usados (ver users.parse_user)
+    return parse_user(response.content)
+
+
+def _cached_user(cache: UserCache, username: str):
+    """Usuário do cache, `MISS` se for preciso consultar a API; 404 guardado vira exceção."""
+    user = cache.get(username)
+    if user is None:
+        raise GitHubUserNotFound(f"Usuário '{username}' não encontrado.")
+    return user
+
+
+def _conditional_headers(cache: UserCache, username: str) -> Tuple[Optional[tuple], dict]:
+    """
+    Usuário guardado (mesmo vencido) com seus validadores, e os cabeçalhos da
+    requisição condicional que pergunta à API se ele mudou.
+    """
+    stale = cache.stale(username)
+    if stale is None:
+        return None, {}
+    validators = stale[1]
+    headers = {}
+    if "etag" in validators:
+        headers["If-None-Match"] = validators["etag"]
+    if "last-modified" in validators:
+        headers["If-Modified-Since"] = validators["last-modified"]
+    return stale, headers
+
+
+def _store_user(cache: UserCache, response, username: str, stale: Optional[tuple] = None) -> GitHubUser:
+    """
+    Interpreta a resposta e guarda o resultado (usuário ou 404) no cache. Um
+    304 confirma o usuário guardado sem baixar nem decodificar o corpo.
+    """
+    validators = {
+        name: response.headers[name] for name in VALIDATOR_HEADERS if name in response.headers
+    }
+    if response.status_code == 304 and stale is not None:
+        user, stale_validators = stale
+        cache.set(username, user, {**stale_validators, **validators})
+        return user
+    try:
+        user = _parse_user(response, username)
+    except GitHubUserNotFound:
+        cache.set_missing(username)
+        raise
+    cache.set(username, user, validators)
+    return user
+
+
+#Cabeçalhos da resposta guardados para as requisições condicionais
+VALIDATOR_HEADERS = ("etag", "last-modified")
+
+#Erros de uma consulta que `get_users` devolve no lugar do resultado
+LOOKUP_ERRORS = (InvalidUsername, GitHubUserNotFound, TimeoutError, httpx.HTTPError)
+
+
 class GitHubClient:
+    """
+    Cliente da API de usuários do GitHub.
+
+    Mantém um único `httpx.Client` com pool de conexões keep-alive, então
+    consultas seguidas reaproveitam a mesma conexão TCP/TLS em vez de abrir uma
+    nova a cada chamada. Use como gerenciador de contexto (ou chame `close`)
+    para encerrar as conexões.
+
+    As respostas (inclusive 404) ficam em um `UserCache`, então consultas
+    repetidas ao mesmo usuário não vão à rede enquanto a entrada for válida.
+    Depois que ela vence, a consulta é condicional (`If-None-Match` /
+    `If-Modified-Since`): se o usuário não mudou, a API responde 304 sem
+    corpo, que o GitHub não desconta do limite de requisições.
+    Passe `cache=UserCache(max_size=0)` para desligar o cache.
+
+    Toda requisição passa pelo `RateLimiter`, que acompanha o saldo informado
+    pela API e segura as requisições quando ele acaba; respostas recusadas
+    pelo limite (403/429) são refeitas até `rate_limit_retries` vezes.
+
+    Consultas simultâneas ao mesmo usuário (de threads diferentes) viram uma
+    só requisição, e todas recebem o resultado ou a exceção dela.
+
+    Falhas de rede e respostas 502/503/504 são tentadas de novo conforme a
+    `RetryPolicy`; se a proporção de falhas passar do limite do
+    `CircuitBreaker`, as consultas passam a falhar na hora com
+    `CircuitOpenError` (um `TimeoutError`) até o serviço se recuperar.
+    """
+
     BASE_URL = "https://api.github.com/users"
 
-    def __init__(self, timeout: int = 10):
+    def __init__(
+        self,
+        timeout: int = 10,
+        max_connections: int = 10,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+        http2: Optional[bool] = None,
+        transport: Optional[httpx.BaseTransport] = None,
+        cache: Optional[UserCache] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        rate_limit_retries: int = 3,
+        retry: Optional[RetryPolicy] = None,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
         self.timeout = timeout
+        self.http2 = HTTP2_AVAILABLE if http2 is None else http2
+        self.cache = UserCache() if cache is None else cache
+        self.rate_limiter = RateLimiter() if rate_limiter is None else rate_limiter
+        self.rate_limit_retries = rate_limit_retries
+        self.retry = RetryPolicy() if retry is None else retry
+        self.breaker = CircuitBreaker() if breaker is None else breaker
+        self._flight = SingleFlight()
+        self._client = httpx.Client(
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            http2=self.http2,
+            transport=transport, #permite trocar a rede por um transporte de teste
+        )
 
-    def get_user(self, username: str) -> dict:
+    def close(self) -> None:
+        """Fecha as conexões abertas do pool."""
+        self._client.close()
+
+    def __enter__(self) -> "GitHubClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def get_user(self, username: str) -> GitHubUser:
         """
         Consulta a API do GitHub para obter informações de um usuário.
         """
-        if not username or not username.strip():
-            raise InvalidUsername("O username não pode ser vazio.")
+        url = _user_url(self.BASE_URL, username)
+        user = _cached_user(self.cache, username)
+        if user is not MISS:
+            return user
+        return self._flight.do(normalize_username(username), lambda: self._fetch(url, username))
 
-        url = f"{self.BASE_URL}/{username}"
+    def _fetch(self, url: str, username: str) -> GitHubUser:
+        stale, headers = _conditional_headers(self.cache, username)
+        response = self._send(url, headers)
+        return _store_user(self.cache, response, username, stale)
+
+    def _send(self, url: str, headers: dict) -> httpx.Response:
+        """Envia a requisição com novas tentativas e circuit breaker."""
         try:
-            response = httpx.get(url, timeout=self.timeout)
-            if response.status_code == 404:
-                raise GitHubUserNotFound(f"Usuário '{username}' não encontrado.")
-            response.raise_for_status()
+            return self.retry.call(lambda: self._send_limited(url, headers), self.breaker)
         except httpx.TimeoutException:
             raise TimeoutError("A requisição para o GitHub excedeu o tempo limite.")
 
-        data = response.json()
-        return {
-            "login": data.get("login"),
-            "name": data.get("name"),
-            "public_repos": data.get("public_repos", 0),
-            "followers": data.get("followers", 0),
-            "following": data.get("following", 0),
-            "url": data.get("html_url"),
-        }
+    def _send_limited(self, url: str, headers: dict) -> httpx.Response:
+        """Envia a requisição respeitando o limite da API; refaz as recusadas por ele."""
+        for _ in range(self.rate_limit_retries + 1):
+            self.rate_limiter.acquire()
+            try:
+                response = self._client.get(url, headers=headers)
+            except BaseException:
+                self.rate_limiter.release()
+                raise
+            if not self.rate_limiter.update(response):
+                break
+        return response
 
     def user_exists(self, username: str) -> bool:
         """Retorna True se o usuário existir no GitHub."""
@@ -51,14 +207,136 @@ class GitHubClient:
             return False
 
 
+class AsyncGitHubClient:
+    """
+    Versão assíncrona do `GitHubClient`, para consultar muitos usuários de uma vez.
+
+    `get_users` mantém até `concurrency` requisições em andamento ao mesmo
+    tempo, então o tempo total deixa de ser a soma das latências. O pool de
+    conexões tem o mesmo tamanho do limite de concorrência. O cache e o
+    `RateLimiter` funcionam como no `GitHubClient` e podem ser compartilhados
+    entre os dois clientes; consultas simultâneas ao mesmo usuário também
+    são juntadas em uma só requisição.
+
+    O custo de CPU do pool do httpcore cresce com o quadrado do número de
+    conexões; acima de umas 20 por cliente, a vazão cai em vez de subir.
+    """
+
+    BASE_URL = GitHubClient.BASE_URL
+
+    def __init__(
+        self,
+        timeout: int = 10,
+        concurrency: int = 10,
+        keepalive_expiry: float = 30.0,
+        http2: Optional[bool] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        cache: Optional[UserCache] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        rate_limit_retries: int = 3,
+        retry: Optional[RetryPolicy] = None,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        if concurrency < 1:
+            raise ValueError("concurrency deve ser pelo menos 1.")
+        self.timeout = timeout
+        self.concurrency = concurrency
+        self.http2 = HTTP2_AVAILABLE if http2 is None else http2
+        self.cache = UserCache() if cache is None else cache
+        self.rate_limiter = RateLimiter() if rate_limiter is None else rate_limiter
+        self.rate_limit_retries = rate_limit_retries
+        self.retry = RetryPolicy() if retry is None else retry
+        self.breaker = CircuitBreaker() if breaker is None else breaker
+        self._flight = AsyncSingleFlight()
+        self._client = httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=concurrency,
+                max_keepalive_connections=concurrency,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            http2=self.http2,
+            transport=transport,
+        )
+
+    async def aclose(self) -> None:
+        """Fecha as conexões abertas do pool."""
+        await self._client.aclose()
+
+    async def __aenter__(self) -> "AsyncGitHubClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def get_user(self, username: str) -> GitHubUser:
+        """Consulta um usuário; mesmas regras e exceções de `GitHubClient.get_user`."""
+        url = _user_url(self.BASE_URL, username)
+        user = _cached_user(self.cache, username)
+        if user is not MISS:
+            return user
+        key = normalize_username(username)
+        return await self._flight.do(key, lambda: self._fetch(url, username))
+
+    async def _fetch(self, url: str, username: str) -> GitHubUser:
+        stale, headers = _conditional_headers(self.cache, username)
+        response = await self._send(url, headers)
+        return _store_user(self.cache, response, username, stale)
+
+    async def _send(self, url: str, headers: dict) -> httpx.Response:
+        """Envia a requisição com novas tentativas e circuit breaker."""
+        try:
+            return await self.retry.acall(lambda: self._send_limited(url, headers), self.breaker)
+        except httpx.TimeoutException:
+            raise TimeoutError("A requisição para o GitHub excedeu o tempo limite.")
+
+    async def _send_limited(self, url: str, headers: dict) -> httpx.Response:
+        """Envia a requisição respeitando o limite da API; refaz as recusadas por ele."""
+        for _ in range(self.rate_limit_retries + 1):
+            await self.rate_limiter.aacquire()
+            try:
+                response = await self._client.get(url, headers=headers)
+            except BaseException:
+                self.rate_limiter.release()
+                raise
+            if not self.rate_limiter.update(response):
+                break
+        return response
+
+    async def get_users(self, usernames: Iterable[str]) -> List[GitHubUser | Exception]:
+        """
+        Consulta vários usuários com no máximo `concurrency` requisições simultâneas.
+
+        Retorna uma lista na mesma ordem de `usernames`; cada posição traz o
+        `GitHubUser` ou a exceção da consulta (`GitHubUserNotFound`,
+        `TimeoutError`, `InvalidUsername` ou erro HTTP). Outras exceções
+        cancelam o lote e são propagadas.
+        """
+        pending = enumerate(usernames) #consumido aos poucos pelos workers
+        results: dict = {}
+
+        async def worker() -> None:
+            for index, username in pending:
+                try:
+                    results[index] = await self.get_user(username)
+                except LOOKUP_ERRORS as exc:
+                    results[index] = exc
+
+        async with asyncio.TaskGroup() as group:
+            for _ in range(self.concurrency):
+                group.create_task(worker())
+        return [results[index] for index in range(len(results))]
+
+
 class NetworkUtils:
+    #Compartilhado por todas as chamadas de `get_ip`
+    ip_cache = PublicIPCache()
+
     @staticmethod
     def get_ip(timeout: int = 5) -> str:
-        """Retorna o IP público usando a API ipify"""
-        url = "https://api.ipify.org?format=json"
-        try:
-            resp = httpx.get(url, timeout=timeout)
-            resp.raise_for_status()
-        except httpx.TimeoutException:
-            raise TimeoutError("Timeout ao consultar IP público.")
-        return resp.json().get("ip", "")
+        """
+        Retorna o IP público. Só a primeira chamada espera a rede (consultando
+        vários serviços em paralelo); as seguintes retornam o IP guardado, que
+        é atualizado em segundo plano (ver `PublicIPCache`).
+        """
+        return NetworkUtils.ip_cache.get(timeout)
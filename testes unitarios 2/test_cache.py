@@ -0,0 +1,125 @@
+import httpx
+import pytest
+from cache import MISS, ShelveCacheBackend, UserCache
+from system import GitHubClient, GitHubUserNotFound
+from users import GitHubUser
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def test_get_returns_stored_record_and_counts_hits(clock):
+    cache = UserCache(clock=clock)
+    assert cache.get("octocat") is MISS
+    user = GitHubUser("octocat")
+    cache.set("octocat", user)
+    assert cache.get("octocat") is user #registro imutável: sem cópias
+    assert cache.get("octocat") is user
+    assert cache.stats() == {"hits": 2, "misses": 1, "size": 1}
+
+
+def test_username_is_normalized(clock):
+    cache = UserCache(clock=clock)
+    cache.set("OctoCat", GitHubUser("octocat"))
+    assert cache.get(" octocat ") == GitHubUser("octocat")
+
+
+def test_ttl_and_negative_ttl(clock):
+    cache = UserCache(ttl=60, negative_ttl=10, clock=clock)
+    cache.set("a", GitHubUser("a"))
+    cache.set_missing("ghost")
+    assert cache.get("ghost") is None
+    clock.now += 10
+    assert cache.get("ghost") is MISS
+    assert cache.get("a") == GitHubUser("a")
+    clock.now += 50
+    assert cache.get("a") is MISS
+    assert len(cache) == 0
+
+
+def test_stale_entry_kept_for_revalidation(clock):
+    cache = UserCache(ttl=60, clock=clock)
+    cache.set("a", GitHubUser("a"), {"etag": '"v1"'})
+    cache.set("b", GitHubUser("b"))
+    clock.now += 61
+    assert cache.get("a") is MISS
+    assert cache.stale("a") == (GitHubUser("a"), {"etag": '"v1"'})
+    assert cache.stale("b") is None
+    assert len(cache) == 1
+
+
+def test_lru_eviction(clock):
+    cache = UserCache(max_size=2, clock=clock)
+    cache.set("a", GitHubUser("a"))
+    cache.set("b", GitHubUser("b"))
+    cache.get("a") #"b" passa a ser a menos usada
+    cache.set("c", GitHubUser("c"))
+    assert cache.get("b") is MISS
+    assert cache.get("a") is not MISS and cache.get("c") is not MISS
+
+
+def test_disabled_cache(clock):
+    cache = UserCache(max_size=0, clock=clock)
+    cache.set("a", GitHubUser("a"))
+    assert cache.get("a") is MISS
+
+
+def test_shelve_backend_survives_restart(tmp_path, clock):
+    path = str(tmp_path / "users")
+    backend = ShelveCacheBackend(path)
+    cache = UserCache(backend=backend, clock=clock)
+    cache.set("octocat", GitHubUser("octocat"))
+    cache.set_missing("ghost")
+    backend.close()
+
+    backend = ShelveCacheBackend(path)
+    cache = UserCache(backend=backend, clock=clock)
+    assert cache.get("octocat") == GitHubUser("octocat")
+    assert cache.get("ghost") is None
+    clock.now += 3600
+    cache.clear()
+    assert cache.get("octocat") is MISS
+    assert backend.load("octocat") is None #entrada vencida é apagada do disco
+    backend.close()
+
+
+def counting_transport(calls: list):
+    def handler(request):
+        username = request.url.path.rsplit("/", 1)[-1]
+        calls.append(username)
+        if username == "ghost":
+            return httpx.Response(404, json={})
+        return httpx.Response(200, json={"login": username})
+    return httpx.MockTransport(handler)
+
+
+def test_client_repeated_lookups_skip_network():
+    calls = []
+    with GitHubClient(transport=counting_transport(calls), http2=False) as client:
+        assert client.get_user("octocat")["login"] == "octocat"
+        assert client.get_user("OCTOCAT")["login"] == "octocat"
+        assert client.user_exists("octocat") is True
+        assert client.user_exists("ghost") is False
+        with pytest.raises(GitHubUserNotFound):
+            client.get_user("ghost")
+    assert calls == ["octocat", "ghost"]
+    assert client.cache.stats()["hits"] == 3
+
+
+def test_client_without_cache():
+    calls = []
+    client = GitHubClient(transport=counting_transport(calls), http2=False, cache=UserCache(max_size=0))
+    client.get_user("octocat")
+    client.get_user("octocat")
+    client.close()
+    assert calls == ["octocat", "octocat"]
@@ -0,0 +1,145 @@
+import threading
+import time
+import httpx
+import pytest
+from ipcache import PublicIPCache
+from resilience import RetryPolicy
+
+PROVIDERS = ("https://a.test/ip", "https://b.test/ip", "https://c.test/ip")
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def ip_response(ip: str) -> httpx.Response:
+    return httpx.Response(200, json={"ip": ip}, request=httpx.Request("GET", "https://a.test/ip"))
+
+
+def make_cache(clock=None, **kwargs) -> PublicIPCache:
+    return PublicIPCache(PROVIDERS, retry=RetryPolicy(attempts=1), clock=clock or FakeClock(), **kwargs)
+
+
+def serve(monkeypatch, replies: dict) -> list:
+    """Cada serviço responde com o IP (ou exceção, ou função) de `replies`; retorna as URLs chamadas."""
+    calls = []
+
+    def mock_get(url, *a, **kw):
+        calls.append(url)
+        reply = replies.get(url, httpx.ConnectError("fora do ar"))
+        if callable(reply) and not isinstance(reply, Exception):
+            reply = reply()
+        if isinstance(reply, Exception):
+            raise reply
+        return ip_response(reply)
+    monkeypatch.setattr(httpx, "get", mock_get)
+    return calls
+
+
+def test_first_call_asks_all_providers_then_uses_cached_ip(monkeypatch):
+    calls = serve(monkeypatch, {url: "1.2.3.4" for url in PROVIDERS})
+    cache = make_cache()
+    assert cache.get() == "1.2.3.4"
+    time.sleep(0.05) #deixa as consultas paralelas que perderam terminarem
+    assert sorted(calls) == sorted(PROVIDERS)
+    for _ in range(100):
+        assert cache.get() == "1.2.3.4"
+    assert len(calls) == 3 #as chamadas seguintes não foram à rede
+
+
+def test_failover_takes_first_working_provider(monkeypatch):
+    serve(monkeypatch, {PROVIDERS[2]: "5.6.7.8"})
+    assert make_cache().get() == "5.6.7.8"
+
+
+def test_slow_provider_does_not_delay_answer(monkeypatch):
+    release = threading.Event()
+
+    def slow():
+        release.wait(5)
+        return "9.9.9.9"
+    serve(monkeypatch, {PROVIDERS[0]: slow, PROVIDERS[1]: "1.1.1.1"})
+    start = time.perf_counter()
+    try:
+        assert make_cache().get() == "1.1.1.1"
+        assert time.perf_counter() - start < 1
+    finally:
+        release.set()
+
+
+def test_all_providers_failing_raises_preferred_error(monkeypatch):
+    serve(monkeypatch, {
+        PROVIDERS[0]: httpx.ReadTimeout("timeout"),
+        PROVIDERS[1]: httpx.ConnectError("c"),
+        PROVIDERS[2]: httpx.ConnectError("c"),
+    })
+    with pytest.raises(TimeoutError):
+        make_cache().get()
+
+
+def test_stale_ip_is_returned_while_refreshing_in_background(monkeypatch):
+    clock = FakeClock()
+    serve(monkeypatch, {url: "1.2.3.4" for url in PROVIDERS})
+    cache = make_cache(clock, refresh_interval=60)
+    assert cache.get() == "1.2.3.4"
+    time.sleep(0.05)
+
+    release = threading.Event()
+
+    def slow():
+        release.wait(5)
+        return "4.3.2.1"
+    calls = serve(monkeypatch, {url: slow for url in PROVIDERS})
+    clock.now = 61
+    assert cache.get() == "1.2.3.4" #retorna na hora o valor antigo
+    assert cache.get() == "1.2.3.4"
+    release.set()
+    deadline = time.monotonic() + 5
+    while cache.get() != "4.3.2.1" and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert cache.get() == "4.3.2.1"
+    assert len(calls) == 3 #uma só atualização em segundo plano
+
+
+@pytest.mark.parametrize("replies", [{}, {url: "" for url in PROVIDERS}], ids=["erro", "sem-ip"])
+def test_failed_refresh_keeps_ip_and_waits_retry_interval(monkeypatch, replies):
+    clock = FakeClock()
+    serve(monkeypatch, {url: "1.2.3.4" for url in PROVIDERS})
+    cache = make_cache(clock, refresh_interval=60, retry_interval=10)
+    cache.get()
+    time.sleep(0.05)
+
+    calls = serve(monkeypatch, replies)
+    clock.now = 61
+    assert cache.get() == "1.2.3.4"
+    deadline = time.monotonic() + 5
+    while cache._refreshing and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert len(calls) == 3
+    assert cache.get() == "1.2.3.4" #antes de retry_interval, nenhuma nova tentativa
+    time.sleep(0.05)
+    assert len(calls) == 3
+
+
+def test_concurrent_first_calls_share_one_lookup(monkeypatch):
+    release = threading.Event()
+
+    def slow():
+        release.wait(5)
+        return "1.2.3.4"
+    calls = serve(monkeypatch, {url: slow for url in PROVIDERS})
+    cache = make_cache()
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get())) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert results == ["1.2.3.4"] * 10
+    assert len(calls) == 3
@@ -0,0 +1,157 @@
+import asyncio
+import json
+import threading
+import time
+import httpx
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from cache import UserCache
+from ratelimit import RateLimiter
+from system import AsyncGitHubClient, GitHubClient
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def response(status=200, **headers):
+    return httpx.Response(status, headers={name.replace("_", "-"): str(v) for name, v in headers.items()})
+
+
+def test_unknown_budget_does_not_block():
+    limiter = RateLimiter(clock=FakeClock())
+    assert all(limiter.try_acquire() == 0.0 for _ in range(100))
+    assert limiter.budget()["remaining"] is None
+    assert limiter.budget()["in_flight"] == 100
+
+
+def test_budget_from_headers_and_reset():
+    clock = FakeClock()
+    limiter = RateLimiter(clock=clock)
+    assert limiter.try_acquire() == 0.0
+    limiter.update(response(x_ratelimit_limit=5, x_ratelimit_remaining=2, x_ratelimit_reset=1010))
+    assert limiter.budget() == {"limit": 5, "remaining": 2, "reset_at": 1010.0, "retry_at": 0.0, "in_flight": 0}
+    assert limiter.try_acquire() == 0.0
+    assert limiter.try_acquire() == 0.0
+    assert limiter.try_acquire() == 10.0 #sem saldo: espera o fim da janela
+    clock.now = 1010
+    assert limiter.try_acquire() == 0.0
+    assert limiter.budget()["remaining"] == 4
+
+
+def test_in_flight_requests_are_discounted():
+    clock = FakeClock()
+    limiter = RateLimiter(clock=clock)
+    for _ in range(3):
+        limiter.try_acquire()
+    limiter.update(response(x_ratelimit_remaining=5, x_ratelimit_reset=1010))
+    assert limiter.budget()["remaining"] == 3 #2 requisições ainda vão consumir saldo
+    limiter.update(response(x_ratelimit_remaining=9, x_ratelimit_reset=1010)) #resposta atrasada
+    assert limiter.budget()["remaining"] == 3
+
+
+def test_retry_after_blocks_everyone():
+    clock = FakeClock()
+    limiter = RateLimiter(clock=clock)
+    limiter.try_acquire()
+    assert limiter.update(response(429, retry_after=30)) is True
+    assert limiter.try_acquire() == 30.0
+    clock.now += 30
+    assert limiter.try_acquire() == 0.0
+
+
+def test_forbidden_without_quota_waits_for_reset():
+    clock = FakeClock()
+    limiter = RateLimiter(clock=clock)
+    limiter.try_acquire()
+    assert limiter.update(response(403, x_ratelimit_remaining=0, x_ratelimit_reset=1060)) is True
+    assert limiter.try_acquire() == 60.0
+    assert limiter.update(response(403)) is False #403 comum não é limite
+
+
+def test_acquire_timeout():
+    limiter = RateLimiter()
+    limiter.try_acquire()
+    limiter.update(response(x_ratelimit_remaining=0, x_ratelimit_reset=int(time.time()) + 60))
+    with pytest.raises(TimeoutError):
+        limiter.acquire(timeout=0.05)
+
+
+def test_client_retries_rate_limited_response():
+    replies = iter([httpx.Response(429, headers={"Retry-After": "0"}), httpx.Response(200, json={"login": "x"})])
+    transport = httpx.MockTransport(lambda request: next(replies))
+    with GitHubClient(transport=transport, http2=False) as client:
+        assert client.get_user("x")["login"] == "x"
+
+
+def test_async_client_shares_limiter_and_retries():
+    limiter = RateLimiter()
+    replies = iter([httpx.Response(429, headers={"Retry-After": "0"}), httpx.Response(200, json={"login": "x"})])
+
+    async def run():
+        transport = httpx.MockTransport(lambda request: next(replies))
+        async with AsyncGitHubClient(transport=transport, http2=False, rate_limiter=limiter) as client:
+            return await client.get_user("x")
+
+    assert asyncio.run(run())["login"] == "x"
+    assert limiter.budget()["in_flight"] == 0
+
+
+@pytest.fixture
+def rate_limited_server():
+    """API falsa com 3 requisições por janela de cerca de 1 segundo."""
+    state = {"remaining": 3, "reset": int(time.time()) + 1, "served": 0, "rejected": 0}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            with lock:
+                now = time.time()
+                if now >= state["reset"]:
+                    state["remaining"], state["reset"] = 3, int(now) + 1
+                if state["remaining"] == 0:
+                    state["rejected"] += 1
+                    status = 403
+                else:
+                    state["remaining"] -= 1
+                    state["served"] += 1
+                    status = 200
+                headers = {
+                    "X-RateLimit-Limit": "3",
+                    "X-RateLimit-Remaining": str(state["remaining"]),
+                    "X-RateLimit-Reset": str(state["reset"]),
+                }
+            body = json.dumps({"login": self.path.rsplit("/", 1)[-1]}).encode()
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/users", state
+    server.shutdown()
+    server.server_close()
+
+
+def test_client_paces_requests_within_quota(rate_limited_server):
+    base_url, state = rate_limited_server
+    with GitHubClient(cache=UserCache(max_size=0)) as client:
+        client.BASE_URL = base_url
+        logins = [client.get_user(f"user{i}")["login"] for i in range(5)]
+        budget = client.rate_limiter.budget()
+    assert logins == [f"user{i}" for i in range(5)]
+    assert state["served"] == 5
+    assert state["rejected"] == 0 #o cliente esperou a janela em vez de levar 403
+    assert budget["limit"] == 3
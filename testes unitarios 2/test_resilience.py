@@ -0,0 +1,155 @@
+import httpx
+import pytest
+from resilience import CircuitBreaker, CircuitOpenError, RetryPolicy
+from system import GitHubClient, NetworkUtils
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def quick_policy(sleeps: list, attempts: int = 3) -> RetryPolicy:
+    return RetryPolicy(attempts=attempts, sleep=sleeps.append, jitter=lambda: 1.0)
+
+
+def test_delays_grow_exponentially_up_to_max():
+    policy = RetryPolicy(attempts=6, base_delay=0.1, max_delay=0.5, jitter=lambda: 1.0)
+    assert list(policy.delays()) == [0.1, 0.2, 0.4, 0.5, 0.5]
+    policy = RetryPolicy(attempts=3, jitter=lambda: 0.5)
+    assert list(policy.delays()) == [0.05, 0.1]
+
+
+def test_call_retries_transport_errors():
+    sleeps, replies = [], iter([httpx.ConnectTimeout("t"), httpx.ConnectError("c"), httpx.Response(200)])
+
+    def send():
+        reply = next(replies)
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+    assert quick_policy(sleeps).call(send).status_code == 200
+    assert sleeps == [0.1, 0.2]
+
+
+def test_call_gives_up_after_attempts():
+    sleeps, calls = [], []
+
+    def send():
+        calls.append(1)
+        raise httpx.ReadTimeout("t")
+
+    with pytest.raises(httpx.ReadTimeout):
+        quick_policy(sleeps).call(send)
+    assert len(calls) == 3 and len(sleeps) == 2
+
+
+def test_call_retries_unavailable_status_and_returns_last():
+    sleeps = []
+    statuses = iter([503, 502, 504])
+    response = quick_policy(sleeps).call(lambda: httpx.Response(next(statuses)))
+    assert response.status_code == 504
+    assert quick_policy([]).call(lambda: httpx.Response(500)).status_code == 500 #500 não é repetido
+
+
+def test_breaker_opens_on_failure_rate_and_probes_half_open():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_rate=0.5, min_calls=4, window=4, reset_timeout=10, clock=clock)
+    for record in (breaker.record_success, breaker.record_failure, breaker.record_success):
+        breaker.allow()
+        record()
+    assert breaker.state == "closed"
+    breaker.record_failure() #2 falhas em 4 chamadas
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.allow()
+
+    clock.now = 10
+    probe = breaker.allow() #chamada de teste
+    assert breaker.state == "half_open" and probe is not None
+    with pytest.raises(CircuitOpenError):
+        breaker.allow() #só uma de cada vez
+    breaker.record_failure(probe)
+    assert breaker.state == "open"
+
+    clock.now = 20
+    breaker.record_success(breaker.allow())
+    assert breaker.state == "closed"
+    assert breaker.allow() is None
+
+
+def test_breaker_ignores_results_of_calls_other_than_the_probe():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_rate=0.5, min_calls=2, window=2, reset_timeout=10, clock=clock)
+    breaker.allow()
+    breaker.allow() #chamada lenta que começou antes de o disjuntor abrir
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    breaker.record_success() #a chamada lenta termina: não fecha o disjuntor
+    assert breaker.state == "open"
+
+    clock.now = 10
+    probe = breaker.allow()
+    breaker.record_failure() #falha atrasada de outra chamada: não reabre
+    assert breaker.state == "half_open"
+    breaker.record_success(probe)
+    assert breaker.state == "closed"
+
+
+def test_client_retries_timeouts():
+    replies = iter([httpx.ReadTimeout("t"), httpx.Response(200, json={"login": "x"})])
+
+    def handler(request):
+        reply = next(replies)
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+    client = GitHubClient(transport=httpx.MockTransport(handler), http2=False, retry=quick_policy([]))
+    assert client.get_user("x")["login"] == "x"
+    assert client.rate_limiter.budget()["in_flight"] == 0
+    client.close()
+
+
+def test_client_fails_fast_when_circuit_is_open():
+    calls = []
+
+    def handler(request):
+        calls.append(1)
+        raise httpx.ConnectTimeout("t")
+
+    breaker = CircuitBreaker(min_calls=2, window=2, reset_timeout=60)
+    with GitHubClient(
+        transport=httpx.MockTransport(handler), http2=False, retry=quick_policy([], attempts=2), breaker=breaker
+    ) as client:
+        with pytest.raises(TimeoutError):
+            client.get_user("a")
+        assert breaker.state == "open"
+        with pytest.raises(CircuitOpenError):
+            client.get_user("b")
+        assert client.user_exists("c") is False
+    assert len(calls) == 2 #as consultas seguintes não foram à rede
+
+
+def test_get_ip_retries_timeout(monkeypatch):
+    ok = httpx.Response(200, json={"ip": "10.0.0.1"}, request=httpx.Request("GET", "https://api.ipify.org"))
+    replies = iter([httpx.ConnectTimeout("t"), ok])
+
+    def mock_get(url, *a, **kw):
+        if "ipify" not in url: #só o serviço preferido responde
+            raise httpx.ConnectError("c")
+        reply = next(replies)
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+    monkeypatch.setattr(httpx, "get", mock_get)
+    monkeypatch.setattr(NetworkUtils.ip_cache, "retry", quick_policy([]))
+    NetworkUtils.ip_cache.clear()
+    assert NetworkUtils.get_ip() == "10.0.0.1"
+    NetworkUtils.ip_cache.clear()
@@ -0,0 +1,138 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import httpx
+import pytest
+from singleflight import AsyncSingleFlight, SingleFlight
+from system import AsyncGitHubClient, GitHubClient, GitHubUserNotFound
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    calls = []
+    release = threading.Event()
+
+    def slow():
+        calls.append(1)
+        release.wait(5)
+        return {"login": "octocat"}
+
+    with ThreadPoolExecutor(max_workers=10) as pool:
+        futures = [pool.submit(flight.do, "octocat", slow) for _ in range(10)]
+        while flight.in_flight() == 0:
+            time.sleep(0.001)
+        time.sleep(0.05) #deixa as outras threads chegarem à espera
+        release.set()
+        results = [f.result() for f in futures]
+    assert len(calls) == 1
+    assert all(r == {"login": "octocat"} for r in results)
+    assert flight.in_flight() == 0
+
+
+def test_exception_is_shared_and_key_is_released():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def failing():
+        release.wait(5)
+        raise GitHubUserNotFound("ghost")
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(flight.do, "ghost", failing) for _ in range(4)]
+        time.sleep(0.05)
+        release.set()
+        for future in futures:
+            with pytest.raises(GitHubUserNotFound):
+                future.result()
+    assert flight.do("ghost", lambda: "depois") == "depois"
+
+
+def test_async_calls_share_one_execution():
+    calls = []
+
+    async def run():
+        flight = AsyncSingleFlight()
+
+        async def slow():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "ok"
+
+        results = await asyncio.gather(*(flight.do("k", slow) for _ in range(10)))
+        return results, flight.in_flight()
+
+    results, in_flight = asyncio.run(run())
+    assert results == ["ok"] * 10
+    assert len(calls) == 1 and in_flight == 0
+
+
+def test_async_exception_is_shared():
+    async def run():
+        flight = AsyncSingleFlight()
+
+        async def failing():
+            await asyncio.sleep(0.01)
+            raise TimeoutError("timeout")
+
+        return await asyncio.gather(*(flight.do("k", failing) for _ in range(3)), return_exceptions=True)
+
+    assert all(isinstance(r, TimeoutError) for r in asyncio.run(run()))
+
+
+def test_async_cancelling_leader_does_not_cancel_followers():
+    async def run():
+        flight = AsyncSingleFlight()
+
+        async def slow():
+            await asyncio.sleep(0.02)
+            return "ok"
+
+        leader = asyncio.create_task(flight.do("k", slow))
+        await asyncio.sleep(0)
+        followers = [asyncio.create_task(flight.do("k", slow)) for _ in range(3)]
+        await asyncio.sleep(0)
+        leader.cancel()
+        results = await asyncio.gather(*followers)
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return results, flight.in_flight()
+
+    results, in_flight = asyncio.run(run())
+    assert results == ["ok"] * 3 and in_flight == 0
+
+
+def test_client_coalesces_concurrent_lookups():
+    requests = []
+    release = threading.Event()
+
+    def handler(request):
+        requests.append(request.url.path)
+        release.wait(5)
+        return httpx.Response(200, json={"login": "octocat"})
+
+    with GitHubClient(transport=httpx.MockTransport(handler), http2=False) as client:
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            futures = [pool.submit(client.get_user, "octocat") for _ in range(8)]
+            time.sleep(0.05)
+            release.set()
+            users = [f.result() for f in futures]
+    assert requests == ["/users/octocat"]
+    assert all(user["login"] == "octocat" for user in users)
+    assert all(user is users[0] for user in users) #registro imutável, compartilhado sem cópias
+
+
+def test_async_client_coalesces_concurrent_lookups():
+    requests = []
+
+    async def handler(request):
+        requests.append(request.url.path)
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json={"login": "octocat"})
+
+    async def run():
+        async with AsyncGitHubClient(transport=httpx.MockTransport(handler), http2=False) as client:
+            return await client.get_users(["octocat", "OctoCat", "octocat"])
+
+    assert [user["login"] for user in asyncio.run(run())] == ["octocat"] * 3
+    assert requests == ["/users/octocat"]
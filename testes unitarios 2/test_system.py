@@ -1,15 +1,29 @@
+import asyncio
+import json
+import threading
 import pytest
 import httpx
-from system import GitHubClient, NetworkUtils, GitHubUserNotFound, InvalidUsername
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from cache import UserCache
+from system import AsyncGitHubClient, GitHubClient, NetworkUtils, GitHubUserNotFound, InvalidUsername
+
+
+@pytest.fixture(autouse=True)
+def reset_ip_cache():
+    """O IP do get_ip é guardado entre chamadas: cada teste começa sem IP e com os breakers fechados."""
+    NetworkUtils.ip_cache.clear()
+    yield
+    NetworkUtils.ip_cache.clear()
 
 def test_get_user_success(monkeypatch):
     def mock_get(*args, **kwargs):
         class MockResponse:
             status_code = 200
-            def json(self): return {"login": "octocat", "name": "The Octo", "public_repos": 5, "followers": 10, "following": 1, "html_url": "http://github.com/octocat"}
+            headers = {}
+            content = json.dumps({"login": "octocat", "name": "The Octo", "public_repos": 5, "followers": 10, "following": 1, "html_url": "http://github.com/octocat"}).encode()
             def raise_for_status(self): pass
         return MockResponse()
-    monkeypatch.setattr(httpx, "get", mock_get)
+    monkeypatch.setattr(httpx.Client, "get", mock_get)
 
     client = GitHubClient()
     user = client.get_user("octocat")
@@ -20,10 +34,11 @@ def test_user_exists_true(monkeypatch):
     def mock_get(*a, **kw):
         class MockResp:
             status_code = 200
-            def json(self): return {"login": "x"}
+            headers = {}
+            content = json.dumps({"login": "x"}).encode()
             def raise_for_status(self): pass
         return MockResp()
-    monkeypatch.setattr(httpx, "get", mock_get)
+    monkeypatch.setattr(httpx.Client, "get", mock_get)
     assert GitHubClient().user_exists("x") is True
 
 
@@ -31,10 +46,11 @@ def test_public_repos_default(monkeypatch):
     def mock_get(*a, **kw):
         class MockResp:
             status_code = 200
-            def json(self): return {"login": "x"}  # sem public_repos
+            headers = {}
+            content = json.dumps({"login": "x"}).encode()  # sem public_repos
             def raise_for_status(self): pass
         return MockResp()
-    monkeypatch.setattr(httpx, "get", mock_get)
+    monkeypatch.setattr(httpx.Client, "get", mock_get)
     user = GitHubClient().get_user("x")
     assert user["public_repos"] == 0
 
@@ -43,10 +59,11 @@ def test_followers_following_default(monkeypatch):
     def mock_get(*a, **kw):
         class MockResp:
             status_code = 200
-            def json(self): return {"login": "x"}  # sem followers/following
+            headers = {}
+            content = json.dumps({"login": "x"}).encode()  # sem followers/following
             def raise_for_status(self): pass
         return MockResp()
-    monkeypatch.setattr(httpx, "get", mock_get)
+    monkeypatch.setattr(httpx.Client, "get", mock_get)
     user = GitHubClient().get_user("x")
     assert user["followers"] == 0 and user["following"] == 0
 
@@ -67,10 +84,11 @@ def test_user_with_name(monkeypatch):
     def mock_get(*a, **kw):
         class MockResp:
             status_code = 200
-            def json(self): return {"login": "abc", "name": "John Doe"}
+            headers = {}
+            content = json.dumps({"login": "abc", "name": "John Doe"}).encode()
             def raise_for_status(self): pass
         return MockResp()
-    monkeypatch.setattr(httpx, "get", mock_get)
+    monkeypatch.setattr(httpx.Client, "get", mock_get)
     user = GitHubClient().get_user("abc")
     assert user["name"] == "John Doe"
 
@@ -79,10 +97,11 @@ def test_user_exists_false(monkeypatch):
     def mock_get(*a, **kw):
         class MockResp:
             status_code = 404
-            def json(self): return {}
+            headers = {}
+            content = json.dumps({}).encode()
             def raise_for_status(self): pass
         return MockResp()
-    monkeypatch.setattr(httpx, "get", mock_get)
+    monkeypatch.setattr(httpx.Client, "get", mock_get)
     assert GitHubClient().user_exists("nope") is False
 
 
@@ -90,10 +109,11 @@ def test_get_user_returns_url(monkeypatch):
     def mock_get(*a, **kw):
         class MockResp:
             status_code = 200
-            def json(self): return {"login": "abc", "html_url": "http://github.com/abc"}
+            headers = {}
+            content = json.dumps({"login": "abc", "html_url": "http://github.com/abc"}).encode()
             def raise_for_status(self): pass
         return MockResp()
-    monkeypatch.setattr(httpx, "get", mock_get)
+    monkeypatch.setattr(httpx.Client, "get", mock_get)
     user = GitHubClient().get_user("abc")
     assert user["url"] == "http://github.com/abc"
 
@@ -114,10 +134,11 @@ def test_user_case_insensitive(monkeypatch):
     def mock_get(*a, **kw):
         class MockResp:
             status_code = 200
-            def json(self): return {"login": "OCTOCAT"}
+            headers = {}
+            content = json.dumps({"login": "OCTOCAT"}).encode()
             def raise_for_status(self): pass
         return MockResp()
-    monkeypatch.setattr(httpx, "get", mock_get)
+    monkeypatch.setattr(httpx.Client, "get", mock_get)
     user = GitHubClient().get_user("octocat")
     assert user["login"].upper() == "OCTOCAT"
 
@@ -139,17 +160,18 @@ def test_user_not_found(monkeypatch):
     def mock_get(*a, **kw):
         class MockResp:
             status_code = 404
-            def json(self): return {}
+            headers = {}
+            content = json.dumps({}).encode()
             def raise_for_status(self): pass
         return MockResp()
-    monkeypatch.setattr(httpx, "get", mock_get)
+    monkeypatch.setattr(httpx.Client, "get", mock_get)
     with pytest.raises(GitHubUserNotFound):
         GitHubClient().get_user("ghostuser")
 
 
 def test_github_timeout(monkeypatch):
     def mock_get(*a, **kw): raise httpx.TimeoutException("timeout")
-    monkeypatch.setattr(httpx, "get", mock_get)
+    monkeypatch.setattr(httpx.Client, "get", mock_get)
     with pytest.raises(TimeoutError):
         GitHubClient().get_user("octocat")
 
@@ -165,10 +187,11 @@ def test_http_error(monkeypatch):
     def mock_get(*a, **kw):
         class MockResp:
             status_code = 500
-            def json(self): return {}
+            headers = {}
+            content = json.dumps({}).encode()
             def raise_for_status(self): raise httpx.HTTPStatusError("Erro", request=None, response=None)
         return MockResp()
-    monkeypatch.setattr(httpx, "get", mock_get)
+    monkeypatch.setattr(httpx.Client, "get", mock_get)
     with pytest.raises(httpx.HTTPStatusError):
         GitHubClient().get_user("octocat")
 
@@ -189,10 +212,11 @@ def test_get_user_invalid_json(monkeypatch):
     def mock_get(*a, **kw):
         class MockResp:
             status_code = 200
-            def json(self): raise ValueError("Invalid JSON")
+            headers = {}
+            content = b"{json invalido"
             def raise_for_status(self): pass
         return MockResp()
-    monkeypatch.setattr(httpx, "get", mock_get)
+    monkeypatch.setattr(httpx.Client, "get", mock_get)
     with pytest.raises(ValueError):
         GitHubClient().get_user("octocat")
 
@@ -211,6 +235,144 @@ def test_ip_invalid_json(monkeypatch):
 
 def test_user_exists_with_timeout(monkeypatch):
     def mock_get(*a, **kw): raise httpx.TimeoutException("timeout")
-    monkeypatch.setattr(httpx, "get", mock_get)
+    monkeypatch.setattr(httpx.Client, "get", mock_get)
     result = GitHubClient().user_exists("octocat")
     assert result is False
+
+
+# ---------- POOL DE CONEXÕES ----------
+@pytest.fixture
+def stub_server():
+    """Servidor HTTP/1.1 local que responde como a API e anota a porta de cada cliente."""
+    peers = []
+
+    class Handler(BaseHTTPRequestHandler):
+        disable_nagle_algorithm = True #cabeçalho e corpo saem sem esperar ACK
+        protocol_version = "HTTP/1.1" #mantém a conexão aberta entre requisições
+
+        def do_GET(self):
+            peers.append(self.client_address)
+            body = json.dumps({"login": self.path.rsplit("/", 1)[-1]}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/users", peers
+    server.shutdown()
+    server.server_close()
+
+
+def test_get_user_reuses_connection(stub_server):
+    base_url, peers = stub_server
+    with GitHubClient() as client:
+        client.BASE_URL = base_url
+        logins = [client.get_user(f"user{i}")["login"] for i in range(5)]
+    assert logins == [f"user{i}" for i in range(5)]
+    assert len(peers) == 5
+    assert len(set(peers)) == 1 #todas as consultas pela mesma conexão
+
+
+def test_client_context_manager_closes_pool():
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, json={"login": "x"}))
+    with GitHubClient(transport=transport, http2=False) as client:
+        assert client.get_user("x")["login"] == "x"
+    assert client._client.is_closed
+
+
+# ---------- CONSULTA EM LOTE (ASSÍNCRONA) ----------
+def fake_api_transport(in_flight: list):
+    """Transporte que simula a API com latência e mede as requisições simultâneas."""
+    async def handler(request):
+        username = request.url.path.rsplit("/", 1)[-1]
+        in_flight[0] += 1
+        in_flight[1] = max(in_flight[1], in_flight[0])
+        await asyncio.sleep(0.01)
+        in_flight[0] -= 1
+        if username.startswith("ghost"):
+            return httpx.Response(404, json={})
+        if username == "slow":
+            raise httpx.ReadTimeout("timeout", request=request)
+        return httpx.Response(200, json={"login": username})
+    return httpx.MockTransport(handler)
+
+
+def test_get_users_keeps_order_and_errors():
+    async def run():
+        in_flight = [0, 0]
+        async with AsyncGitHubClient(transport=fake_api_transport(in_flight), http2=False) as client:
+            return await client.get_users(["a", "ghost", "b", "slow", " ", "c"])
+
+    results = asyncio.run(run())
+    assert [r["login"] for r in (results[0], results[2], results[5])] == ["a", "b", "c"]
+    assert isinstance(results[1], GitHubUserNotFound)
+    assert isinstance(results[3], TimeoutError)
+    assert isinstance(results[4], InvalidUsername)
+
+
+def test_get_users_respects_concurrency_limit():
+    async def run():
+        in_flight = [0, 0]
+        client = AsyncGitHubClient(concurrency=4, transport=fake_api_transport(in_flight), http2=False)
+        results = await client.get_users(f"user{i}" for i in range(20))
+        await client.aclose()
+        return results, in_flight[1]
+
+    results, max_in_flight = asyncio.run(run())
+    assert [r["login"] for r in results] == [f"user{i}" for i in range(20)]
+    assert max_in_flight == 4
+
+
+def test_get_users_empty_and_invalid_concurrency():
+    assert asyncio.run(AsyncGitHubClient().get_users([])) == []
+    with pytest.raises(ValueError):
+        AsyncGitHubClient(concurrency=0)
+
+
+# ---------- REQUISIÇÕES CONDICIONAIS ----------
+def test_get_user_revalidates_with_etag():
+    now = [0.0]
+    seen = []
+
+    def handler(request):
+        seen.append(dict(request.headers))
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304, headers={"ETag": '"v1"'})
+        return httpx.Response(
+            200,
+            json={"login": "octocat", "followers": 1},
+            headers={"ETag": '"v1"', "Last-Modified": "Tue, 01 Oct 2024 10:00:00 GMT"},
+        )
+
+    cache = UserCache(ttl=60, clock=lambda: now[0])
+    with GitHubClient(transport=httpx.MockTransport(handler), http2=False, cache=cache) as client:
+        first = client.get_user("octocat")
+        now[0] += 61 #entrada vencida: a próxima consulta é condicional
+        assert client.get_user("octocat") == first
+        assert client.get_user("octocat") == first #renovada pelo 304, sem rede
+    assert len(seen) == 2
+    assert "if-none-match" not in seen[0]
+    assert seen[1]["if-none-match"] == '"v1"'
+    assert seen[1]["if-modified-since"] == "Tue, 01 Oct 2024 10:00:00 GMT"
+
+
+def test_get_user_conditional_request_sees_changes():
+    now = [0.0]
+    versions = iter([("v1", 1), ("v2", 2)])
+
+    def handler(request):
+        etag, followers = next(versions)
+        return httpx.Response(200, json={"login": "x", "followers": followers}, headers={"ETag": etag})
+
+    cache = UserCache(ttl=60, clock=lambda: now[0])
+    with GitHubClient(transport=httpx.MockTransport(handler), http2=False, cache=cache) as client:
+        assert client.get_user("x")["followers"] == 1
+        now[0] += 61
+        assert client.get_user("x")["followers"] == 2
+    assert cache.stale("x")[1] == {"etag": "v2"}
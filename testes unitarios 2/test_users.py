@@ -0,0 +1,80 @@
+import dataclasses
+import json
+import pytest
+from collections.abc import Mapping
+from users import GitHubUser, JSON_BACKEND, parse_user
+
+PAYLOAD = {
+    "login": "octocat",
+    "id": 583231,
+    "node_id": "MDQ6VXNlcjU4MzIzMQ==",
+    "avatar_url": "https://avatars.githubusercontent.com/u/583231?v=4",
+    "html_url": "https://github.com/octocat",
+    "type": "User",
+    "site_admin": False,
+    "name": "The Octocat",
+    "company": "@github",
+    "blog": "https://github.blog",
+    "location": "San Francisco",
+    "email": None,
+    "hireable": None,
+    "bio": None,
+    "public_repos": 8,
+    "public_gists": 8,
+    "followers": 16000,
+    "following": 9,
+    "plan": {"name": "free", "space": 976562499, "private_repos": 10000},
+    "created_at": "2011-01-25T18:44:36Z",
+}
+
+
+def test_parse_user_keeps_only_used_fields():
+    user = parse_user(json.dumps(PAYLOAD).encode())
+    assert user == GitHubUser("octocat", "The Octocat", 8, 16000, 9, "https://github.com/octocat")
+    assert dict(user) == {
+        "login": "octocat",
+        "name": "The Octocat",
+        "public_repos": 8,
+        "followers": 16000,
+        "following": 9,
+        "url": "https://github.com/octocat",
+    }
+
+
+def test_parse_user_defaults_and_nulls():
+    user = parse_user(b'{"login": "x", "name": null}')
+    assert user.to_dict() == {
+        "login": "x", "name": None, "public_repos": 0, "followers": 0, "following": 0, "url": None,
+    }
+
+
+def test_parse_user_invalid_json_raises_value_error():
+    with pytest.raises(ValueError):
+        parse_user(b"{json invalido")
+
+
+def test_record_reads_like_a_dict_and_is_immutable():
+    user = GitHubUser("octocat", followers=3)
+    assert user["followers"] == 3 and user.followers == 3
+    assert user.get("email", "nenhum") == "nenhum"
+    assert list(user) == ["login", "name", "public_repos", "followers", "following", "url"]
+    with pytest.raises(KeyError):
+        user["email"]
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        user.login = "outro"
+    assert not hasattr(user, "__dict__") #registro com __slots__
+
+
+def test_record_is_a_full_mapping():
+    user = GitHubUser("octocat", followers=3)
+    as_dict = {"login": "octocat", "name": None, "public_repos": 0, "followers": 3, "following": 0, "url": None}
+    assert isinstance(user, Mapping)
+    assert user == as_dict and as_dict == user
+    assert user != GitHubUser("octocat")
+    assert dict(user.items()) == as_dict and list(user.values()) == list(as_dict.values())
+    assert "login" in user and "email" not in user
+    assert json.loads(json.dumps(user.to_dict())) == as_dict
+
+
+def test_json_backend_name():
+    assert JSON_BACKEND in ("msgspec", "orjson", "json")
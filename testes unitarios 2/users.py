@@ -0,0 +1,115 @@
+import json
+from collections.abc import Mapping
+from dataclasses import dataclass, fields
+from typing import Iterator, Optional
+
+
+@dataclass(frozen=True, slots=True)
+class GitHubUser(Mapping):
+    """
+    Dados de um usuário do GitHub.
+
+    Registro imutável e compacto (com `__slots__`), que pode ser compartilhado
+    entre chamadores e guardado no cache sem cópias. É um `Mapping` completo,
+    então é lido como o dicionário de antes (`user["login"]`, `user.get("name")`,
+    `items()`, `values()`, `dict(user)`) e é igual ao dicionário com os mesmos
+    campos. Não é um `dict`, porém: `json.dumps` precisa de `user.to_dict()`, e
+    não há como alterar os campos.
+    """
+
+    login: Optional[str]
+    name: Optional[str] = None
+    public_repos: Optional[int] = 0
+    followers: Optional[int] = 0
+    following: Optional[int] = 0
+    url: Optional[str] = None
+
+    def __getitem__(self, key: str):
+        if key not in _KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default=None):
+        return getattr(self, key) if key in _KEYS else default
+
+    def __contains__(self, key) -> bool:
+        return key in _KEYS
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(_KEYS)
+
+    def __len__(self) -> int:
+        return len(_KEYS)
+
+    def __eq__(self, other) -> bool:
+        # definido aqui para que o dataclass não troque a comparação com
+        # dicionários do Mapping por uma que só aceita outro GitHubUser
+        if isinstance(other, GitHubUser):
+            return all(getattr(self, key) == getattr(other, key) for key in _KEYS)
+        if isinstance(other, Mapping):
+            return self.to_dict() == dict(other.items())
+        return NotImplemented
+
+    def to_dict(self) -> dict:
+        return {key: getattr(self, key) for key in _KEYS}
+
+
+_KEYS = tuple(field.name for field in fields(GitHubUser))
+
+
+def _from_mapping(data: dict) -> GitHubUser:
+    return GitHubUser(
+        data.get("login"),
+        data.get("name"),
+        data.get("public_repos", 0),
+        data.get("followers", 0),
+        data.get("following", 0),
+        data.get("html_url"),
+    )
+
+
+# Decodificador usado por `parse_user`, escolhido pelo pacote instalado:
+# - msgspec: decodifica só os seis campos declarados e pula o resto do
+#   documento sem montar objetos Python para ele;
+# - orjson: decodifica o documento inteiro, bem mais rápido que o json;
+# - json (biblioteca padrão): o caminho de sempre.
+try:
+    import msgspec
+
+    class _UserPayload(msgspec.Struct):
+        login: Optional[str] = None
+        name: Optional[str] = None
+        public_repos: Optional[int] = 0
+        followers: Optional[int] = 0
+        following: Optional[int] = 0
+        html_url: Optional[str] = None
+
+    _decoder = msgspec.json.Decoder(_UserPayload)
+    JSON_BACKEND = "msgspec"
+
+    def parse_user(content: bytes) -> GitHubUser:
+        """Extrai os campos usados do JSON de um usuário."""
+        try:
+            payload = _decoder.decode(content)
+        except msgspec.MsgspecError as exc:
+            raise ValueError(str(exc)) from exc
+        return GitHubUser(
+            payload.login,
+            payload.name,
+            payload.public_repos,
+            payload.followers,
+            payload.following,
+            payload.html_url,
+        )
+
+except ImportError:
+    try:
+        from orjson import loads as _loads
+        JSON_BACKEND = "orjson"
+    except ImportError:
+        _loads = json.loads
+        JSON_BACKEND = "json"
+
+    def parse_user(content: bytes) -> GitHubUser:
+        """Extrai os campos usados do JSON de um usuário."""
+        return _from_mapping(_loads(content))
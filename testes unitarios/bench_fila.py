@@ -0,0 +1,41 @@
+"""
+Benchmark de escala da Fila: tempo para enfileirar e esvaziar n elementos.
+
+Compara a implementação antiga (lista com pop(0), O(n) por remoção) com a
+atual (deque, O(1)). Com a lista, dobrar n quadruplica o tempo; com a deque,
+só o dobra.
+
+Execução (na pasta "testes unitarios"): python bench_fila.py
+"""
+import time
+from fila import Fila
+
+
+class FilaLista:
+    # implementação anterior, só para comparação
+    def __init__(self):
+        self.elementos = []
+
+    def enfileirar(self, elem):
+        self.elementos.append(elem)
+
+    def removerFila(self):
+        return self.elementos.pop(0)
+
+
+def esvaziar(fila_cls, n):
+    fila = fila_cls()
+    inicio = time.perf_counter()
+    for e in range(n):
+        fila.enfileirar(e)
+    for _ in range(n):
+        fila.removerFila()
+    return time.perf_counter() - inicio
+
+
+if __name__ == "__main__":
+    print(f"{'n':>8} {'lista (s)':>10} {'deque (s)':>10} {'ns/elem deque':>14}")
+    for n in (25_000, 50_000, 100_000, 200_000, 400_000):
+        lista = esvaziar(FilaLista, n)
+        atual = esvaziar(Fila, n)
+        print(f"{n:>8} {lista:>10.3f} {atual:>10.3f} {atual / n * 1e9:>14.0f}")
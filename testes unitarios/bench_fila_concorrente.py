@@ -0,0 +1,68 @@
+"""
+Benchmark de vazão da FilaConcorrente com vários produtores e consumidores,
+comparada com queue.Queue (mesma capacidade).
+
+Cada configuração passa N elementos de P produtores para C consumidores; a
+variante "drain" usa consumidores que retiram em lotes de até 64 elementos.
+
+Execução (na pasta "testes unitarios"): python bench_fila_concorrente.py
+"""
+import queue
+import threading
+import time
+from fila import FilaConcorrente
+
+N = 200_000
+CAPACIDADE = 1024
+FIM = object()
+
+
+def medir(produtores, consumidores, criar, colocar, retirar):
+    fila = criar()
+    por_produtor = N // produtores
+
+    def produzir():
+        for e in range(por_produtor):
+            colocar(fila, e)
+
+    def consumir():
+        while retirar(fila) is not FIM:
+            pass
+
+    threads_p = [threading.Thread(target=produzir) for _ in range(produtores)]
+    threads_c = [threading.Thread(target=consumir) for _ in range(consumidores)]
+    inicio = time.perf_counter()
+    for t in threads_p + threads_c:
+        t.start()
+    for t in threads_p:
+        t.join()
+    for _ in range(consumidores):
+        colocar(fila, FIM)
+    for t in threads_c:
+        t.join()
+    return por_produtor * produtores / (time.perf_counter() - inicio)
+
+
+def retirar_em_lote(fila):
+    # um consumidor que retira em lote; FIM encerra (o resto volta para a fila)
+    lote = fila.drain(64, timeout=None)
+    if FIM in lote:
+        resto = lote[lote.index(FIM) + 1:]
+        for elem in resto:
+            fila.enfileirar(elem)
+        return FIM
+    return lote
+
+
+VARIANTES = {
+    "queue.Queue": (lambda: queue.Queue(CAPACIDADE), queue.Queue.put, queue.Queue.get),
+    "FilaConcorrente": (lambda: FilaConcorrente(CAPACIDADE), FilaConcorrente.enfileirar, FilaConcorrente.removerFila),
+    "FilaConcorrente (drain)": (lambda: FilaConcorrente(CAPACIDADE), FilaConcorrente.enfileirar, retirar_em_lote),
+}
+
+if __name__ == "__main__":
+    print(f"{N} elementos, capacidade {CAPACIDADE} (elementos/s)")
+    print(f"{'P x C':>6}" + "".join(f"{nome:>26}" for nome in VARIANTES))
+    for produtores, consumidores in ((1, 1), (2, 2), (4, 4), (8, 8)):
+        vazoes = [medir(produtores, consumidores, *variante) for variante in VARIANTES.values()]
+        print(f"{produtores:>2} x {consumidores:<2}" + "".join(f"{v:>26,.0f}" for v in vazoes))
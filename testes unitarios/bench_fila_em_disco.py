@@ -0,0 +1,34 @@
+"""
+FilaEmDisco contra Fila: tempo para enfileirar e esvaziar N elementos e pico
+de memória (tracemalloc) durante o processo.
+
+Execução (na pasta "testes unitarios"): python bench_fila_em_disco.py
+"""
+import time
+import tracemalloc
+from fila import Fila, FilaEmDisco
+
+N = 2_000_000
+LIMITE = 100_000
+
+
+def medir(fila):
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    for e in range(N):
+        fila.enfileirar(("tarefa", e))
+    for _ in range(N):
+        fila.removerFila()
+    duracao = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return duracao, pico
+
+
+if __name__ == "__main__":
+    print(f"{N} elementos; FilaEmDisco com limite_memoria={LIMITE}")
+    for nome, fila in (("Fila", Fila()), ("FilaEmDisco", FilaEmDisco(LIMITE))):
+        duracao, pico = medir(fila)
+        print(f"{nome:12s} {duracao:6.2f} s  {N / duracao:10,.0f} elementos/s  pico {pico / 2**20:7.1f} MiB")
+        if isinstance(fila, FilaEmDisco):
+            fila.fechar()
@@ -0,0 +1,81 @@
+"""
+FilaPrioridade e FilaAtrasada contra o que os escalonadores faziam: ordenar
+a lista de tarefas a cada tick.
+
+- prioridade: fila com N tarefas; cada rodada entra uma tarefa com
+  prioridade aleatória e sai a de menor prioridade;
+- atraso: cada rodada (um tick de 10 ms de relógio simulado) entra uma
+  tarefa com atraso aleatório de até 5 s e saem todas as vencidas.
+
+Execução (na pasta "testes unitarios"): python bench_fila_prioridade.py
+"""
+import random
+import time
+from fila import FilaAtrasada, FilaPrioridade
+
+RODADAS = 20_000
+
+
+class Relogio:
+    def __init__(self):
+        self.agora = 0.0
+
+    def __call__(self):
+        return self.agora
+
+
+def prioridade_ordenando(n):
+    tarefas = [(random.random(), i) for i in range(n)]
+    for i in range(RODADAS):
+        tarefas.append((random.random(), n + i))
+        tarefas.sort()
+        tarefas.pop(0)
+
+
+def prioridade_heap(n):
+    fila = FilaPrioridade()
+    for i in range(n):
+        fila.enfileirar(i, priority=random.random())
+    for i in range(RODADAS):
+        fila.enfileirar(n + i, priority=random.random())
+        fila.removerFila()
+
+
+def atraso_ordenando(n):
+    relogio = Relogio()
+    tarefas = [(random.uniform(0, 5), i) for i in range(n)]
+    for i in range(RODADAS):
+        relogio.agora += 0.01
+        tarefas.append((relogio.agora + random.uniform(0, 5), n + i))
+        tarefas.sort()
+        while tarefas and tarefas[0][0] <= relogio.agora:
+            tarefas.pop(0)
+
+
+def atraso_roda(n):
+    relogio = Relogio()
+    fila = FilaAtrasada(clock=relogio)
+    for i in range(n):
+        fila.enfileirar(i, delay=random.uniform(0, 5))
+    for i in range(RODADAS):
+        relogio.agora += 0.01
+        fila.enfileirar(n + i, delay=random.uniform(0, 5))
+        while fila.prontos():
+            fila.removerFila()
+
+
+def medir(funcao, n):
+    inicio = time.perf_counter()
+    funcao(n)
+    return (time.perf_counter() - inicio) / RODADAS * 1e6
+
+
+if __name__ == "__main__":
+    print(f"µs por rodada ({RODADAS} rodadas)")
+    print(f"{'N':>7} {'ordenando':>10} {'heap':>8} {'atraso ordenando':>17} {'timer wheel':>12}")
+    for n in (1_000, 10_000, 100_000):
+        random.seed(n)
+        print(
+            f"{n:>7} {medir(prioridade_ordenando, n):>10.1f} {medir(prioridade_heap, n):>8.1f}"
+            f" {medir(atraso_ordenando, n):>17.1f} {medir(atraso_roda, n):>12.1f}"
+        )
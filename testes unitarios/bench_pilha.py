@@ -0,0 +1,79 @@
+"""
+Benchmark do custo por operação da Pilha.
+
+Compara push + pop de N elementos na Pilha antiga (contador tamanho e
+pop(tamanho - 1)), na Pilha atual, na PilhaConcorrente e direto em list e
+collections.deque; depois, push_many/pop_many em lotes contra o laço de
+push/pop.
+
+Execução (na pasta "testes unitarios"): python bench_pilha.py
+"""
+import timeit
+from collections import deque
+from pilha import Pilha, PilhaConcorrente
+
+N = 100_000
+LOTE = 64
+
+
+class PilhaAntiga:
+    # implementação anterior, só para comparação
+    def __init__(self):
+        self.elementos = []
+        self.tamanho = 0
+
+    def pilhaVazia(self):
+        return (self.tamanho == 0)
+
+    def push(self, elem):
+        self.elementos.append(elem)
+        self.tamanho += 1
+
+    def pop(self):
+        if (self.pilhaVazia()):
+            raise IndexError()
+        elem = self.elementos.pop(self.tamanho - 1)
+        self.tamanho -= 1
+        return elem
+
+
+def push_pop(criar, push, pop):
+    def rodar():
+        pilha = criar()
+        for e in range(N):
+            push(pilha, e)
+        for _ in range(N):
+            pop(pilha)
+    return rodar
+
+
+def em_lotes(criar):
+    def rodar():
+        pilha = criar()
+        dados = list(range(LOTE))
+        for _ in range(N // LOTE):
+            pilha.push_many(dados)
+        for _ in range(N // LOTE):
+            pilha.pop_many(LOTE)
+    return rodar
+
+
+def ns_por_operacao(rodar):
+    # melhor de 5 rodadas; 2N operações por rodada
+    return min(timeit.repeat(rodar, number=1, repeat=5)) / (2 * N) * 1e9
+
+
+CASOS = {
+    "Pilha antiga": push_pop(PilhaAntiga, PilhaAntiga.push, PilhaAntiga.pop),
+    "Pilha": push_pop(Pilha, Pilha.push, Pilha.pop),
+    "PilhaConcorrente": push_pop(PilhaConcorrente, PilhaConcorrente.push, PilhaConcorrente.pop),
+    "list": push_pop(list, list.append, list.pop),
+    "deque": push_pop(deque, deque.append, deque.pop),
+    f"Pilha (lotes de {LOTE})": em_lotes(Pilha),
+    f"PilhaConcorrente (lotes de {LOTE})": em_lotes(PilhaConcorrente),
+}
+
+if __name__ == "__main__":
+    print(f"push + pop de {N} elementos (ns por operação)")
+    for nome, rodar in CASOS.items():
+        print(f"{nome:>34} {ns_por_operacao(rodar):8.1f}")
@@ -0,0 +1,43 @@
+"""
+Memória ocupada por Pilha e Fila com N valores numéricos, com e sem typecode.
+
+Sem typecode cada valor é um objeto Python (int ou float) apontado pela
+lista/deque; com typecode os valores ficam lado a lado em um array.
+
+Execução (na pasta "testes unitarios"): python bench_tipadas.py
+"""
+import gc
+import random
+import tracemalloc
+from fila import Fila
+from pilha import Pilha
+
+N = 1_000_000
+
+
+def memoria(criar, inserir, valores):
+    gc.collect()
+    tracemalloc.start()
+    estrutura = criar()
+    for v in valores:
+        inserir(estrutura, v)
+    usado, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return usado, estrutura
+
+
+if __name__ == "__main__":
+    # valores gerados a cada rodada, como chegariam de um cálculo ou da rede
+    inteiros = lambda: (random.getrandbits(40) for _ in range(N))
+    reais = lambda: (random.random() for _ in range(N))
+    casos = (
+        ("Pilha de int", lambda: Pilha(), lambda: Pilha(typecode="q"), Pilha.push, inteiros),
+        ("Fila de float", lambda: Fila(), lambda: Fila(typecode="d"), Fila.enfileirar, reais),
+    )
+    print(f"{N} valores (bytes por valor)")
+    for nome, comum, tipada, inserir, valores in casos:
+        sem, _ = memoria(comum, inserir, valores())
+        com, estrutura = memoria(tipada, inserir, valores())
+        with memoryview(estrutura) as m:
+            assert len(m) == N #mesmo conteúdo, acessado sem cópia
+        print(f"{nome:14s} sem typecode {sem / N:6.1f}  com typecode {com / N:6.1f}  ({sem / com:.1f}x menos)")
@@ -1,23 +1,377 @@
+import heapq
+import mmap
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+import time
+import weakref
+from array import array
+from collections import deque
+from itertools import chain, islice
+
+
+class _ArrayDeque:
+    # Fila de valores numéricos sem objetos Python: um array com o índice do
+    # primeiro elemento. Remover só avança o índice; o espaço já lido é
+    # devolvido de uma vez quando passa da metade do array (O(1) amortizado).
+    # Enquanto houver uma memoryview aberta o array não pode encolher, então a
+    # devolução fica para uma remoção depois que ela for liberada.
+    def __init__(self, typecode):
+        self.dados = array(typecode)
+        self.inicio = 0
+
+    def append(self, elem):
+        self.dados.append(elem)
+
+    def popleft(self):
+        if self.inicio >= len(self.dados):
+            raise IndexError("pop from an empty deque")
+        elem = self.dados[self.inicio]
+        self.inicio += 1
+        if self.inicio >= 1024 and 2 * self.inicio >= len(self.dados):
+            try:
+                del self.dados[:self.inicio]
+            except BufferError:
+                pass #memoryview aberta: o array fica como estava
+            else:
+                self.inicio = 0
+        return elem
+
+    def __getitem__(self, indice):
+        if indice < 0:
+            indice += len(self)
+        if not 0 <= indice < len(self):
+            raise IndexError("deque index out of range")
+        return self.dados[self.inicio + indice]
+
+    def __len__(self):
+        return len(self.dados) - self.inicio
+
+    def __iter__(self):
+        return islice(self.dados, self.inicio, None)
+
+    def __buffer__(self, flags):
+        return memoryview(self.dados)[self.inicio:]
+
+
 class Fila:
-    def __init__(self):
-        self.elementos = []
-        self.tamanho = 0
+    # deque: enfileirar e remover do início em O(1)
+    # (list.pop(0) desloca todos os elementos e deixava esvaziar a fila O(n²)).
+    # Com typecode (do módulo array, ex.: "d" para float, "q" para int de 64
+    # bits), os elementos ficam guardados sem objetos Python e
+    # memoryview(fila) dá acesso direto a eles, do primeiro ao último, sem
+    # cópia. Enquanto uma memoryview existir, a fila não pode receber
+    # elementos (BufferError): use "with memoryview(fila) as m:".
+    def __init__(self, typecode=None):
+        self.elementos = deque() if typecode is None else _ArrayDeque(typecode)
 
     def size(self):
-        return self.tamanho
+        return len(self.elementos)
     
     def filaVazia(self):
-        return (self.tamanho == 0)
+        return not self.elementos
     
     def enfileirar(self, elem):
         self.elementos.append(elem)
-        self.tamanho += 1
     
     def removerFila(self):
         if (self.filaVazia()):
             raise IndexError()
         
-        elem = self.elementos.pop(0)
-        self.tamanho -= 1
-        return elem
+        return self.elementos.popleft()
+
+    def peek(self):
+        # primeiro da fila, sem removê-lo
+        if (self.filaVazia()):
+            raise IndexError()
+        
+        return self.elementos[0]
+
+    def __len__(self):
+        return len(self.elementos)
+
+    def __iter__(self):
+        # do primeiro ao último, sem remover
+        return iter(self.elementos)
+
+    def __buffer__(self, flags):
+        if not isinstance(self.elementos, _ArrayDeque):
+            raise TypeError("Só filas com typecode expõem os elementos como buffer.")
+        return memoryview(self.elementos)
+
+
+class FilaConcorrente(Fila):
+    # Fila para passar elementos entre threads (produtor/consumidor).
+    # Com capacidade, enfileirar espera haver espaço; removerFila espera haver
+    # elemento. timeout=None espera para sempre; se o prazo acabar, levanta
+    # TimeoutError. As esperas usam Conditions, sem ficar testando em laço.
+    def __init__(self, capacidade=None, typecode=None):
+        super().__init__(typecode)
+        self.capacidade = capacidade
+        self._trava = threading.Lock()
+        self._naoVazia = threading.Condition(self._trava)
+        self._naoCheia = threading.Condition(self._trava)
+
+    def _cheia(self):
+        return self.capacidade is not None and len(self.elementos) >= self.capacidade
+
+    def size(self):
+        with self._trava:
+            return len(self.elementos)
+
+    def filaVazia(self):
+        with self._trava:
+            return not self.elementos
+
+    def enfileirar(self, elem, timeout=None):
+        with self._naoCheia:
+            if self._cheia() and not self._naoCheia.wait_for(lambda: not self._cheia(), timeout):
+                raise TimeoutError("Fila cheia.")
+            self.elementos.append(elem)
+            self._naoVazia.notify()
+
+    def removerFila(self, timeout=None):
+        with self._naoVazia:
+            if not self.elementos and not self._naoVazia.wait_for(lambda: self.elementos, timeout):
+                raise TimeoutError("Fila vazia.")
+            elem = self.elementos.popleft()
+            self._naoCheia.notify()
+            return elem
+
+    def drain(self, n=None, timeout=0):
+        # remove de uma vez até n elementos (todos, se n for None); espera até
+        # timeout segundos pelo primeiro e retorna [] se nenhum chegar
+        with self._naoVazia:
+            if not self.elementos and not self._naoVazia.wait_for(lambda: self.elementos, timeout):
+                return []
+            quantidade = len(self.elementos) if n is None else min(n, len(self.elementos))
+            lote = [self.elementos.popleft() for _ in range(quantidade)]
+            self._naoCheia.notify(quantidade)
+            return lote
+
+    def peek(self):
+        with self._trava:
+            if not self.elementos:
+                raise IndexError()
+            return self.elementos[0]
+
+    def __len__(self):
+        return self.size()
+
+    def __iter__(self):
+        # cópia do conteúdo atual, para não iterar enquanto outra thread altera
+        with self._trava:
+            return iter(list(self.elementos))
+
+
+class _DiscoDeque:
+    # Fila em três partes, na ordem: inicio (em memória, sendo consumido),
+    # segmentos em disco (do mais antigo ao mais novo) e fim (em memória,
+    # recebendo elementos). Quando o fim chega a `segmento` elementos, ele é
+    # gravado em um arquivo de uma vez; quando o início acaba, o segmento
+    # mais antigo é lido de volta por mmap e o arquivo é apagado. Em memória
+    # ficam no máximo 2 * segmento elementos.
+    def __init__(self, segmento, pasta):
+        self.segmento = segmento
+        self.pasta = pasta
+        self.inicio = deque()
+        self.fim = deque()
+        self.arquivos = deque() #(caminho, quantidade de elementos)
+        self.em_disco = 0
+        self._proximo = 0
+
+    def append(self, elem):
+        self.fim.append(elem)
+        if len(self.fim) >= self.segmento:
+            if not self.inicio and not self.arquivos:
+                self.inicio, self.fim = self.fim, deque()
+            else:
+                self._gravar()
+
+    def popleft(self):
+        if not self.inicio:
+            self._carregar()
+        return self.inicio.popleft()
+
+    def __getitem__(self, indice):
+        # só o primeiro elemento (peek)
+        if indice != 0:
+            raise IndexError("só o primeiro elemento pode ser lido")
+        if not self.inicio:
+            self._carregar()
+        return self.inicio[0]
+
+    def __len__(self):
+        return len(self.inicio) + self.em_disco + len(self.fim)
+
+    def __iter__(self):
+        # lê os segmentos sem apagá-los, um de cada vez
+        segmentos = (self._ler(caminho) for caminho, _ in list(self.arquivos))
+        return chain(iter(self.inicio), chain.from_iterable(segmentos), iter(self.fim))
+
+    def _gravar(self):
+        caminho = os.path.join(self.pasta, f"{self._proximo:012d}.seg")
+        self._proximo += 1
+        with open(caminho, "wb") as arquivo:
+            pickle.dump(list(self.fim), arquivo, protocol=pickle.HIGHEST_PROTOCOL)
+        self.arquivos.append((caminho, len(self.fim)))
+        self.em_disco += len(self.fim)
+        self.fim = deque()
+
+    def _carregar(self):
+        # próximo trecho para o início: o segmento mais antigo ou, sem
+        # segmentos, o que está no fim
+        if self.arquivos:
+            caminho, quantidade = self.arquivos.popleft()
+            self.inicio = deque(self._ler(caminho))
+            self.em_disco -= quantidade
+            os.remove(caminho)
+        else:
+            self.inicio, self.fim = self.fim, deque()
+
+    @staticmethod
+    def _ler(caminho):
+        with open(caminho, "rb") as arquivo, mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ) as dados:
+            return pickle.loads(dados)
+
+
+class FilaEmDisco(Fila):
+    # Fila maior que a memória: passando de `limite_memoria` elementos, os mais
+    # antigos vão para arquivos de segmento e voltam à memória quando
+    # removerFila chega neles. Cada fila grava em uma subpasta só dela, criada
+    # dentro de `pasta` (ou da pasta temporária do sistema), então várias filas
+    # podem usar a mesma `pasta` sem sobrescrever os segmentos umas das outras.
+    # A ordem é mantida e as gravações e leituras são sequenciais, um segmento
+    # inteiro por vez. Os elementos precisam ser serializáveis com pickle.
+    # fechar() (ou o fim do bloco "with") apaga a subpasta.
+    def __init__(self, limite_memoria=100_000, pasta=None):
+        if pasta is not None:
+            os.makedirs(pasta, exist_ok=True)
+        self.pasta = tempfile.mkdtemp(prefix="fila-", dir=pasta)
+        self.elementos = _DiscoDeque(max(1, limite_memoria // 2), self.pasta)
+        self._limpar = weakref.finalize(self, shutil.rmtree, self.pasta, ignore_errors=True)
+
+    def fechar(self):
+        self._limpar()
+        self.elementos = deque()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+
+class FilaPrioridade(Fila):
+    # Heap: enfileirar e removerFila em O(log n). Sai primeiro o menor
+    # `priority`; com a mesma prioridade, a ordem de chegada (FIFO).
+    def __init__(self):
+        self.elementos = [] #heap de (priority, ordem, elem)
+        self._ordem = 0
+
+    def enfileirar(self, elem, priority=0):
+        heapq.heappush(self.elementos, (priority, self._ordem, elem))
+        self._ordem += 1
+
+    def removerFila(self):
+        if not self.elementos:
+            raise IndexError()
+        
+        return heapq.heappop(self.elementos)[2]
+
+    def peek(self):
+        if not self.elementos:
+            raise IndexError()
+        
+        return self.elementos[0][2]
+
+    def __iter__(self):
+        # na ordem de saída, sem remover
+        return (elem for _, _, elem in sorted(self.elementos))
+
+
+class FilaAtrasada(FilaPrioridade):
+    # Fila com entrega adiada: enfileirar(elem, priority=..., delay=...) só
+    # libera o elemento depois de `delay` segundos; entre os liberados, sai
+    # primeiro o de menor prioridade. Os adiados ficam em uma roda de tempo
+    # (timer wheel) de `slots` posições de `resolucao` segundos: inserir é
+    # O(1) e o relógio só passa pelas posições vencidas. Elementos para além
+    # de uma volta da roda ficam na sua posição até a volta certa.
+    # Como em Fila, size() e filaVazia() dizem o que removerFila pode entregar:
+    # contam só os elementos liberados. adiados() conta os que ainda esperam.
+    def __init__(self, resolucao=0.01, slots=512, clock=time.monotonic):
+        super().__init__()
+        self.resolucao = resolucao
+        self._clock = clock
+        self._roda = [[] for _ in range(slots)] #cada posição: [(prazo, priority, ordem, elem)]
+        self._tick = self._posicao(clock())
+        self._ultimo = None #instante do último avanço
+        self._adiados = 0
+
+    def _posicao(self, instante):
+        return int(instante / self.resolucao)
+
+    def enfileirar(self, elem, priority=0, delay=0):
+        if delay <= 0:
+            return super().enfileirar(elem, priority)
+        prazo = self._clock() + delay
+        self._roda[self._posicao(prazo) % len(self._roda)].append((prazo, priority, self._ordem, elem))
+        self._ordem += 1
+        self._adiados += 1
+
+    def _avancar(self):
+        # move para o heap os elementos vencidos, olhando só as posições do
+        # último avanço até agora (a atual é revista: pode ter prazos à frente)
+        agora = self._clock()
+        if agora == self._ultimo:
+            return
+        self._ultimo = agora
+        atual = self._posicao(agora)
+        if self._adiados:
+            for tick in range(self._tick, min(atual, self._tick + len(self._roda) - 1) + 1):
+                posicao = self._roda[tick % len(self._roda)]
+                if not posicao:
+                    continue
+                restantes = []
+                for entrada in posicao:
+                    if entrada[0] <= agora:
+                        heapq.heappush(self.elementos, entrada[1:])
+                        self._adiados -= 1
+                    else:
+                        restantes.append(entrada)
+                posicao[:] = restantes
+        self._tick = atual
+
+    def removerFila(self):
+        self._avancar()
+        return super().removerFila()
+
+    def peek(self):
+        self._avancar()
+        return super().peek()
+
+    def prontos(self):
+        # quantos elementos já podem ser removidos
+        self._avancar()
+        return len(self.elementos)
+
+    def adiados(self):
+        # quantos elementos ainda não chegaram ao seu prazo
+        self._avancar()
+        return self._adiados
+
+    def size(self):
+        return self.prontos()
+
+    def filaVazia(self):
+        return self.prontos() == 0
+
+    def __len__(self):
+        return self.size()
 
+    def __iter__(self):
+        # só os liberados, na ordem de saída
+        self._avancar()
+        return super().__iter__()
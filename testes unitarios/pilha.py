@@ -1,23 +1,85 @@
+from array import array
+from collections import deque
+
+
 class Pilha:
-    def __init__(self):
-        self.elementos = []
-        self.tamanho = 0
+    # o topo é o fim da lista: push e pop em O(1), sem contador separado.
+    # Com typecode (do módulo array, ex.: "q" para int de 64 bits, "d" para
+    # float), os elementos ficam guardados sem objetos Python, em um array, e
+    # memoryview(pilha) dá acesso direto a eles (da base ao topo), sem cópia.
+    # Enquanto uma memoryview existir, a pilha não pode crescer nem diminuir
+    # (BufferError): use "with memoryview(pilha) as m:".
+    def __init__(self, typecode=None):
+        self.elementos = [] if typecode is None else array(typecode)
 
     def size(self):
-        return self.tamanho
+        return len(self.elementos)
     
     def pilhaVazia(self):
-        return (self.tamanho == 0)
+        return not self.elementos
     
     def push(self, elem):
         self.elementos.append(elem)
-        self.tamanho += 1
     
     def pop(self):
-        if (self.pilhaVazia()):
-            raise IndexError()
-        
-        elem = self.elementos.pop(self.tamanho - 1)
-        self.tamanho -= 1
-        return elem
+        # list.pop() já levanta IndexError com a pilha vazia
+        return self.elementos.pop()
+
+    def peek(self):
+        # topo da pilha, sem removê-lo
+        return self.elementos[-1]
+
+    def push_many(self, elems):
+        # empilha na ordem dada: o último fica no topo
+        self.elementos.extend(elems)
+
+    def pop_many(self, n):
+        # desempilha até n elementos, do topo para baixo (como n pops seguidos);
+        # o lote vem no mesmo tipo do armazenamento (list ou array)
+        if n <= 0:
+            return self.elementos[:0]
+        lote = self.elementos[-n:]
+        del self.elementos[-n:]
+        lote.reverse()
+        return lote
+
+    def __len__(self):
+        return len(self.elementos)
+
+    def __buffer__(self, flags):
+        if not isinstance(self.elementos, array):
+            raise TypeError("Só pilhas com typecode expõem os elementos como buffer.")
+        return memoryview(self.elementos)
+
+
+class PilhaConcorrente(Pilha):
+    # Pilha compartilhada entre threads, sem travas: cada operação é uma única
+    # chamada atômica da deque (append, pop, popleft, extend de uma lista).
+    # Para work stealing, a thread dona usa push/pop no topo e as outras
+    # roubam trabalho da base com steal, disputando o mínimo com a dona.
+    def __init__(self):
+        self.elementos = deque()
+
+    def push_many(self, elems):
+        # materializa antes: extend de uma lista não é interrompido por outra thread
+        self.elementos.extend(list(elems))
+
+    def pop_many(self, n):
+        # pops atômicos um a um: cada elemento sai para uma só thread
+        lote = []
+        try:
+            for _ in range(n):
+                lote.append(self.elementos.pop())
+        except IndexError:
+            pass
+        return lote
 
+    def steal(self, n=1):
+        # retira até n elementos da base (os mais antigos)
+        lote = []
+        try:
+            for _ in range(n):
+                lote.append(self.elementos.popleft())
+        except IndexError:
+            pass
+        return lote
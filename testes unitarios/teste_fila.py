@@ -46,4 +46,73 @@ def test_consistencia_size_e_filaVazia(fila):
     assert not fila.filaVazia()
     fila.removerFila()
     assert fila.size() == 0
-    assert fila.filaVazia()
\ No newline at end of file
+    assert fila.filaVazia()
+
+def test_peek_retorna_primeiro_sem_remover(fila):
+    fila.enfileirar("a")
+    fila.enfileirar("b")
+    assert fila.peek() == "a"
+    assert fila.size() == 2
+
+def test_peek_em_fila_vazia_dispara_excecao(fila):
+    with pytest.raises(IndexError):
+        fila.peek()
+
+def test_iteracao_e_len_seguem_ordem_fifo(fila):
+    for e in [1, 2, 3]:
+        fila.enfileirar(e)
+    fila.removerFila()
+    assert list(fila) == [2, 3]
+    assert len(fila) == 2
+
+def test_fila_grande_esvazia_em_ordem(fila):
+    n = 200_000
+    for e in range(n):
+        fila.enfileirar(e)
+    assert [fila.removerFila() for _ in range(n)] == list(range(n))
+    assert fila.filaVazia()
+
+def test_fila_tipada_guarda_valores_sem_objetos():
+    fila = Fila(typecode="d")
+    for e in [1.5, 2.5, 3.5]:
+        fila.enfileirar(e)
+    assert fila.removerFila() == 1.5
+    assert fila.peek() == 2.5
+    assert list(fila) == [2.5, 3.5] and len(fila) == 2
+    with memoryview(fila) as m:
+        assert m.format == "d" and m.tolist() == [2.5, 3.5]
+    fila.enfileirar(4.5) #a view já foi liberada
+    assert [fila.removerFila() for _ in range(3)] == [2.5, 3.5, 4.5]
+    with pytest.raises(IndexError):
+        fila.removerFila()
+
+def test_fila_tipada_grande_reaproveita_espaco():
+    fila = Fila(typecode="q")
+    n = 100_000
+    for e in range(n):
+        fila.enfileirar(e)
+    assert [fila.removerFila() for _ in range(n - 10)] == list(range(n - 10))
+    assert len(fila.elementos.dados) < n #o espaço lido foi devolvido
+    assert bytes(memoryview(fila)) == bytes(memoryview(fila.elementos.dados)[-10:])
+
+def test_fila_tipada_remove_com_memoryview_aberta():
+    fila = Fila(typecode="q")
+    for e in range(3000):
+        fila.enfileirar(e)
+    for _ in range(1000):
+        fila.removerFila()
+    with memoryview(fila) as m:
+        # a compactação não pode acontecer, mas nenhum elemento se perde
+        assert [fila.removerFila() for _ in range(1000)] == list(range(1000, 2000))
+        assert m[0] == 1000
+    assert fila.size() == 1000 and fila.peek() == 2000
+    assert [fila.removerFila() for _ in range(1000)] == list(range(2000, 3000))
+
+def test_fila_tipada_recusa_tipo_errado():
+    fila = Fila(typecode="q")
+    with pytest.raises(TypeError):
+        fila.enfileirar("a")
+
+def test_fila_sem_typecode_nao_expoe_buffer(fila):
+    with pytest.raises(TypeError):
+        memoryview(fila)
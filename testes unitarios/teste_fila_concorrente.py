@@ -0,0 +1,89 @@
+import threading
+import time
+import pytest
+from fila import FilaConcorrente
+
+@pytest.fixture
+def fila():
+    return FilaConcorrente()
+
+def test_mantem_api_da_fila(fila):
+    fila.enfileirar("a")
+    fila.enfileirar("b")
+    assert fila.size() == 2 and len(fila) == 2
+    assert fila.peek() == "a"
+    assert list(fila) == ["a", "b"]
+    assert fila.removerFila() == "a"
+    assert fila.removerFila() == "b"
+    assert fila.filaVazia()
+
+def test_removerFila_vazia_com_timeout(fila):
+    inicio = time.monotonic()
+    with pytest.raises(TimeoutError):
+        fila.removerFila(timeout=0.05)
+    assert time.monotonic() - inicio >= 0.05
+
+def test_removerFila_espera_produtor(fila):
+    threading.Timer(0.05, fila.enfileirar, args=(42,)).start()
+    assert fila.removerFila(timeout=5) == 42
+
+def test_capacidade_bloqueia_enfileirar():
+    fila = FilaConcorrente(capacidade=2)
+    fila.enfileirar(1)
+    fila.enfileirar(2)
+    with pytest.raises(TimeoutError):
+        fila.enfileirar(3, timeout=0)
+    threading.Timer(0.05, fila.removerFila).start()
+    fila.enfileirar(3, timeout=5)
+    assert list(fila) == [2, 3]
+
+def test_drain_remove_lote(fila):
+    for e in range(5):
+        fila.enfileirar(e)
+    assert fila.drain(3) == [0, 1, 2]
+    assert fila.drain() == [3, 4]
+    assert fila.drain() == []
+
+def test_drain_libera_produtores():
+    fila = FilaConcorrente(capacidade=2)
+    fila.enfileirar(1)
+    fila.enfileirar(2)
+    produtores = [threading.Thread(target=fila.enfileirar, args=(e,)) for e in (3, 4)]
+    for t in produtores:
+        t.start()
+    time.sleep(0.05)
+    assert fila.drain() == [1, 2]
+    for t in produtores:
+        t.join(5)
+    assert sorted(fila.drain(timeout=5)) == [3, 4]
+
+def test_varios_produtores_e_consumidores_sem_perdas():
+    fila = FilaConcorrente(capacidade=16)
+    recebidos = []
+    trava = threading.Lock()
+
+    def produzir(inicio):
+        for e in range(inicio, inicio + 1000):
+            fila.enfileirar(e)
+
+    def consumir():
+        for _ in range(1000):
+            elem = fila.removerFila(timeout=5)
+            with trava:
+                recebidos.append(elem)
+
+    threads = [threading.Thread(target=produzir, args=(i * 1000,)) for i in range(4)]
+    threads += [threading.Thread(target=consumir) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(10)
+    assert sorted(recebidos) == list(range(4000))
+    assert fila.filaVazia()
+
+def test_fila_concorrente_tipada():
+    fila = FilaConcorrente(capacidade=4, typecode="q")
+    for e in range(4):
+        fila.enfileirar(e)
+    assert fila.drain(3) == [0, 1, 2]
+    assert fila.removerFila() == 3
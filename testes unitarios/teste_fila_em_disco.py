@@ -0,0 +1,65 @@
+import os
+import pytest
+from fila import FilaEmDisco
+
+@pytest.fixture
+def fila(tmp_path):
+    with FilaEmDisco(limite_memoria=10, pasta=str(tmp_path)) as fila:
+        yield fila
+
+def segmentos(fila):
+    return sorted(os.listdir(fila.pasta))
+
+def test_mantem_ordem_fifo_passando_pelo_disco(fila):
+    for e in range(100):
+        fila.enfileirar(e)
+    assert fila.size() == 100 and len(segmentos(fila)) > 0
+    assert [fila.removerFila() for _ in range(100)] == list(range(100))
+    assert fila.filaVazia()
+    assert segmentos(fila) == [] #segmentos lidos são apagados
+
+def test_memoria_limitada(fila):
+    for e in range(1000):
+        fila.enfileirar(e)
+        assert len(fila.elementos.inicio) + len(fila.elementos.fim) <= 10
+
+def test_intercalando_enfileirar_e_remover(fila):
+    esperado = []
+    proximo = 0
+    for rodada in range(20):
+        for _ in range(13):
+            fila.enfileirar(proximo)
+            proximo += 1
+        for _ in range(7):
+            esperado.append(fila.removerFila())
+    while not fila.filaVazia():
+        esperado.append(fila.removerFila())
+    assert esperado == list(range(proximo))
+
+def test_peek_iteracao_e_vazia(fila):
+    with pytest.raises(IndexError):
+        fila.removerFila()
+    for e in range(25):
+        fila.enfileirar({"id": e})
+    assert fila.peek() == {"id": 0}
+    assert [item["id"] for item in fila] == list(range(25))
+    assert len(fila) == 25
+
+def test_fechar_apaga_pasta_temporaria():
+    fila = FilaEmDisco(limite_memoria=4)
+    for e in range(50):
+        fila.enfileirar(e)
+    pasta = fila.pasta
+    assert os.listdir(pasta)
+    fila.fechar()
+    assert not os.path.exists(pasta)
+
+def test_filas_na_mesma_pasta_nao_se_misturam(tmp_path):
+    with FilaEmDisco(limite_memoria=4, pasta=str(tmp_path)) as a, \
+            FilaEmDisco(limite_memoria=4, pasta=str(tmp_path)) as b:
+        for e in range(10):
+            a.enfileirar(("a", e))
+            b.enfileirar(("b", e))
+        assert [a.removerFila() for _ in range(10)] == [("a", e) for e in range(10)]
+        assert [b.removerFila() for _ in range(10)] == [("b", e) for e in range(10)]
+    assert os.listdir(tmp_path) == [] #cada fila apagou só a sua subpasta
@@ -0,0 +1,95 @@
+import pytest
+from fila import FilaAtrasada, FilaPrioridade
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def fila():
+    return FilaPrioridade()
+
+@pytest.fixture
+def relogio():
+    return FakeClock()
+
+@pytest.fixture
+def atrasada(relogio):
+    return FilaAtrasada(resolucao=0.1, slots=8, clock=relogio)
+
+def test_menor_prioridade_sai_primeiro(fila):
+    for elem, prioridade in [("c", 3), ("a", 1), ("b", 2)]:
+        fila.enfileirar(elem, priority=prioridade)
+    assert fila.size() == 3 and fila.peek() == "a"
+    assert list(fila) == ["a", "b", "c"]
+    assert [fila.removerFila() for _ in range(3)] == ["a", "b", "c"]
+    assert fila.filaVazia()
+
+def test_mesma_prioridade_mantem_ordem_de_chegada(fila):
+    for elem in ["x", "y", "z"]:
+        fila.enfileirar(elem)
+    fila.enfileirar("urgente", priority=-1)
+    assert [fila.removerFila() for _ in range(4)] == ["urgente", "x", "y", "z"]
+
+def test_elementos_nao_comparaveis(fila):
+    fila.enfileirar({"id": 1}, priority=1)
+    fila.enfileirar({"id": 2}, priority=1)
+    assert fila.removerFila() == {"id": 1}
+
+def test_prioridade_vazia_dispara_excecao(fila):
+    with pytest.raises(IndexError):
+        fila.removerFila()
+    with pytest.raises(IndexError):
+        fila.peek()
+
+def test_atrasada_so_libera_apos_delay(atrasada, relogio):
+    atrasada.enfileirar("depois", delay=0.5)
+    atrasada.enfileirar("agora")
+    assert atrasada.size() == 1 and atrasada.adiados() == 1
+    assert atrasada.removerFila() == "agora"
+    relogio.now = 0.45
+    assert atrasada.filaVazia() and atrasada.adiados() == 1
+    with pytest.raises(IndexError):
+        atrasada.removerFila()
+    relogio.now = 0.5
+    assert not atrasada.filaVazia() and atrasada.adiados() == 0
+    assert atrasada.removerFila() == "depois"
+    assert atrasada.filaVazia()
+
+def test_atrasada_esvazia_como_fila(atrasada, relogio):
+    for i in range(5):
+        atrasada.enfileirar(i, delay=0.1 * i)
+    relogio.now = 0.25
+    retirados = []
+    while not atrasada.filaVazia():
+        retirados.append(atrasada.removerFila())
+    assert retirados == [0, 1, 2] and atrasada.adiados() == 2
+
+def test_atrasada_ordena_liberados_por_prioridade(atrasada, relogio):
+    atrasada.enfileirar("baixa", priority=5, delay=0.2)
+    atrasada.enfileirar("alta", priority=1, delay=0.3)
+    atrasada.enfileirar("media", priority=3, delay=0.1)
+    relogio.now = 1.0
+    assert atrasada.prontos() == 3
+    assert [atrasada.removerFila() for _ in range(3)] == ["alta", "media", "baixa"]
+
+def test_atrasada_alem_de_uma_volta_da_roda(atrasada, relogio):
+    #8 posições de 0,1 s: uma volta da roda dura 0,8 s
+    atrasada.enfileirar("longe", delay=2.05)
+    atrasada.enfileirar("perto", delay=0.3)
+    relogio.now = 0.3
+    assert atrasada.removerFila() == "perto"
+    for agora in (0.8, 1.6, 2.0):
+        relogio.now = agora
+        assert atrasada.prontos() == 0
+    relogio.now = 2.1
+    assert atrasada.removerFila() == "longe"
+
+def test_atrasada_depois_de_muito_tempo_parado(atrasada, relogio):
+    for i in range(20):
+        atrasada.enfileirar(i, priority=i, delay=0.1 * (i + 1))
+    relogio.now = 100
+    assert [atrasada.removerFila() for _ in range(20)] == list(range(20))
@@ -1,3 +1,4 @@
+from array import array
 import pytest
 from pilha import Pilha
 
@@ -46,4 +47,46 @@ def test_consistencia_size_e_pilhaVazia(pilha):
     assert not pilha.pilhaVazia()
     pilha.pop()
     assert pilha.size() == 0
-    assert pilha.pilhaVazia()
\ No newline at end of file
+    assert pilha.pilhaVazia()
+
+def test_peek_retorna_topo_sem_remover(pilha):
+    pilha.push(1)
+    pilha.push(2)
+    assert pilha.peek() == 2
+    assert pilha.size() == 2
+
+def test_peek_em_pilha_vazia_dispara_excecao(pilha):
+    with pytest.raises(IndexError):
+        pilha.peek()
+
+def test_push_many_e_pop_many(pilha):
+    pilha.push_many([1, 2, 3, 4])
+    assert len(pilha) == 4
+    assert pilha.pop_many(3) == [4, 3, 2]
+    assert pilha.pop_many(5) == [1]
+    assert pilha.pop_many(1) == []
+    assert pilha.pilhaVazia()
+
+def test_pilha_tipada_expoe_buffer_sem_copia():
+    pilha = Pilha(typecode="q")
+    pilha.push_many(range(5))
+    assert pilha.pop() == 4
+    assert pilha.pop_many(2).tolist() == [3, 2]
+    with memoryview(pilha) as m:
+        assert m.format == "q" and m.tolist() == [0, 1]
+        with pytest.raises(BufferError):
+            pilha.push(9)
+    pilha.push(9)
+    assert pilha.peek() == 9
+
+
+def test_pilha_tipada_pop_many_vazio_mantem_o_tipo():
+    pilha = Pilha(typecode="q")
+    pilha.push(1)
+    lote = pilha.pop_many(0)
+    assert isinstance(lote, array) and lote.typecode == "q" and len(lote) == 0
+    assert Pilha().pop_many(0) == []
+
+def test_pilha_sem_typecode_nao_expoe_buffer(pilha):
+    with pytest.raises(TypeError):
+        memoryview(pilha)
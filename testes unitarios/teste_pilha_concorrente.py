@@ -0,0 +1,50 @@
+import threading
+import pytest
+from pilha import PilhaConcorrente
+
+@pytest.fixture
+def pilha():
+    return PilhaConcorrente()
+
+def test_mantem_api_da_pilha(pilha):
+    pilha.push(1)
+    pilha.push_many([2, 3])
+    assert pilha.size() == 3 and pilha.peek() == 3
+    assert pilha.pop() == 3
+    assert pilha.pop_many(5) == [2, 1]
+    assert pilha.pilhaVazia()
+    with pytest.raises(IndexError):
+        pilha.pop()
+
+def test_steal_retira_da_base(pilha):
+    pilha.push_many(range(5))
+    assert pilha.steal(2) == [0, 1]
+    assert pilha.pop() == 4
+    assert pilha.steal(5) == [2, 3]
+    assert pilha.steal() == []
+
+def test_dona_e_ladroes_sem_perdas_nem_repeticoes(pilha):
+    pilha.push_many(range(20_000))
+    recebidos = [[] for _ in range(5)]
+
+    def dona():
+        while True:
+            lote = pilha.pop_many(8)
+            if not lote:
+                return
+            recebidos[0].extend(lote)
+
+    def ladrao(i):
+        while True:
+            lote = pilha.steal(4)
+            if not lote:
+                return
+            recebidos[i].extend(lote)
+
+    threads = [threading.Thread(target=dona)] + [threading.Thread(target=ladrao, args=(i,)) for i in range(1, 5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(10)
+    todos = [e for lote in recebidos for e in lote]
+    assert sorted(todos) == list(range(20_000))